@@ -0,0 +1,106 @@
+from collections import namedtuple
+from time import monotonic, sleep
+
+from django.db.backends.base.schema import logger
+
+BatchUpdateResult = namedtuple("BatchUpdateResult", ["matched", "modified", "batches", "elapsed"])
+
+
+class BatchUpdate:
+    """
+    Apply an update to the documents of a collection that match a filter, in
+    batches of batch_size documents in _id order, so that updating a large
+    collection doesn't saturate the primary or replication.
+
+    After each batch, the last _id updated is saved in a checkpoint (a
+    document of the `checkpoint_collection_name` collection identified by
+    name) so that if the update is interrupted, running it again with the same
+    name resumes after that _id. The checkpoint is deleted when the update
+    completes.
+
+    If max_rate is given, the update sleeps between batches so that it updates
+    at most max_rate documents per second.
+    """
+
+    checkpoint_collection_name = "django_batch_update_checkpoints"
+
+    def __init__(
+        self, connection, collection_name, filter, update, *, name, batch_size=1000, max_rate=None
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        if max_rate is not None and max_rate <= 0:
+            raise ValueError("max_rate must be a positive number.")
+        self.connection = connection
+        self.collection_name = collection_name
+        self.filter = filter
+        self.update = update
+        self.name = name
+        self.batch_size = batch_size
+        self.max_rate = max_rate
+
+    @property
+    def checkpoints(self):
+        return self.connection.get_collection(self.checkpoint_collection_name)
+
+    def run(self):
+        """
+        Update the documents and return a BatchUpdateResult with the number of
+        documents matched and modified, the number of batches, and the
+        elapsed time (in seconds), including those of the interrupted runs.
+        """
+        collection = self.connection.get_collection(self.collection_name)
+        checkpoint = self.checkpoints.find_one({"_id": self.name}) or {}
+        last_id = checkpoint.get("last_id")
+        matched = checkpoint.get("matched", 0)
+        modified = checkpoint.get("modified", 0)
+        batches = checkpoint.get("batches", 0)
+        previous_elapsed = checkpoint.get("elapsed", 0)
+        if last_id is not None:
+            logger.info("Resuming %s of %s after _id %r.", self.name, self.collection_name, last_id)
+        total = collection.estimated_document_count()
+        start = monotonic()
+        processed = 0
+        while True:
+            filter = self.filter if last_id is None else {**self.filter, "_id": {"$gt": last_id}}
+            ids = [
+                document["_id"]
+                for document in collection.find(filter, {"_id": 1})
+                .sort("_id", 1)
+                .limit(self.batch_size)
+            ]
+            if not ids:
+                break
+            result = collection.update_many({**self.filter, "_id": {"$in": ids}}, self.update)
+            last_id = ids[-1]
+            matched += result.matched_count
+            modified += result.modified_count
+            batches += 1
+            processed += len(ids)
+            elapsed = monotonic() - start
+            self.checkpoints.update_one(
+                {"_id": self.name},
+                {
+                    "$set": {
+                        "collection": self.collection_name,
+                        "last_id": last_id,
+                        "matched": matched,
+                        "modified": modified,
+                        "batches": batches,
+                        "elapsed": previous_elapsed + elapsed,
+                    }
+                },
+                upsert=True,
+            )
+            logger.info(
+                "%s of %s: %s documents updated (about %s in the collection), %d documents/s.",
+                self.name,
+                self.collection_name,
+                modified,
+                total,
+                processed / elapsed if elapsed else processed,
+            )
+            if self.max_rate is not None and (delay := processed / self.max_rate - elapsed) > 0:
+                sleep(delay)
+        self.checkpoints.delete_one({"_id": self.name})
+        return BatchUpdateResult(matched, modified, batches, previous_elapsed + monotonic() - start)
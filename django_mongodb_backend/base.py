@@ -2,6 +2,7 @@ import contextlib
 import logging
 import os
 import warnings
+import weakref
 
 from bson import Decimal128
 from django.apps import apps
@@ -23,9 +24,11 @@ from .client import DatabaseClient
 from .creation import DatabaseCreation
 from .features import DatabaseFeatures
 from .introspection import DatabaseIntrospection
+from .monitoring import PoolMetricsListener, WrittenCollectionsListener
 from .operations import DatabaseOperations
+from .query_shapes import QueryShapes
 from .schema import DatabaseSchemaEditor
-from .utils import OperationDebugWrapper
+from .utils import LazyFieldDefaults, OperationDebugWrapper, SearchIndexCache, ServerInfoCache
 from .validation import DatabaseValidation
 
 
@@ -111,6 +114,13 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         "iendswith": "LIKE '%%' || UPPER({})",
     }
     _connection_pools = {}
+    # The PoolMetricsListener of each connection pool.
+    _pool_metrics = {}
+    # The WrittenCollectionsListener of each alias whose writes are tracked.
+    _written_collections = {}
+    # Every DatabaseWrapper, so that their connections can be reset after a
+    # fork().
+    _instances = weakref.WeakSet()
 
     def _isnull_operator(field, is_null):
         if is_null:
@@ -230,8 +240,16 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         # used in case Django's atomic() (used internally in Django) is called
         # within this package's atomic().
         self.in_atomic_block_mongo = False
+        # Whether the server aborted the transaction because of an error in a
+        # nested 'atomic' block, so the outermost block must roll it back.
+        self.needs_rollback_mongo = False
         # Current number of nested 'atomic' calls.
         self.nested_atomics = 0
+        # A stack with an item for each active 'atomic' block: the block's
+        # django_mongodb_backend.transaction.WriteBuffer, or None if the block
+        # doesn't buffer its writes.
+        self.atomic_write_buffers = []
+        self._instances.add(self)
         # If database "NAME" isn't specified, try to get it from HOST, if it's
         # a connection string.
         if self.settings_dict["NAME"] == "":  # Empty string = unspecified; None = _nodb_cursor()
@@ -282,6 +300,8 @@ class DatabaseWrapper(BaseDatabaseWrapper):
             "host": settings_dict["HOST"] or None,
             **settings_dict["OPTIONS"],
         }
+        # This option configures the backend rather than MongoClient.
+        params.pop("pool_stats", None)
         # MongoClient uses any of these parameters (including "OPTIONS" above)
         # to override any corresponding values in a connection string "HOST".
         if user := settings_dict.get("USER"):
@@ -295,10 +315,25 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     @async_unsafe
     def get_new_connection(self, conn_params):
         if self.alias not in self._connection_pools:
+            listeners = []
+            metrics = None
+            if self.settings_dict["OPTIONS"].get("pool_stats"):
+                # Collecting the statistics costs a locked update each time a
+                # connection is checked out or in, so it's opt-in.
+                metrics = PoolMetricsListener()
+                listeners.append(metrics)
+            if (written_collections := self._written_collections.get(self.alias)) is not None:
+                listeners.append(written_collections)
+            conn_params = {
+                **conn_params,
+                "event_listeners": [*conn_params.get("event_listeners", ()), *listeners],
+            }
             conn = MongoClient(**conn_params, driver=self._driver_info())
             # setdefault() ensures that multiple threads don't set this in
             # parallel.
-            self._connection_pools.setdefault(self.alias, conn)
+            is_new = self._connection_pools.setdefault(self.alias, conn) is conn
+            if is_new and metrics is not None:
+                self._pool_metrics[self.alias] = metrics
         return self._connection_pools[self.alias]
 
     def _driver_info(self):
@@ -334,21 +369,189 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         connection = self.connection
         if connection is None:
             return
+        if (query_shapes := self.__dict__.get("query_shapes")) is not None:
+            query_shapes.flush()
         # Remove all references to the connection.
         self.connection = None
         with contextlib.suppress(AttributeError):
             del self.database
         del self._connection_pools[self.alias]
+        self._pool_metrics.pop(self.alias, None)
         # Then close it.
         connection.close()
 
+    @classmethod
+    def _after_fork_in_child(cls):
+        """
+        Discard the MongoClients inherited from the parent process so that
+        each connection lazily creates its own. MongoClient isn't fork-safe,
+        and closing the parent's clients from the child could interfere with
+        their use in the parent, so they're dropped without being closed.
+        """
+        cls._connection_pools.clear()
+        cls._pool_metrics.clear()
+        # Writes in the parent aren't seen by the child's listeners. Aliases
+        # that share a listener keep sharing one.
+        listeners = {}
+        for alias, listener in cls._written_collections.items():
+            if listener not in listeners:
+                listeners[listener] = WrittenCollectionsListener()
+            cls._written_collections[alias] = listeners[listener]
+        for wrapper in list(cls._instances):
+            wrapper.connection = None
+            # Clear the cached properties that hold the parent's client, and
+            # the query shapes that the parent sampled (which it records).
+            for name in (
+                "database",
+                "client_encryption",
+                "key_vault",
+                "search_index_cache",
+                "query_shapes",
+            ):
+                wrapper.__dict__.pop(name, None)
+            # A transaction started in the parent can't continue in the child.
+            wrapper.session = None
+            wrapper.in_atomic_block_mongo = False
+            wrapper.needs_rollback_mongo = False
+            wrapper.nested_atomics = 0
+            wrapper.atomic_write_buffers = []
+            wrapper.run_on_commit = []
+
+    def pool_stats(self):
+        """
+        Return the statistics of the connection pool of this database alias
+        in this process: the configured pool size and, for each server, the
+        open and checked out connections, the wait queue, and the average
+        heartbeat round trip time.
+
+        The statistics are collected only if the "pool_stats" key of OPTIONS
+        is True.
+        """
+        if not self.settings_dict["OPTIONS"].get("pool_stats"):
+            raise ImproperlyConfigured(
+                f"DATABASES['{self.alias}']['OPTIONS']['pool_stats'] must be True to collect "
+                "connection pool statistics."
+            )
+        self.ensure_connection()
+        pool_options = self.connection.options.pool_options
+        servers = self._pool_metrics[self.alias].as_dict()
+        # The average round trip time of the heartbeats that the client
+        # measured (the durations of the heartbeat events of the streaming
+        # protocol are the times the server held the requests).
+        round_trip_times = {
+            f"{host}:{port}": description.round_trip_time
+            for (host, port), description in (
+                self.connection.topology_description.server_descriptions().items()
+            )
+        }
+        for address, stats in servers.items():
+            stats["heartbeat_rtt"] = round_trip_times.get(address)
+        return {
+            "max_pool_size": pool_options.max_pool_size,
+            "min_pool_size": pool_options.min_pool_size,
+            "servers": servers,
+        }
+
+    def track_written_collections(self):
+        """
+        Record the collections that the MongoClient of this database alias
+        writes documents to, so that DatabaseOperations.execute_sql_flush()
+        (used by TransactionTestCase) only empties those. Writes are tracked
+        by the MongoClients created after this call.
+
+        The aliases of the same database (e.g. a test mirror and its primary)
+        share the record, so that flushing one of them empties the
+        collections that the others wrote to.
+        """
+        if self.alias in self._written_collections:
+            return
+        database = self._get_database_key()
+        listener = next(
+            (
+                self._written_collections[wrapper.alias]
+                for wrapper in list(self._instances)
+                if wrapper.alias in self._written_collections
+                and wrapper._get_database_key() == database
+            ),
+            None,
+        )
+        self._written_collections.setdefault(self.alias, listener or WrittenCollectionsListener())
+
+    def _get_database_key(self):
+        return (
+            self.settings_dict["HOST"],
+            self.settings_dict.get("PORT"),
+            self.settings_dict["NAME"],
+        )
+
+    def pop_written_collections(self, collection_names):
+        """
+        Return the names of the given collections of this database that may
+        have been written to since they were previously popped, or None if
+        writes aren't tracked.
+        """
+        if (listener := self._written_collections.get(self.alias)) is None:
+            return None
+        self.ensure_connection()
+        if listener not in self.connection.options.event_listeners:
+            # The MongoClient was created before track_written_collections().
+            return None
+        return listener.pop(self.settings_dict["NAME"], collection_names)
+
     @async_unsafe
     def cursor(self):
         return Cursor()
 
     def get_database_version(self):
         """Return a tuple of the database's version."""
-        return tuple(self.connection.server_info()["versionArray"])
+        version = self.cached_server_probe(
+            "version", lambda: self.connection.server_info()["versionArray"]
+        )
+        return tuple(version)
+
+    @cached_property
+    def server_info_cache(self):
+        """The ServerInfoCache configured by SERVER_INFO_CACHE, if any."""
+        if (options := self.settings_dict.get("SERVER_INFO_CACHE")) is None:
+            return None
+        if "PATH" not in options:
+            raise ImproperlyConfigured(
+                f"DATABASES['{self.alias}']['SERVER_INFO_CACHE'] is missing 'PATH' key."
+            )
+        return ServerInfoCache(self.settings_dict, options["PATH"], options.get("TIMEOUT", 3600))
+
+    @cached_property
+    def query_shapes(self):
+        """The QueryShapes that INDEX_ADVISOR samples queries to, if any."""
+        if (options := self.settings_dict.get("INDEX_ADVISOR")) is None:
+            return None
+        if not 0 < options.get("SAMPLE_RATE", 0.01) <= 1:
+            raise ImproperlyConfigured(
+                f"DATABASES['{self.alias}']['INDEX_ADVISOR']['SAMPLE_RATE'] must be "
+                "greater than 0 and less than or equal to 1."
+            )
+        return QueryShapes(self)
+
+    @cached_property
+    def search_index_cache(self):
+        """The cache of the search indexes used to compile search queries."""
+        return SearchIndexCache(self.settings_dict.get("SEARCH_INDEX_CACHE_TIMEOUT", 60))
+
+    @cached_property
+    def lazy_field_defaults(self):
+        """The defaults that queries apply to documents missing a field."""
+        return LazyFieldDefaults(
+            self, self.settings_dict.get("LAZY_FIELD_DEFAULTS_CACHE_TIMEOUT", 60)
+        )
+
+    def cached_server_probe(self, name, probe):
+        """
+        Return the result of probe(), a query of the server's version or
+        capabilities, using the SERVER_INFO_CACHE if it's configured.
+        """
+        if self.server_info_cache is None:
+            return probe()
+        return self.server_info_cache.get_or_set(name, probe)
 
     ## Transaction API for django_mongodb_backend.transaction.atomic()
     @async_unsafe
@@ -370,15 +573,30 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     @async_unsafe
     def rollback_mongo(self):
         if self.session:
-            with debug_transaction(self, "session.abort_transaction()"):
-                self.session.abort_transaction()
-            self._end_session()
+            # End the session even if the transaction can't be aborted so
+            # that the next transaction doesn't reuse it.
+            try:
+                with debug_transaction(self, "session.abort_transaction()"):
+                    self.session.abort_transaction()
+            finally:
+                self._end_session()
         self.run_on_commit = []
 
     def _end_session(self):
         self.session.end_session()
         self.session = None
 
+    @property
+    def write_buffer(self):
+        """
+        Return the WriteBuffer of the innermost atomic() block that buffers
+        writes, or None if writes should be executed immediately.
+        """
+        for buffer in reversed(self.atomic_write_buffers):
+            if buffer is not None:
+                return buffer
+        return None
+
     def on_commit(self, func, robust=False):
         """
         Copied from BaseDatabaseWrapper.on_commit() except that it checks
@@ -408,15 +626,14 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     ## Queryable Encryption properties
     @cached_property
     def auto_encryption_opts(self):
-        # Initialize the connection if needed. The access of this property in
-        # EncryptedFieldMixin.get_db_prep_save() may be the first time
-        # self.connection is accessed.
-        self.ensure_connection()
-        return self.connection._options.auto_encryption_opts
+        # auto_encryption_opts can only be passed to MongoClient as a keyword
+        # argument, so reading it from OPTIONS avoids connecting.
+        return self.settings_dict["OPTIONS"].get("auto_encryption_opts")
 
     @cached_property
     def client_encryption(self):
         if auto_encryption_opts := self.auto_encryption_opts:
+            self.ensure_connection()
             return ClientEncryption(
                 auto_encryption_opts._kms_providers,
                 auto_encryption_opts._key_vault_namespace,
@@ -460,3 +677,7 @@ class DatabaseWrapper(BaseDatabaseWrapper):
                 f"DATABASES['{self.alias}']['KMS_CREDENTIALS'] is missing '{kms_provider}' key."
             )
         return self.settings_dict["KMS_CREDENTIALS"][kms_provider]
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DatabaseWrapper._after_fork_in_child)
@@ -19,7 +19,8 @@ from django.utils.functional import cached_property
 from pymongo import ASCENDING, DESCENDING
 
 from .expressions import NullSafeArraySum, StringAggJoin
-from .expressions.search import SearchExpression, SearchVector
+from .expressions.builtins import reads_lazy_default
+from .expressions.search import SearchExpression, SearchRankFusion, SearchVector
 from .query import MongoQuery, wrap_database_errors
 from .query_utils import is_constant_value, is_direct_value
 
@@ -315,13 +316,17 @@ class SQLCompiler(compiler.SQLCompiler):
         Build a query pipeline from a mapping of search expressions to result
         columns.
 
-        Currently only a single $search or $vectorSearch expression is
-        supported. Combining multiple search expressions raises ValueError.
-
-        This method will eventually support hybrid search by allowing the
-        combination of $search and $vectorSearch operations.
+        Only a single $search or $vectorSearch expression is supported per
+        query. Combining multiple search expressions raises ValueError; hybrid
+        search uses a SearchRankFusion expression instead.
         """
+        # Set by MongoQuerySet.search_after() and search_before().
+        search_sequence = getattr(self.query, "search_sequence", None)
         if not search_replacements:
+            if search_sequence:
+                raise NotSupportedError(
+                    "search_after() and search_before() require a search expression."
+                )
             return []
         if len(search_replacements) > 1:
             has_search = any(not isinstance(search, SearchVector) for search in search_replacements)
@@ -331,14 +336,12 @@ class SQLCompiler(compiler.SQLCompiler):
             if has_search and has_vector_search:
                 raise ValueError(
                     "Cannot combine a `$vectorSearch` with a `$search` operator. "
-                    "If you need to combine them, consider restructuring your query logic or "
-                    "running them as separate queries."
+                    "To combine them, use SearchRankFusion."
                 )
             if has_vector_search:
                 raise ValueError(
                     "Cannot combine two `$vectorSearch` operator. "
-                    "If you need to combine them, consider restructuring your query logic or "
-                    "running them as separate queries."
+                    "To combine them, use SearchRankFusion."
                 )
             raise ValueError(
                 "Only one $search operation is allowed per query. "
@@ -348,24 +351,30 @@ class SQLCompiler(compiler.SQLCompiler):
             )
         pipeline = []
         for search, result_col in search_replacements.items():
-            score_function = (
-                "vectorSearchScore" if isinstance(search, SearchVector) else "searchScore"
-            )
             pipeline.extend(
-                [
-                    search.as_mql(self, self.connection),
-                    {
-                        "$addFields": {
-                            result_col.as_mql(self, self.connection): {"$meta": score_function}
-                        }
-                    },
-                ]
+                search.get_search_pipeline(
+                    self, self.connection, result_col.as_mql(self, self.connection)
+                )
             )
+            if search_sequence:
+                if isinstance(search, (SearchVector, SearchRankFusion)):
+                    raise NotSupportedError(
+                        "search_after() and search_before() aren't supported with "
+                        f"{search.__class__.__name__}."
+                    )
+                option, token = search_sequence
+                pipeline[0]["$search"][option] = token
         return pipeline
 
     def pre_sql_setup(self, with_col_aliases=False):
         extra_select, order_by, group_by = super().pre_sql_setup(with_col_aliases=with_col_aliases)
-        search_replacements = self._prepare_search_query_for_aggregation_pipeline(order_by)
+        # The searches of a combined query (e.g. QuerySet.union()) run in
+        # each of the combined queries.
+        search_replacements = (
+            {}
+            if self.query.combinator
+            else self._prepare_search_query_for_aggregation_pipeline(order_by)
+        )
         group, group_replacements = self._prepare_annotations_for_aggregation_pipeline(order_by)
         window_stages, window_replacements = self._prepare_window_annotations_for_pipeline()
         all_replacements = {**search_replacements, **window_replacements, **group_replacements}
@@ -505,6 +514,40 @@ class SQLCompiler(compiler.SQLCompiler):
                 chunk = []
         yield chunk
 
+    def _set_return_stored_source(self, query):
+        """
+        Have $search return the fields stored in the search index, rather than
+        fetch each document from the collection, if the rest of the query only
+        uses stored fields.
+        """
+        search = self.search_pipeline[0].get("$search") if self.search_pipeline else None
+        if (
+            search is None
+            or query.lookup_pipeline
+            or self.subqueries
+            or self.aggregation_pipeline
+            or self.window_pipeline
+        ):
+            return
+        expressions = [
+            *(expr for _, expr in self.columns),
+            *self.annotations.values(),
+            *self.order_by_objs,
+        ]
+        if where := self.get_where():
+            expressions.append(where)
+        fields = {
+            col.target.column
+            for expr in expressions
+            for col in self._get_all_expressions_of_type(expr, Col)
+        }
+        # The search results (e.g. the score) are added after $search.
+        fields = {field for field in fields if not field.startswith("__search_expr.")}
+        if self.connection.search_index_cache.stores_fields(
+            self.collection, search["index"], fields
+        ):
+            search["returnStoredSource"] = True
+
     def check_query(self):
         """Check if the current query is supported by the database."""
         if self.query.extra:
@@ -555,6 +598,7 @@ class SQLCompiler(compiler.SQLCompiler):
                 query.match_mql = {}
             else:
                 query.match_mql = match_mql
+            self._set_return_stored_source(query)
         if extra_fields:
             query.extra_fields = self.get_project_fields(extra_fields, force_expression=True)
         query.subqueries = self.subqueries
@@ -1133,7 +1177,10 @@ class SQLCompiler(compiler.SQLCompiler):
                     1
                     # For brevity/simplicity, project {"field_name": 1}
                     # instead of {"field_name": "$field_name"}.
-                    if isinstance(expr, Col) and name == expr.target.column and not force_expression
+                    if isinstance(expr, Col)
+                    and name == expr.target.column
+                    and not force_expression
+                    and not reads_lazy_default(expr, self.connection)
                     else expr.as_mql(self, self.connection, as_expr=True)
                 )
             except EmptyResultSet:
@@ -1165,7 +1212,11 @@ class SQLCompiler(compiler.SQLCompiler):
         extra_fields = []
         idx = itertools.count(start=1)
         for order in self.order_by_objs or []:
-            if isinstance(order.expression, Col):
+            # A column with a lazy default is sorted by its value (with the
+            # default) like other expressions.
+            if isinstance(order.expression, Col) and not reads_lazy_default(
+                order.expression, self.connection
+            ):
                 field_name = order.as_mql(self, self.connection)
                 fields.append((order.expression.target.column, order.expression))
             elif isinstance(order.expression, Ref):
@@ -1251,9 +1302,12 @@ class SQLInsertCompiler(SQLCompiler):
     @wrap_database_errors
     def insert(self, docs, returning_fields=None):
         """Store a list of documents using field columns as element names."""
-        inserted_ids = self.collection.insert_many(
-            docs, session=self.connection.session
-        ).inserted_ids
+        if (buffer := self.connection.write_buffer) is not None:
+            inserted_ids = buffer.insert_many(self.collection_name, docs)
+        else:
+            inserted_ids = self.collection.insert_many(
+                docs, session=self.connection.session
+            ).inserted_ids
         return [(x,) for x in inserted_ids] if returning_fields else []
 
     @cached_property
@@ -1358,6 +1412,10 @@ class SQLUpdateCompiler(compiler.SQLUpdateCompiler, SQLCompiler):
             if "_id" in criteria and isinstance(criteria["_id"], ObjectId)
             else "update_many"
         )
+        if (buffer := self.connection.write_buffer) is not None:
+            return buffer.update(
+                self.collection_name, criteria, pipeline, many=update_method == "update_many"
+            )
         return getattr(self.collection, update_method)(
             criteria, pipeline, session=self.connection.session
         ).matched_count
@@ -1,10 +1,14 @@
 import functools
 import sys
 import types
+from concurrent.futures import ThreadPoolExecutor
+from graphlib import TopologicalSorter
 
 from django.conf import settings
+from django.db import NotSupportedError
 from django.db.backends.base.creation import TEST_DATABASE_PREFIX, BaseDatabaseCreation
 from django.utils.module_loading import import_string
+from pymongo.operations import SearchIndexModel
 
 
 def assertRaises(exception, message):
@@ -37,6 +41,8 @@ class DatabaseCreation(BaseDatabaseCreation):
         # Close the connection (which may point to the non-test database) so
         # that a new connection to the test database can be established later.
         self.connection.close_pool()
+        # Flush only the collections that tests write to.
+        self.connection.track_written_collections()
         # Use a test _key_vault_namespace. This assumes the key vault database
         # is the same as the encrypted database so that _destroy_test_db() can
         # reset the collection by dropping it.
@@ -52,12 +58,122 @@ class DatabaseCreation(BaseDatabaseCreation):
         # MongoDB, it must use the test database.
         settings.DATABASES[self.connection.alias]["NAME"] = test_database_name
         self.connection.settings_dict["NAME"] = test_database_name
+        self._drop_collections(self.connection.database)
 
-        for collection in self.connection.introspection.table_names():
-            if not collection.startswith("system."):
-                self.connection.database.drop_collection(collection)
+    @staticmethod
+    def _drop_collections(database):
+        for name in database.list_collection_names():
+            if not name.startswith("system."):
+                database.drop_collection(name)
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        """
+        Copy the test database to a clone for a parallel test process: the
+        options, indexes, and documents of each collection, copied
+        concurrently (the documents with $merge, on the server), then the
+        views.
+        """
+        clone = self._get_clone_connection(suffix)
+        source = self.connection.database
+        target = clone.database
+        if any(not name.startswith("system.") for name in target.list_collection_names()):
+            if keepdb:
+                return
+            self._drop_collections(target)
+        collections = []
+        views = []
+        for info in source.list_collections():
+            if info["name"].startswith("system."):
+                continue
+            if "encryptedFields" in info["options"]:
+                raise NotSupportedError(
+                    "Cloning a database with encrypted collections isn't supported."
+                )
+            (views if info["type"] == "view" else collections).append(info)
+        if collections:
+            with ThreadPoolExecutor(max_workers=min(len(collections), 8)) as executor:
+                # list() raises the exceptions of the copies, if any.
+                list(
+                    executor.map(
+                        lambda info: self._clone_collection(source, target, info), collections
+                    )
+                )
+        for info in self._sort_views(views):
+            target.create_collection(info["name"], **info["options"])
+        if self.connection.features.supports_search:
+            # Build the search indexes of all collections concurrently and wait
+            # for them in the schema editor's __exit__().
+            with clone.schema_editor() as editor:
+                for info in collections:
+                    name = info["name"]
+                    for index in source[name].list_search_indexes():
+                        target[name].create_search_index(
+                            SearchIndexModel(
+                                definition=index["latestDefinition"],
+                                name=index["name"],
+                                type=index.get("type", "search"),
+                            )
+                        )
+                        editor.pending_search_indexes[name].add(index["name"])
+
+    def _get_clone_connection(self, suffix):
+        """
+        Return a DatabaseWrapper for the clone with the given suffix. It uses
+        this connection's MongoClient, so it mustn't be closed.
+        """
+        settings_dict = {
+            **self.connection.settings_dict,
+            "NAME": self.get_test_db_clone_settings(suffix)["NAME"],
+        }
+        return type(self.connection)(settings_dict, alias=self.connection.alias)
+
+    @staticmethod
+    def _sort_views(views):
+        """
+        Return the views (from list_collections()) ordered so that each view
+        comes after the view that it's defined on, if any.
+        """
+        views = {info["name"]: info for info in views}
+        graph = {name: {info["options"]["viewOn"]} & views.keys() for name, info in views.items()}
+        return [views[name] for name in TopologicalSorter(graph).static_order()]
+
+    @staticmethod
+    def _clone_collection(source, target, info):
+        """Copy a collection's options, documents, and indexes to target."""
+        name = info["name"]
+        options = info["options"]
+        target.create_collection(name, **options)
+        if options.get("capped") or "timeseries" in options:
+            # $merge can't write to capped or time series collections.
+            documents = list(source[name].find())
+            if documents:
+                target[name].insert_many(documents)
+        else:
+            source[name].aggregate([{"$merge": {"into": {"db": target.name, "coll": name}}}])
+        # Building the indexes after the documents are copied is faster than
+        # updating them for each document.
+        indexes = [
+            {key: value for key, value in index.items() if key != "v"}
+            for index in source[name].list_indexes()
+            if index["name"] != "_id_" and not index.get("clustered")
+        ]
+        if indexes:
+            target.command("createIndexes", name, indexes=indexes)
 
     def destroy_test_db(self, old_database_name=None, verbosity=1, keepdb=False, suffix=None):
+        if suffix is not None:
+            # Drop the clone's collections without pointing this connection
+            # to the clone like _destroy_test_db() does.
+            test_database_name = self.get_test_db_clone_settings(suffix)["NAME"]
+            if verbosity >= 1:
+                action = "Preserving" if keepdb else "Destroying"
+                self.log(
+                    f"{action} test database for alias "
+                    f"{self._get_database_display_str(verbosity, test_database_name)}..."
+                )
+            if not keepdb:
+                self._drop_collections(self._get_clone_connection(suffix).database)
+            return
         super().destroy_test_db(old_database_name, verbosity, keepdb, suffix)
         # Close the connection to the test database.
         self.connection.close_pool()
@@ -67,6 +183,22 @@ class DatabaseCreation(BaseDatabaseCreation):
                 "auto_encryption_opts"
             ]._key_vault_namespace = opts._key_vault_namespace[len(TEST_DATABASE_PREFIX) :]
 
+    def set_as_test_mirror(self, primary_settings_dict):
+        super().set_as_test_mirror(primary_settings_dict)
+        # Close the MongoClient so that the mirror connects to the test
+        # database and records its writes with the primary's listener, for
+        # flushing the primary to empty the collections the mirror wrote to.
+        self.connection.close_pool()
+        self.connection.track_written_collections()
+
+    def setup_worker_connection(self, _worker_id):
+        super().setup_worker_connection(_worker_id)
+        # close() doesn't close the MongoClient. Close it so that the worker
+        # connects to its clone and tracks the collections its tests write
+        # to, even if the worker was spawned rather than forked.
+        self.connection.close_pool()
+        self.connection.track_written_collections()
+
     def mark_expected_failures_and_skips(self):
         super().mark_expected_failures_and_skips()
         # Add an assertion wrapper to tests that are expected to raise an
@@ -0,0 +1,61 @@
+from django.db import DatabaseError
+from django.db.migrations.operations.base import Operation
+
+from django_mongodb_backend.index_builds import IndexBuilds
+
+__all__ = ["CheckIndexBuilds"]
+
+
+class CheckIndexBuilds(Operation):
+    """
+    Raise DatabaseError if the builds of the indexes of a model (or of all the
+    models of the migration's app) that were deferred by ROLLING_INDEX_BUILDS
+    aren't complete.
+    """
+
+    reduces_to_sql = False
+    reversible = True
+
+    def __init__(self, model_name=None):
+        self.model_name = model_name
+
+    def deconstruct(self):
+        kwargs = {}
+        if self.model_name is not None:
+            kwargs["model_name"] = self.model_name
+        return (self.__class__.__qualname__, [], kwargs)
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if self.model_name is None:
+            models = to_state.apps.get_app_config(app_label).get_models()
+        else:
+            models = [to_state.apps.get_model(app_label, self.model_name)]
+        collection_names = [
+            model._meta.db_table
+            for model in models
+            if self.allow_migrate_model(schema_editor.connection.alias, model)
+        ]
+        if incomplete := IndexBuilds(schema_editor.connection).incomplete(collection_names):
+            names = ", ".join(
+                f"{record['collection']}.{record['index']['name']} ({record['status']})"
+                for record in incomplete
+            )
+            raise DatabaseError(
+                f"The builds of these indexes aren't complete: {names}. Run the buildindexes "
+                "management command."
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        pass
+
+    def describe(self):
+        if self.model_name is None:
+            return "Check that the deferred index builds are complete"
+        return f"Check that the deferred index builds of {self.model_name} are complete"
+
+    @property
+    def migration_name_fragment(self):
+        return f"check_index_builds_{(self.model_name or '').lower()}".rstrip("_")
@@ -12,8 +12,10 @@ from .search import (
     SearchPhrase,
     SearchQueryString,
     SearchRange,
+    SearchRankFusion,
     SearchRegex,
     SearchScoreOption,
+    SearchSequenceToken,
     SearchText,
     SearchVector,
     SearchWildcard,
@@ -34,8 +36,10 @@ __all__ = [
     "SearchPhrase",
     "SearchQueryString",
     "SearchRange",
+    "SearchRankFusion",
     "SearchRegex",
     "SearchScoreOption",
+    "SearchSequenceToken",
     "SearchText",
     "SearchVector",
     "SearchWildcard",
@@ -31,9 +31,33 @@ from django.db.models.sql import Query
 from django_mongodb_backend.query_utils import process_lhs
 
 
+def lazy_default(col, connection):
+    """
+    Return the default that the column has in the documents that predate it
+    (see LAZY_FIELD_DEFAULTS), or None.
+    """
+    return connection.lazy_field_defaults.get(col.target.model._meta.db_table, col.target.column)
+
+
+def reads_lazy_default(expression, connection):
+    """
+    Return whether the expression (or the column that it transforms) reads a
+    column with a lazy default, which a path can't apply.
+    """
+    while not isinstance(expression, Col):
+        if (expression := getattr(expression, "lhs", None)) is None:
+            return False
+    return lazy_default(expression, connection) is not None
+
+
 def base_expression(self, compiler, connection, as_expr=False, **extra):
     # Use as_mql_path(), if possible.
-    if not as_expr and hasattr(self, "as_mql_path") and getattr(self, "can_use_path", False):
+    if (
+        not as_expr
+        and hasattr(self, "as_mql_path")
+        and getattr(self, "can_use_path", False)
+        and not reads_lazy_default(getattr(self, "lhs", None), connection)
+    ):
         return self.as_mql_path(compiler, connection, **extra)
     # Otherwise, use as_mql_expr().
     expr = self.as_mql_expr(compiler, connection, **extra)
@@ -65,7 +89,7 @@ def case(self, compiler, connection):
     }
 
 
-def col(self, compiler, connection, as_expr=False):  # noqa: ARG001
+def col(self, compiler, connection, as_expr=False):
     # If the column is part of a subquery and belongs to one of the parent
     # queries, it will be stored for reference using $let in a $lookup stage.
     # If the query is built with `alias_cols=False`, treat the column as
@@ -85,7 +109,21 @@ def col(self, compiler, connection, as_expr=False):  # noqa: ARG001
     prefix = f"{self.alias}." if has_alias else ""
     if as_expr:
         prefix = f"${prefix}"
-    return f"{prefix}{self.target.column}"
+    mql = f"{prefix}{self.target.column}"
+    if as_expr and (default := lazy_default(self, connection)) is not None:
+        # Documents that predate the field don't have it. The nulls of a
+        # nullable field must be preserved.
+        default = {"$literal": default}
+        if self.target.null:
+            return {
+                "$cond": {
+                    "if": {"$eq": [{"$type": mql}, "missing"]},
+                    "then": default,
+                    "else": mql,
+                }
+            }
+        return {"$ifNull": [mql, default]}
+    return mql
 
 
 def col_pairs(self, compiler, connection, as_expr=False):
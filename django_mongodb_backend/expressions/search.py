@@ -1,8 +1,11 @@
+from bson import Binary
 from django.db import NotSupportedError
 from django.db.models import CharField, Expression, FloatField, TextField
 from django.db.models.expressions import F, Value
 from django.db.models.lookups import Lookup
+from django.db.models.sql.query import Query
 
+from django_mongodb_backend.fields.vector import encode_vector, infer_vector_dtype
 from django_mongodb_backend.query_utils import process_lhs, process_rhs
 
 
@@ -10,6 +13,19 @@ def cast_as_field(path):
     return F(path) if isinstance(path, str) else path
 
 
+def get_filter_paths(mql):
+    """Yield the field paths that an MQL filter (a $match query) refers to."""
+    if isinstance(mql, list):
+        for item in mql:
+            yield from get_filter_paths(item)
+    elif isinstance(mql, dict):
+        for key, value in mql.items():
+            if key.startswith("$"):
+                yield from get_filter_paths(value)
+            else:
+                yield key
+
+
 class Operator:
     AND = "AND"
     OR = "OR"
@@ -77,6 +93,8 @@ class SearchExpression(SearchCombinable, Expression):
     """
 
     output_field = FloatField()
+    # The $meta keyword that returns the relevance score of the stage.
+    score_meta = "searchScore"
 
     def __str__(self):
         cls = self.identity[0]
@@ -96,24 +114,10 @@ class SearchExpression(SearchCombinable, Expression):
     def set_source_expressions(self, exprs):
         (self.path,) = exprs
 
-    def _get_indexed_fields(self, mappings):
-        if isinstance(mappings, list):
-            for definition in mappings:
-                yield from self._get_indexed_fields(definition)
-        else:
-            for field, definition in mappings.get("fields", {}).items():
-                yield field
-                for path in self._get_indexed_fields(definition):
-                    yield f"{field}.{path}"
-
     def _get_query_index(self, fields, compiler):
-        fields = set(fields)
-        for search_indexes in compiler.collection.list_search_indexes():
-            mappings = search_indexes["latestDefinition"]["mappings"]
-            indexed_fields = set(self._get_indexed_fields(mappings))
-            if mappings["dynamic"] or fields.issubset(indexed_fields):
-                return search_indexes["name"]
-        return "default"
+        return compiler.connection.search_index_cache.get_index_name(
+            compiler.collection, set(fields), "search"
+        )
 
     def search_operator(self, compiler, connection):
         raise NotImplementedError
@@ -122,6 +126,16 @@ class SearchExpression(SearchCombinable, Expression):
         index = self._get_query_index(self.get_search_fields(compiler, connection), compiler)
         return {"$search": {**self.search_operator(compiler, connection), "index": index}}
 
+    def get_search_pipeline(self, compiler, connection, score_path):
+        """
+        Return the stages that run the search and store the relevance score
+        of each document at score_path.
+        """
+        return [
+            self.as_mql(compiler, connection),
+            {"$addFields": {score_path: {"$meta": self.score_meta}}},
+        ]
+
 
 class SearchAutocomplete(SearchExpression):
     """
@@ -840,16 +854,23 @@ class SearchVector(SearchExpression):
 
     Args:
         path: The document path to the vector field (as string or expression).
-        query_vector: The query vector to compare against.
+        query_vector: The query vector to compare against: a list of numbers,
+                      a BSON binary vector, or a NumPy array or memoryview
+                      (as returned by BinaryVectorField).
         limit: Maximum number of matching documents to return.
-        num_candidates: Optional number of candidates to consider.
+        num_candidates: Optional number of candidates to consider. Defaults
+                        to the index's VECTOR_SEARCH_NUM_CANDIDATES setting.
         exact: Optional flag to enforce exact matching. The server's default is
                False, meaning approximate matching.
-        filter: Optional MQL filter expression to narrow candidate documents.
+        filter: Optional filter to narrow candidate documents before the
+                search: an MQL filter expression, or a Q object or lookup on
+                fields that the VectorSearchIndex indexes as filter fields.
 
     Reference: https://www.mongodb.com/docs/atlas/atlas-vector-search/vector-search-stage/
     """
 
+    score_meta = "vectorSearchScore"
+
     def __init__(
         self,
         path,
@@ -884,34 +905,385 @@ class SearchVector(SearchExpression):
         raise NotSupportedError("SearchVector cannot be combined")
 
     def get_search_fields(self, compiler, connection):
-        return {self.path.as_mql(compiler, connection)}
+        return {
+            self.path.as_mql(compiler, connection),
+            *get_filter_paths(self.get_filter(compiler, connection)),
+        }
 
     def _get_query_index(self, fields, compiler):
-        for search_indexes in compiler.collection.list_search_indexes():
-            if search_indexes["type"] == "vectorSearch":
-                index_field = {
-                    field["path"] for field in search_indexes["latestDefinition"]["fields"]
-                }
-                if fields.issubset(index_field):
-                    return search_indexes["name"]
-        return "default"
+        cache = compiler.connection.search_index_cache
+        # Fail early rather than let the server reject the filter (or, if the
+        # fields are filtered with .filter() instead, shrink the results after
+        # the search).
+        if (
+            self.filter is not None
+            and not isinstance(self.filter, dict)
+            and not any(
+                index_type == "vectorSearch" and fields <= indexed_fields
+                for _, index_type, indexed_fields in cache.get_indexes(compiler.collection)
+            )
+        ):
+            path = self.path.as_mql(compiler, compiler.connection)
+            filter_fields = ", ".join(repr(field) for field in sorted(fields - {path}))
+            raise ValueError(
+                f"SearchVector requires a VectorSearchIndex on {path!r} with the filter "
+                f"field(s) {filter_fields}."
+            )
+        return cache.get_index_name(compiler.collection, fields, "vectorSearch")
+
+    def get_filter(self, compiler, connection):
+        """
+        Return the filter as MQL, compiling a Q object or lookup the way an
+        index's condition is compiled.
+        """
+        if self.filter is None or isinstance(self.filter, dict):
+            return self.filter
+        query = Query(model=compiler.query.model, alias_cols=False)
+        where = query.build_where(self.filter)
+        return where.as_mql_idx(query.get_compiler(connection=connection), connection)
+
+    def get_query_vector(self):
+        if isinstance(self.query_vector, (list, tuple, Binary)):
+            return self.query_vector
+        # Encode other sequences (such as the NumPy arrays or memoryviews
+        # returned by BinaryVectorField) as BSON binary vectors.
+        return encode_vector(self.query_vector, infer_vector_dtype(self.query_vector))
+
+    def get_num_candidates(self, index, connection):
+        """
+        Return num_candidates or, for an approximate search, the index's
+        VECTOR_SEARCH_NUM_CANDIDATES setting (which is at least the limit).
+        """
+        if self.num_candidates is not None or self.exact:
+            return self.num_candidates
+        num_candidates = connection.settings_dict.get("VECTOR_SEARCH_NUM_CANDIDATES", {}).get(index)
+        if num_candidates is None:
+            return None
+        return max(num_candidates, self.limit)
 
     def as_mql(self, compiler, connection, as_expr=False):
         params = {
             "index": self._get_query_index(self.get_search_fields(compiler, connection), compiler),
             "path": self.path.as_mql(compiler, connection),
-            "queryVector": self.query_vector,
+            "queryVector": self.get_query_vector(),
             "limit": self.limit,
         }
-        if self.num_candidates:
-            params["numCandidates"] = self.num_candidates
+        if num_candidates := self.get_num_candidates(params["index"], connection):
+            params["numCandidates"] = num_candidates
         if self.exact:
             params["exact"] = self.exact
         if self.filter:
-            params["filter"] = self.filter
+            params["filter"] = self.get_filter(compiler, connection)
         return {"$vectorSearch": params}
 
 
+class SearchRankFusion(SearchExpression):
+    """
+    Combine the results of several search expressions (e.g. a full-text search
+    and a vector search) using reciprocal rank fusion.
+
+    Each document's score is the sum, over the inputs that return it, of
+    `weight / (60 + rank)` where rank is the document's (1-based) position in
+    that input's results.
+
+    Uses the `$rankFusion` stage on MongoDB 8.1+. On older servers, a
+    SearchVector input runs first and the other inputs run in `$unionWith`
+    stages (which can't contain `$vectorSearch` before MongoDB 8.0), and the
+    scores are combined with `$group`.
+
+    Example:
+        SearchRankFusion(
+            SearchText("body", "mars rover"),
+            SearchVector("plot_embedding", [0.1, 0.2, 0.3], limit=10),
+            weights=[1, 2],
+            limit=10,
+        )
+
+    Args:
+        *inputs: The search expressions to combine (at least two).
+        weights: Optional list of the weights of the inputs. Each defaults to
+                 1.
+        limit: The maximum number of documents to take from each input that
+               isn't a SearchVector (which has its own limit). Required if
+               there are such inputs.
+
+    Reference: https://www.mongodb.com/docs/manual/reference/operator/aggregation/rankFusion/
+    """
+
+    # The ranking constant used by $rankFusion.
+    rank_constant = 60
+
+    def __init__(self, *inputs, weights=None, limit=None):
+        if len(inputs) < 2:
+            raise ValueError("SearchRankFusion requires at least two search expressions.")
+        for expression in inputs:
+            if not isinstance(expression, SearchExpression) or isinstance(
+                expression, SearchRankFusion
+            ):
+                raise ValueError(
+                    f"SearchRankFusion inputs must be search expressions, not {expression!r}."
+                )
+        if weights is not None and len(weights) != len(inputs):
+            raise ValueError(
+                f"SearchRankFusion has {len(inputs)} inputs but {len(weights)} weights."
+            )
+        if limit is None and not all(isinstance(expression, SearchVector) for expression in inputs):
+            raise ValueError(
+                "SearchRankFusion requires a limit for inputs that aren't SearchVector."
+            )
+        self.inputs = inputs
+        self.weights = weights
+        self.limit = limit
+        super().__init__()
+
+    def __invert__(self):
+        raise NotSupportedError("SearchRankFusion cannot be negated")
+
+    def __and__(self, other):
+        raise NotSupportedError("SearchRankFusion cannot be combined")
+
+    def __rand__(self, other):
+        raise NotSupportedError("SearchRankFusion cannot be combined")
+
+    def __or__(self, other):
+        raise NotSupportedError("SearchRankFusion cannot be combined")
+
+    def __ror__(self, other):
+        raise NotSupportedError("SearchRankFusion cannot be combined")
+
+    def get_source_expressions(self):
+        # Hide the inputs from the compiler so that they aren't mistaken for
+        # separate searches.
+        return []
+
+    def set_source_expressions(self, exprs):
+        pass
+
+    def resolve_expression(
+        self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False
+    ):
+        c = self.copy()
+        c.is_summary = summarize
+        c.inputs = tuple(
+            expr.resolve_expression(query, allow_joins, reuse, summarize) for expr in self.inputs
+        )
+        return c
+
+    def get_search_fields(self, compiler, connection):
+        fields = set()
+        for expression in self.inputs:
+            fields.update(expression.get_search_fields(compiler, connection))
+        return fields
+
+    def _get_input_stages(self, expression, compiler, connection):
+        stages = [expression.as_mql(compiler, connection)]
+        if self.limit and not isinstance(expression, SearchVector):
+            stages.append({"$limit": self.limit})
+        return stages
+
+    def as_mql(self, compiler, connection, as_expr=False):
+        pipelines = {
+            f"input{i}": self._get_input_stages(expression, compiler, connection)
+            for i, expression in enumerate(self.inputs, start=1)
+        }
+        params = {"input": {"pipelines": pipelines}}
+        if self.weights is not None:
+            params["combination"] = {
+                "weights": {f"input{i}": weight for i, weight in enumerate(self.weights, start=1)}
+            }
+        return {"$rankFusion": params}
+
+    def _get_ranked_input_stages(self, expression, weight, compiler, connection):
+        """
+        Return the stages that run an input and store each document's
+        weighted reciprocal rank in __rank_fusion_score.
+        """
+        return [
+            *self._get_input_stages(expression, compiler, connection),
+            {"$addFields": {"__rank_fusion_score": {"$meta": expression.score_meta}}},
+            {
+                "$setWindowFields": {
+                    "sortBy": {"__rank_fusion_score": -1},
+                    "output": {"__rank_fusion_rank": {"$documentNumber": {}}},
+                }
+            },
+            {
+                "$addFields": {
+                    "__rank_fusion_score": {
+                        "$divide": [weight, {"$add": ["$__rank_fusion_rank", self.rank_constant]}]
+                    }
+                }
+            },
+        ]
+
+    def get_search_pipeline(self, compiler, connection, score_path):
+        if connection.features.supports_rank_fusion:
+            return [
+                self.as_mql(compiler, connection),
+                {"$addFields": {score_path: {"$meta": "score"}}},
+            ]
+        weights = self.weights or [1] * len(self.inputs)
+        # $vectorSearch must be the first stage of the pipeline, and it isn't
+        # allowed in $unionWith before MongoDB 8.0.
+        inputs = sorted(
+            zip(self.inputs, weights, strict=True),
+            key=lambda item: not isinstance(item[0], SearchVector),
+        )
+        if (
+            not connection.features.is_mongodb_8_0
+            and sum(isinstance(expression, SearchVector) for expression in self.inputs) > 1
+        ):
+            raise NotSupportedError(
+                "SearchRankFusion with more than one SearchVector requires MongoDB 8.0 or later."
+            )
+        first, *others = (
+            self._get_ranked_input_stages(expression, weight, compiler, connection)
+            for expression, weight in inputs
+        )
+        return [
+            *first,
+            *(
+                {"$unionWith": {"coll": compiler.collection_name, "pipeline": stages}}
+                for stages in others
+            ),
+            # Sum the scores of the documents returned by more than one input.
+            {
+                "$group": {
+                    "_id": "$_id",
+                    "__rank_fusion_doc": {"$first": "$$ROOT"},
+                    "__rank_fusion_score": {"$sum": "$__rank_fusion_score"},
+                }
+            },
+            {
+                "$replaceWith": {
+                    "$mergeObjects": [
+                        "$__rank_fusion_doc",
+                        {"__rank_fusion_score": "$__rank_fusion_score"},
+                    ]
+                }
+            },
+            {"$sort": {"__rank_fusion_score": -1, "_id": 1}},
+            {"$addFields": {score_path: "$__rank_fusion_score"}},
+            {"$unset": ["__rank_fusion_score", "__rank_fusion_rank"]},
+        ]
+
+
+class SearchFacet(SearchExpression):
+    """
+    Run a search expression with the `facet` collector, which groups its
+    results by the given facets and counts them.
+
+    The counts are returned in the `$$SEARCH_META` variable (see
+    MongoQuerySet.search_facets()) rather than in the documents.
+
+    Example:
+        SearchFacet(
+            SearchText("body", "mars"),
+            facets={"headlines": {"type": "string", "path": "headline"}},
+        )
+
+    Args:
+        operator: The search expression whose results are counted.
+        facets: A dictionary mapping facet names to facet definitions.
+        count: Optional type of the total count of results: "lowerBound"
+               (the server's default) or "total".
+
+    Reference: https://www.mongodb.com/docs/atlas/atlas-search/facet/
+    """
+
+    def __init__(self, operator, facets, *, count=None):
+        if not isinstance(operator, SearchExpression) or isinstance(
+            operator, (SearchVector, SearchRankFusion, SearchFacet)
+        ):
+            raise ValueError(f"SearchFacet requires a search operator, not {operator!r}.")
+        if not facets:
+            raise ValueError("SearchFacet requires at least one facet.")
+        if isinstance(operator, CombinedSearchExpression):
+            operator = operator.resolve(operator)
+        self.operator = operator
+        self.facets = facets
+        self.count = count
+        super().__init__()
+
+    def __invert__(self):
+        raise NotSupportedError("SearchFacet cannot be negated")
+
+    def __and__(self, other):
+        raise NotSupportedError("SearchFacet cannot be combined")
+
+    def __rand__(self, other):
+        raise NotSupportedError("SearchFacet cannot be combined")
+
+    def __or__(self, other):
+        raise NotSupportedError("SearchFacet cannot be combined")
+
+    def __ror__(self, other):
+        raise NotSupportedError("SearchFacet cannot be combined")
+
+    def get_source_expressions(self):
+        # Hide the operator from the compiler so that it isn't mistaken for a
+        # separate search.
+        return []
+
+    def set_source_expressions(self, exprs):
+        pass
+
+    def resolve_expression(
+        self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False
+    ):
+        c = self.copy()
+        c.is_summary = summarize
+        c.operator = self.operator.resolve_expression(query, allow_joins, reuse, summarize)
+        return c
+
+    def get_search_fields(self, compiler, connection):
+        return {
+            *self.operator.get_search_fields(compiler, connection),
+            *(facet["path"] for facet in self.facets.values()),
+        }
+
+    def search_operator(self, compiler, connection):
+        return {
+            "facet": {
+                "operator": self.operator.search_operator(compiler, connection),
+                "facets": self.facets,
+            }
+        }
+
+    def as_mql(self, compiler, connection, as_expr=False):
+        mql = super().as_mql(compiler, connection, as_expr=as_expr)
+        if self.count is not None:
+            mql["$search"]["count"] = {"type": self.count}
+        return mql
+
+    def as_search_meta(self, compiler, connection):
+        """
+        Return a $searchMeta stage that returns only the counts, for when no
+        document matches the search.
+        """
+        return {"$searchMeta": self.as_mql(compiler, connection)["$search"]}
+
+
+class SearchSequenceToken(Expression):
+    """
+    The token that identifies a document's position in the results of a
+    search, for paginating them with MongoQuerySet.search_after() and
+    search_before().
+
+    Example:
+        Article.objects.annotate(
+            score=SearchText("body", "mars"), token=SearchSequenceToken()
+        )
+
+    Reference: https://www.mongodb.com/docs/atlas/atlas-search/paginate-results/
+    """
+
+    output_field = CharField()
+
+    def as_mql(self, compiler, connection, as_expr=False):
+        return {"$meta": "searchSequenceToken"}
+
+
 class SearchScoreOption(Expression):
     """Mutate scoring on a search operation."""
 
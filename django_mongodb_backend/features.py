@@ -17,6 +17,7 @@ class DatabaseFeatures(GISFeatures, BaseDatabaseFeatures):
     minimum_database_version = (7, 0)
     allow_sliced_subqueries_with_in = False
     allows_multiple_constraints_on_same_fields = False
+    can_clone_databases = True
     can_create_inline_fk = False
     can_introspect_foreign_keys = False
     can_return_rows_from_bulk_insert = True
@@ -759,19 +760,28 @@ class DatabaseFeatures(GISFeatures, BaseDatabaseFeatures):
     def is_mongodb_8_3(self):
         return self.mongodb_version >= (8, 3)
 
+    @cached_property
+    def supports_rank_fusion(self):
+        """Does the server support the $rankFusion stage?"""
+        return self.mongodb_version >= (8, 1)
+
     @cached_property
     def supports_search(self):
         """Does the server support MongoDB search queries and indexes?"""
-        try:
-            self.connection.get_collection("__null").list_search_indexes()
-        except OperationFailure:
-            # It would be best to check the error message or error code to
-            # avoid hiding some other exception, but the message/code varies
-            # across MongoDB versions. Example error message:
-            # "$listSearchIndexes  stage is only allowed on MongoDB Atlas".
-            return False
-        else:
-            return True
+
+        def probe():
+            try:
+                self.connection.get_collection("__null").list_search_indexes()
+            except OperationFailure:
+                # It would be best to check the error message or error code to
+                # avoid hiding some other exception, but the message/code
+                # varies across MongoDB versions. Example error message:
+                # "$listSearchIndexes  stage is only allowed on MongoDB Atlas".
+                return False
+            else:
+                return True
+
+        return self.connection.cached_server_probe("supports_search", probe)
 
     @cached_property
     def _supports_transactions(self):
@@ -780,11 +790,14 @@ class DatabaseFeatures(GISFeatures, BaseDatabaseFeatures):
         sharded cluster. This is a MongoDB-specific feature flag distinct
         from Django's supports_transactions (without the underscore prefix).
         """
-        self.connection.ensure_connection()
-        client = self.connection.connection.admin
-        hello = client.command("hello")
-        # a replica set or a sharded cluster
-        return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+        def probe():
+            self.connection.ensure_connection()
+            hello = self.connection.connection.admin.command("hello")
+            # a replica set or a sharded cluster
+            return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+        return self.connection.cached_server_probe("supports_transactions", probe)
 
     @cached_property
     def supports_queryable_encryption(self):
@@ -796,9 +809,13 @@ class DatabaseFeatures(GISFeatures, BaseDatabaseFeatures):
         Queryable Encryption. The models in tests/encryption_ aren't compatible
         with MongoDB 7.0 because {"queryType": "range"} is "rangePreview".
         """
-        self.connection.ensure_connection()
-        build_info = self.connection.connection.admin.command("buildInfo")
-        is_enterprise = "enterprise" in build_info.get("modules")
+
+        def probe():
+            self.connection.ensure_connection()
+            build_info = self.connection.connection.admin.command("buildInfo")
+            return "enterprise" in build_info.get("modules")
+
+        is_enterprise = self.connection.cached_server_probe("is_enterprise", probe)
         return (
             # self.supports_search is a proxy for "is Atlas" until MongoDB 8.2
             # when search support was added in Community Edition. Thus, this
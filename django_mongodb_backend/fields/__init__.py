@@ -33,9 +33,11 @@ from .json import register_json_field
 from .objectid import ObjectIdField
 from .polymorphic_embedded_model import PolymorphicEmbeddedModelField
 from .polymorphic_embedded_model_array import PolymorphicEmbeddedModelArrayField
+from .vector import BinaryVectorField
 
 __all__ = [
     "ArrayField",
+    "BinaryVectorField",
     "EmbeddedModelArrayField",
     "EmbeddedModelField",
     "EncryptedArrayField",
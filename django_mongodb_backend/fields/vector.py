@@ -0,0 +1,195 @@
+import array
+import json
+import sys
+
+from bson import Binary
+from django.core import checks, exceptions
+from django.db.models import Field
+from django.utils.translation import gettext_lazy as _
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__all__ = ["BinaryVectorField"]
+
+# The BSON binary subtype for vectors.
+VECTOR_SUBTYPE = 9
+# dtype: (BSON vector dtype byte, array typecode, NumPy dtype)
+VECTOR_DTYPES = {
+    "float32": (0x27, "f", "<f4"),
+    "int8": (0x03, "b", "i1"),
+    "packed_bit": (0x10, "B", "u1"),
+}
+
+
+def infer_vector_dtype(value):
+    """
+    Return the dtype of a vector returned by BinaryVectorField (a NumPy array
+    or a memoryview), or "float32" for any other sequence of numbers.
+    """
+    if np is not None and isinstance(value, np.ndarray):
+        if value.dtype == np.int8:
+            return "int8"
+        if value.dtype == np.uint8:
+            return "packed_bit"
+    elif isinstance(value, memoryview):
+        if value.format == "b":
+            return "int8"
+        if value.format == "B":
+            return "packed_bit"
+    return "float32"
+
+
+def encode_vector(value, dtype):
+    """
+    Encode a sequence of numbers (of bytes for "packed_bit") as a BSON binary
+    vector.
+    """
+    dtype_byte, typecode, np_dtype = VECTOR_DTYPES[dtype]
+    if np is not None:
+        data = np.asarray(value, dtype=np_dtype).tobytes()
+    else:
+        values = array.array(typecode, value)
+        if sys.byteorder == "big" and dtype == "float32":
+            values.byteswap()
+        data = values.tobytes()
+    # The header is the dtype and the number of padding bits in the last
+    # byte of a packed_bit vector (always 0 since its size is a multiple of 8).
+    return Binary(bytes((dtype_byte, 0)) + data, subtype=VECTOR_SUBTYPE)
+
+
+def decode_vector(value, dtype):
+    """
+    Return a BSON binary vector's data as a NumPy array, if NumPy is
+    installed, or as a memoryview, without creating an object per element.
+    """
+    _, typecode, np_dtype = VECTOR_DTYPES[dtype]
+    if np is not None:
+        return np.frombuffer(value, dtype=np_dtype, offset=2)
+    if sys.byteorder == "big" and dtype == "float32":
+        values = array.array(typecode, bytes(value[2:]))
+        values.byteswap()
+        return memoryview(values)
+    return memoryview(value)[2:].cast(typecode)
+
+
+class BinaryVectorField(Field):
+    """
+    Store a vector of a fixed size as BSON binary vector data (subtype 9).
+    """
+
+    empty_strings_allowed = False
+    # Comparing a NumPy array to the usual empty values (e.g. `array in
+    # [None, ""]`) raises an error.
+    empty_values = ()
+    description = _("Binary vector")
+    default_error_messages = {
+        "invalid": _("“%(value)s” is not a valid vector."),
+        "size": _("Vector has %(length)d dimensions but should have %(size)d."),
+    }
+
+    def __init__(self, *args, size, dtype="float32", **kwargs):
+        self.size = size
+        self.dtype = dtype
+        super().__init__(*args, **kwargs)
+
+    def check(self, **kwargs):
+        errors = super().check(**kwargs)
+        if self.dtype not in VECTOR_DTYPES:
+            errors.append(
+                checks.Error(
+                    f"'dtype' must be one of {', '.join(map(repr, VECTOR_DTYPES))}.",
+                    obj=self,
+                    id="mongodb.fields.vector.E001",
+                )
+            )
+        if not isinstance(self.size, int) or self.size <= 0:
+            errors.append(
+                checks.Error(
+                    "'size' must be a positive integer.",
+                    obj=self,
+                    id="mongodb.fields.vector.E002",
+                )
+            )
+        elif self.dtype == "packed_bit" and self.size % 8:
+            errors.append(
+                checks.Error(
+                    "'size' must be a multiple of 8 when dtype='packed_bit'.",
+                    obj=self,
+                    id="mongodb.fields.vector.E003",
+                )
+            )
+        return errors
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if path == "django_mongodb_backend.fields.vector.BinaryVectorField":
+            path = "django_mongodb_backend.fields.BinaryVectorField"
+        kwargs["size"] = self.size
+        if self.dtype != "float32":
+            kwargs["dtype"] = self.dtype
+        return name, path, args, kwargs
+
+    def db_type(self, connection):
+        return "binData"
+
+    def get_internal_type(self):
+        return "BinaryVectorField"
+
+    @property
+    def num_elements(self):
+        """The number of elements in the vector (bytes for "packed_bit")."""
+        return self.size // 8 if self.dtype == "packed_bit" else self.size
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None or isinstance(value, Binary):
+            return value
+        return encode_vector(value, self.dtype)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return decode_vector(value, self.dtype)
+
+    def to_python(self, value):
+        if value is None:
+            return value
+        if isinstance(value, Binary):
+            return decode_vector(value, self.dtype)
+        if isinstance(value, str):
+            # Assume value is being deserialized.
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                raise exceptions.ValidationError(
+                    self.error_messages["invalid"], code="invalid", params={"value": value}
+                ) from None
+        try:
+            if not hasattr(value, "__len__"):
+                raise TypeError
+            return decode_vector(encode_vector(value, self.dtype), self.dtype)
+        except (OverflowError, TypeError, ValueError):
+            raise exceptions.ValidationError(
+                self.error_messages["invalid"], code="invalid", params={"value": value}
+            ) from None
+
+    def validate(self, value, model_instance):
+        super().validate(value, model_instance)
+        if value is not None and len(value) != self.num_elements:
+            raise exceptions.ValidationError(
+                self.error_messages["size"],
+                code="size",
+                params={"length": len(value), "size": self.num_elements},
+            )
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        if value is None:
+            return None
+        return json.dumps(value.tolist() if hasattr(value, "tolist") else list(value))
+
+    def formfield(self, **kwargs):
+        # Vectors aren't edited in forms.
+        return None
@@ -27,13 +27,14 @@ class GISSchemaEditor:
                 self._add_spatial_index(parent_model, field, column_prefix)
 
     def add_field(self, model, field):
-        super().add_field(model, field)
-        if isinstance(field, EmbeddedModelField):
-            self._create_embedded_spatial_indexes(
-                field.embedded_model, parent_model=model, column_prefix=f"{field.column}."
-            )
-        elif getattr(field, "spatial_index", False):
-            self._add_spatial_index(model, field)
+        with self.batch_index_creation():
+            super().add_field(model, field)
+            if isinstance(field, EmbeddedModelField):
+                self._create_embedded_spatial_indexes(
+                    field.embedded_model, parent_model=model, column_prefix=f"{field.column}."
+                )
+            elif getattr(field, "spatial_index", False):
+                self._add_spatial_index(model, field)
 
     def _alter_field(
         self,
@@ -70,13 +71,14 @@ class GISSchemaEditor:
 
     def _add_spatial_index(self, model, field, column_prefix=""):
         index_name = self._create_spatial_index_name(model, field, column_prefix)
-        self.get_collection(model._meta.db_table).create_indexes(
-            [IndexModel([(column_prefix + field.column, GEOSPHERE)], name=index_name)]
+        self.create_indexes(
+            model, [IndexModel([(column_prefix + field.column, GEOSPHERE)], name=index_name)]
         )
 
     def _delete_spatial_index(self, model, field):
         index_name = self._create_spatial_index_name(model, field)
-        self.get_collection(model._meta.db_table).drop_index(index_name)
+        if not self._discard_index_build(model, index_name):
+            self.get_collection(model._meta.db_table).drop_index(index_name)
 
     def _create_spatial_index_name(self, model, field, column_prefix=""):
         return f"{model._meta.db_table}_{column_prefix}{field.column}_id"
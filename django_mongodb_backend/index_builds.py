@@ -0,0 +1,137 @@
+from django.utils import timezone
+
+
+class IndexBuilds:
+    """
+    The index builds that migrations deferred with ROLLING_INDEX_BUILDS, which
+    are recorded in the `collection_name` collection until the buildindexes
+    command builds them.
+
+    Each record has the name of the collection, the index's createIndexes
+    specification (`index`), the commitQuorum of the build, and its `status`:
+    "pending" until the build is submitted, then "building", and "failed"
+    (with the `error`) if it fails. The records of the builds that succeed
+    are deleted.
+    """
+
+    collection_name = "django_index_builds"
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    @property
+    def records(self):
+        return self.connection.get_collection(self.collection_name)
+
+    def add(self, collection_name, index, commit_quorum):
+        """Record a build of the index (an IndexModel) on the collection."""
+        document = index.document
+        self.records.update_one(
+            {"collection": collection_name, "index.name": document["name"]},
+            {
+                "$set": {
+                    "index": document,
+                    "commit_quorum": commit_quorum,
+                    "status": "pending",
+                    "created": timezone.now(),
+                },
+                "$unset": {"error": ""},
+            },
+            upsert=True,
+        )
+
+    def discard(self, collection_name, index_name):
+        """
+        Delete the record of the build of the collection's index, returning
+        whether the build was pending (and so the index doesn't exist).
+        """
+        record = self.records.find_one_and_delete(
+            {"collection": collection_name, "index.name": index_name}
+        )
+        return record is not None and record["status"] == "pending"
+
+    def discard_collection(self, collection_name):
+        """Delete the records of the builds of the collection's indexes."""
+        self.records.delete_many({"collection": collection_name})
+
+    def rename_collection(self, old_name, new_name):
+        self.records.update_many({"collection": old_name}, {"$set": {"collection": new_name}})
+
+    def rename_column(self, collection_name, old_column, new_column):
+        """
+        Replace the column (and the columns of its embedded fields) in the
+        keys of the indexes of the collection whose builds aren't in
+        progress, so that they're built on the renamed column.
+        """
+        prefix = f"{old_column}."
+        for record in self.records.find(
+            {"collection": collection_name, "status": {"$ne": "building"}}
+        ):
+            key = record["index"]["key"]
+            if not any(column == old_column or column.startswith(prefix) for column in key):
+                continue
+            new_key = {
+                (
+                    new_column + column[len(old_column) :]
+                    if column == old_column or column.startswith(prefix)
+                    else column
+                ): direction
+                for column, direction in key.items()
+            }
+            self.records.update_one({"_id": record["_id"]}, {"$set": {"index.key": new_key}})
+
+    def incomplete(self, collection_names=None):
+        """
+        Return the records of the builds that aren't complete, for all
+        collections or for the given ones, ordered by collection.
+        """
+        query = {} if collection_names is None else {"collection": {"$in": collection_names}}
+        return list(self.records.find(query).sort([("collection", 1), ("created", 1)]))
+
+    def build(self, database, collection_name, records):
+        """
+        Build the indexes of the records, which must be on the collection and
+        have the same commitQuorum, with a single createIndexes command and
+        update their records. Since the command blocks until the indexes are
+        built, this method can run in a thread (hence the `database` argument
+        rather than the connection) while progress() reports the progress of
+        the build.
+        """
+        ids = [record["_id"] for record in records]
+        records_collection = database[self.collection_name]
+        records_collection.update_many({"_id": {"$in": ids}}, {"$set": {"status": "building"}})
+        try:
+            database.command(
+                "createIndexes",
+                collection_name,
+                indexes=[record["index"] for record in records],
+                commitQuorum=records[0]["commit_quorum"],
+            )
+        except Exception as exc:
+            records_collection.update_many(
+                {"_id": {"$in": ids}}, {"$set": {"status": "failed", "error": str(exc)}}
+            )
+            raise
+        records_collection.delete_many({"_id": {"$in": ids}})
+
+    def progress(self, collection_name=None):
+        """
+        Return the progress of the index builds in progress on the server, or
+        of those on the collection, as reported by $currentOp: a list of
+        dictionaries with the namespace (`ns`), the `message`, and the number
+        of documents `done` and `total` of the current phase of each build.
+        """
+        match = {"msg": {"$regex": "^Index Build"}}
+        if collection_name is not None:
+            match["ns"] = f"{self.connection.database.name}.{collection_name}"
+        return [
+            {
+                "ns": op.get("ns"),
+                "message": op["msg"],
+                "done": op.get("progress", {}).get("done"),
+                "total": op.get("progress", {}).get("total"),
+            }
+            for op in self.connection.database.client.admin.aggregate(
+                [{"$currentOp": {"allUsers": True, "idleConnections": False}}, {"$match": match}]
+            )
+        ]
@@ -13,7 +13,7 @@ from django.db.models.sql.where import AND, XOR, WhereNode
 from pymongo import ASCENDING, DESCENDING
 from pymongo.operations import IndexModel, SearchIndexModel
 
-from django_mongodb_backend.fields import ArrayField
+from django_mongodb_backend.fields import ArrayField, BinaryVectorField
 
 from .query_utils import process_rhs
 
@@ -217,7 +217,14 @@ class SearchIndex(Index):
     suffix = "six"
 
     def __init__(
-        self, *, fields=(), field_mappings=None, name=None, analyzer=None, search_analyzer=None
+        self,
+        *,
+        fields=(),
+        field_mappings=None,
+        name=None,
+        analyzer=None,
+        search_analyzer=None,
+        stored_source=None,
     ):
         if field_mappings and not isinstance(field_mappings, dict):
             raise ValueError(
@@ -228,9 +235,14 @@ class SearchIndex(Index):
             raise ValueError(f"analyzer must be a string; got: {type(analyzer)}.")
         if search_analyzer and not isinstance(search_analyzer, str):
             raise ValueError(f"search_analyzer must be a string; got: {type(search_analyzer)}.")
+        if stored_source not in (None, True) and not isinstance(stored_source, (list, tuple)):
+            raise ValueError(
+                f"stored_source must be True or a list of field names; got: {type(stored_source)}."
+            )
         self.field_mappings = field_mappings
         self.analyzer = analyzer
         self.search_analyzer = search_analyzer
+        self.stored_source = stored_source
         if field_mappings:
             if fields:
                 raise ValueError("Cannot provide fields and field_mappings.")
@@ -246,6 +258,8 @@ class SearchIndex(Index):
             kwargs["analyzer"] = self.analyzer
         if self.search_analyzer:
             kwargs["search_analyzer"] = self.search_analyzer
+        if self.stored_source is not None:
+            kwargs["stored_source"] = self.stored_source
         return path, args, kwargs
 
     def check(self, model, connection):
@@ -262,6 +276,19 @@ class SearchIndex(Index):
                     id="mongodb.indexes.search.W001",
                 )
             )
+        if isinstance(self.stored_source, (list, tuple)):
+            for field_name in self.stored_source:
+                try:
+                    model._meta.get_field(field_name)
+                except FieldDoesNotExist:
+                    errors.append(
+                        Error(
+                            f"{self.__class__.__name__} stored_source refers to the "
+                            f"nonexistent field '{field_name}'.",
+                            obj=model,
+                            id="mongodb.indexes.search.E009",
+                        )
+                    )
         return errors
 
     def search_index_data_types(self, db_type):
@@ -298,6 +325,14 @@ class SearchIndex(Index):
             extra["analyzer"] = self.analyzer
         if self.search_analyzer:
             extra["searchAnalyzer"] = self.search_analyzer
+        if self.stored_source is True:
+            extra["storedSource"] = True
+        elif self.stored_source is not None:
+            extra["storedSource"] = {
+                "include": [
+                    model._meta.get_field(field_name).column for field_name in self.stored_source
+                ]
+            }
         return SearchIndexModel(
             definition={"mappings": {"dynamic": False, "fields": fields}, **extra},
             name=self.name,
@@ -343,7 +378,24 @@ class VectorSearchIndex(SearchIndex):
         num_arrayfields = 0
         for field_name, _ in self.fields_orders:
             field = model._meta.get_field(field_name)
-            if isinstance(field, ArrayField):
+            if isinstance(field, BinaryVectorField):
+                if self._multiple_similarities:
+                    # None if similarities is too short (error E005).
+                    similarity = next(iter(self.similarities[num_arrayfields:]), None)
+                else:
+                    similarity = self.similarities
+                num_arrayfields += 1
+                if field.dtype == "packed_bit" and similarity not in {None, "euclidean"}:
+                    errors.append(
+                        Error(
+                            "VectorSearchIndex requires the 'euclidean' similarity "
+                            f"for BinaryVectorField '{field_name}' with "
+                            "dtype='packed_bit'.",
+                            obj=model,
+                            id="mongodb.indexes.search.E008",
+                        )
+                    )
+            elif isinstance(field, ArrayField):
                 num_arrayfields += 1
                 try:
                     int(field.size)
@@ -440,7 +492,7 @@ class VectorSearchIndex(SearchIndex):
             field_ = model._meta.get_field(field_name)
             field_path = column_prefix + model._meta.get_field(field_name).column
             mappings = {"path": field_path}
-            if isinstance(field_, ArrayField):
+            if isinstance(field_, (ArrayField, BinaryVectorField)):
                 mappings.update(
                     {
                         "type": "vector",
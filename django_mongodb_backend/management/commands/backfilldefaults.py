@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_mongodb_backend.backfill import BatchUpdate
+from django_mongodb_backend.utils import LazyFieldDefaults
+
+
+class Command(BaseCommand):
+    help = (
+        "Sets the lazy defaults of fields (see LAZY_FIELD_DEFAULTS) on the documents that "
+        "don't have the fields, in resumable, throttled batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Specifies the database to use. Defaults to the "default" database.',
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="The number of documents updated by each batch. Defaults to 1000.",
+        )
+        parser.add_argument(
+            "--max-rate",
+            type=float,
+            help="The maximum number of documents updated per second. Defaults to no limit.",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        lazy_defaults = connection.get_collection(LazyFieldDefaults.collection_name)
+        for lazy_default in lazy_defaults.find():
+            collection_name = lazy_default["collection"]
+            column = lazy_default["column"]
+            try:
+                result = BatchUpdate(
+                    connection,
+                    collection_name,
+                    {column: {"$exists": False}},
+                    {"$set": {column: lazy_default["value"]}},
+                    name=f"{collection_name}:backfill_default:{column}",
+                    batch_size=options["batch_size"],
+                    max_rate=options["max_rate"],
+                ).run()
+            except ValueError as exc:
+                raise CommandError(exc) from exc
+            # Queries don't need to apply the default anymore.
+            lazy_defaults.delete_one({"_id": lazy_default["_id"]})
+            connection.lazy_field_defaults.invalidate()
+            self.stdout.write(
+                f"{collection_name}.{column}: {result.modified} documents updated in "
+                f"{result.batches} batches ({result.elapsed:.1f}s)."
+            )
@@ -0,0 +1,84 @@
+import itertools
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_mongodb_backend.index_builds import IndexBuilds
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds the indexes that migrations deferred with ROLLING_INDEX_BUILDS and reports "
+        "the progress of the builds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Specifies the database to use. Defaults to the "default" database.',
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10,
+            help="The number of seconds between progress reports. Defaults to 10.",
+        )
+        parser.add_argument(
+            "--status",
+            action="store_true",
+            help="Only print the deferred builds and the progress of the builds in progress.",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        index_builds = IndexBuilds(connection)
+        records = index_builds.incomplete()
+        if options["status"]:
+            for record in records:
+                error = f": {record['error']}" if record.get("error") else ""
+                self.stdout.write(
+                    f"{record['collection']}.{record['index']['name']}: {record['status']}{error}"
+                )
+            for progress in index_builds.progress():
+                self.write_progress(progress)
+            return
+        failed = []
+        database = connection.database
+        # Builds that are already in progress (e.g. if this command was
+        # interrupted) are resubmitted too: createIndexes waits for them.
+        for (collection_name, _), group in itertools.groupby(
+            records, key=lambda record: (record["collection"], record["commit_quorum"])
+        ):
+            group = list(group)
+            names = ", ".join(record["index"]["name"] for record in group)
+            self.stdout.write(f"Building {names} on {collection_name}.")
+            errors = []
+
+            def build(group=group, collection_name=collection_name, errors=errors):
+                try:
+                    index_builds.build(database, collection_name, group)
+                except Exception as exc:
+                    errors.append(exc)
+
+            thread = threading.Thread(target=build)
+            thread.start()
+            thread.join(options["interval"])
+            while thread.is_alive():
+                for progress in index_builds.progress(collection_name):
+                    self.write_progress(progress)
+                thread.join(options["interval"])
+            if errors:
+                self.stderr.write(f"Building {names} on {collection_name} failed: {errors[0]}")
+                failed.append(names)
+            else:
+                self.stdout.write(f"Built {names} on {collection_name}.")
+        if failed:
+            raise CommandError(f"Some index builds failed: {'; '.join(failed)}.")
+
+    def write_progress(self, progress):
+        counts = (
+            f" ({progress['done']}/{progress['total']})" if progress["total"] is not None else ""
+        )
+        self.stdout.write(f"  {progress['ns']}: {progress['message']}{counts}")
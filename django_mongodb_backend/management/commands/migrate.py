@@ -1,7 +1,108 @@
 from django.core.management.commands.migrate import Command as BaseCommand
+from django.db import connections, router
+from django.db.migrations.exceptions import InconsistentMigrationHistory
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.operations.fields import FieldOperation
+from django.db.migrations.operations.models import IndexOperation, ModelOperation
+from django.db.migrations.operations.special import RunPython
 
 from django_mongodb_backend.db.migrations.autodetector import MigrationAutodetector
+from django_mongodb_backend.db.migrations.operations import CheckIndexBuilds
 
 
 class Command(BaseCommand):
     autodetector = MigrationAutodetector
+    # The operations whose effect on new collections is described by the
+    # final state of the migrations.
+    snapshot_operations = (ModelOperation, FieldOperation, IndexOperation, CheckIndexBuilds)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.settings_dict.get("SNAPSHOT_MIGRATIONS"):
+            if not options["skip_checks"]:
+                self.check(databases=[options["database"]])
+                options = {**options, "skip_checks": True}
+            if self.migrate_from_snapshot(connection, options):
+                # Record the migrations as applied.
+                options = {**options, "fake": True}
+        super().handle(*args, **options)
+
+    def migrate_from_snapshot(self, connection, options):
+        """
+        If the apps of the migrations to apply have no applied migrations,
+        create their collections (with all their indexes) from the final state
+        of the migrations instead of applying each operation, then run the
+        migrations' RunPython operations if no other operation follows them.
+        Return whether the migrations were applied this way.
+        """
+        if (
+            options["app_label"]
+            or options["fake"]
+            or options["plan"]
+            or options["check_unapplied"]
+            or options["prune"]
+        ):
+            return False
+        executor = MigrationExecutor(connection)
+        try:
+            executor.loader.check_consistent_history(connection)
+        except InconsistentMigrationHistory:
+            return False
+        if executor.loader.detect_conflicts():
+            return False
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        app_labels = {migration.app_label for migration, _ in plan}
+        if not plan or any(
+            app_label in app_labels for app_label, _ in executor.loader.applied_migrations
+        ):
+            return False
+        state = executor._create_project_state(with_applied_migrations=True)
+        # The RunPython operations and the states that they run with.
+        run_python = []
+        for migration, backwards in plan:
+            if backwards:
+                return False
+            for operation in migration.operations:
+                if isinstance(operation, RunPython):
+                    run_python.append((migration, operation, state.clone()))
+                elif isinstance(operation, self.snapshot_operations):
+                    if run_python and not isinstance(operation, CheckIndexBuilds):
+                        # The documents that the RunPython operation writes
+                        # would miss the changes of this operation (e.g. a
+                        # RenameField or an AddField with a default).
+                        return False
+                    operation.state_forwards(migration.app_label, state)
+                else:
+                    # Operations such as RunSQL or SeparateDatabaseAndState
+                    # may do something else than what the state describes.
+                    return False
+        models = [
+            model
+            for model in state.apps.get_models()
+            if model._meta.app_label in app_labels
+            # Proxy and unmanaged models don't have collections to create.
+            and model._meta.can_migrate(connection)
+            and router.allow_migrate_model(connection.alias, model)
+        ]
+        existing_collections = set(connection.introspection.table_names())
+        if any(model._meta.db_table in existing_collections for model in models):
+            return False
+        if options["verbosity"] >= 1:
+            self.stdout.write(
+                self.style.MIGRATE_HEADING("Creating collections from the migrations' final state:")
+            )
+        try:
+            with connection.schema_editor() as editor:
+                for model in models:
+                    if options["verbosity"] >= 1:
+                        self.stdout.write(f"  Creating collection {model._meta.db_table}")
+                    editor.create_model(model)
+            for migration, operation, from_state in run_python:
+                with connection.schema_editor(atomic=migration.atomic) as editor:
+                    operation.database_forwards(migration.app_label, editor, from_state, from_state)
+        except Exception:
+            with connection.schema_editor() as editor:
+                for model in models:
+                    editor.delete_model(model)
+            raise
+        return True
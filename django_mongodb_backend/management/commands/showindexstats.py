@@ -0,0 +1,170 @@
+import json
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, router
+
+from django_mongodb_backend.index_builds import IndexBuilds
+from django_mongodb_backend.indexes import SearchIndex, VectorSearchIndex
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows the usage and size of the indexes of the models' collections, and the indexes "
+        "that the models declare but that don't exist or that exist but aren't declared."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "app_label",
+            nargs="*",
+            help="Restricts the report to the models of these apps.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Specifies the database to use. Defaults to the "default" database.',
+        )
+        parser.add_argument(
+            "--format",
+            choices=["text", "json"],
+            default="text",
+            help="Specifies the output format. Defaults to text.",
+        )
+
+    def handle(self, *app_labels, **options):
+        db = options["database"]
+        connection = connections[db]
+        connection.ensure_connection()
+        try:
+            app_configs = (
+                [apps.get_app_config(app_label) for app_label in app_labels]
+                if app_labels
+                else apps.get_app_configs()
+            )
+        except LookupError as exc:
+            raise CommandError(exc) from None
+        existing_collections = set(connection.introspection.table_names())
+        # The statuses of the builds deferred by ROLLING_INDEX_BUILDS.
+        build_statuses = {
+            (record["collection"], record["index"]["name"]): record["status"]
+            for record in IndexBuilds(connection).incomplete()
+        }
+        report = {}
+        with connection.schema_editor(collect_sql=True) as editor:
+            for app_config in app_configs:
+                for model in router.get_migratable_models(
+                    app_config, db, include_auto_created=True
+                ):
+                    collection_name = model._meta.db_table
+                    if not model._meta.can_migrate(connection) or collection_name in report:
+                        continue
+                    declared = self.get_declared_indexes(connection, editor, model)
+                    if collection_name in existing_collections:
+                        documents, indexes, unique = self.get_index_stats(
+                            connection, collection_name
+                        )
+                    else:
+                        documents, indexes, unique = 0, {}, set()
+                    for name, index in indexes.items():
+                        if name not in declared:
+                            index["status"] = "undeclared"
+                        elif index["accesses"] == 0:
+                            # Queries don't use the index, but it can't be
+                            # dropped if it enforces uniqueness.
+                            index["status"] = "constraint" if name in unique else "unused"
+                    for name, type_ in declared.items():
+                        if name not in indexes:
+                            indexes[name] = {
+                                "type": type_,
+                                "accesses": None,
+                                "since": None,
+                                "size": None,
+                                "status": build_statuses.get((collection_name, name), "missing"),
+                            }
+                    report[collection_name] = {
+                        "documents": documents,
+                        "indexes": dict(sorted(indexes.items())),
+                    }
+        report = dict(sorted(report.items()))
+        if options["format"] == "json":
+            for stats in report.values():
+                for index in stats["indexes"].values():
+                    if index["since"] is not None:
+                        index["since"] = index["since"].isoformat()
+            self.stdout.write(json.dumps(report, indent=4))
+        else:
+            for collection_name, stats in report.items():
+                self.stdout.write(f"{collection_name} ({stats['documents']} documents)")
+                for name, index in stats["indexes"].items():
+                    self.stdout.write(f"  {name}: {self.describe_index(index)}")
+
+    def get_declared_indexes(self, connection, editor, model):
+        """
+        Return a dictionary mapping the names of the indexes that migrations
+        create for the model to their type ("index", "search", or
+        "vectorSearch").
+        """
+        declared = {
+            index.document["name"]: "index" for index in editor.get_model_index_models(model)
+        }
+        declared["_id_"] = "index"
+        if connection.features.supports_search:
+            for index in model._meta.indexes:
+                if isinstance(index, VectorSearchIndex):
+                    declared[index.name] = "vectorSearch"
+                elif isinstance(index, SearchIndex):
+                    declared[index.name] = "search"
+        return declared
+
+    def get_index_stats(self, connection, collection_name):
+        """
+        Return the number of documents in the collection, a dictionary
+        mapping the names of its indexes to their type, the number of times
+        they were used (`accesses`) since the server started tracking them
+        (`since`), their `size` in bytes, and their `status`, and the set of
+        the names of its unique indexes (including `_id_`).
+        """
+        collection = connection.get_collection(collection_name)
+        indexes = {}
+        unique = {"_id_"}
+        # $indexStats and $collStats return a document per shard.
+        for stats in collection.aggregate([{"$indexStats": {}}]):
+            index = indexes.setdefault(
+                stats["name"],
+                {"type": "index", "accesses": 0, "since": None, "size": 0, "status": "ok"},
+            )
+            index["accesses"] += stats["accesses"]["ops"]
+            if stats["spec"].get("unique"):
+                unique.add(stats["name"])
+            since = stats["accesses"]["since"]
+            if index["since"] is None or since < index["since"]:
+                index["since"] = since
+        documents = 0
+        for stats in collection.aggregate([{"$collStats": {"storageStats": {}}}]):
+            documents += stats["storageStats"]["count"]
+            for name, size in stats["storageStats"]["indexSizes"].items():
+                if name in indexes:
+                    indexes[name]["size"] += size
+        if connection.features.supports_search:
+            for index in collection.list_search_indexes():
+                indexes[index["name"]] = {
+                    "type": index["type"],
+                    "accesses": None,
+                    "since": None,
+                    "size": None,
+                    "status": "ok" if index["status"] == "READY" else index["status"].lower(),
+                }
+        return documents, indexes, unique
+
+    def describe_index(self, index):
+        parts = []
+        if index["type"] != "index":
+            parts.append(f"{index['type']} index")
+        if index["accesses"] is not None:
+            parts.append(f"{index['accesses']} accesses since {index['since']:%Y-%m-%d %H:%M:%S}")
+        if index["size"] is not None:
+            parts.append(f"{index['size']} bytes")
+        if index["status"] != "ok":
+            parts.append(index["status"].upper())
+        return ", ".join(parts)
@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from pymongo.errors import OperationFailure
+
+from django_mongodb_backend.monitoring import format_server_connections_prometheus
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows the configured connection pool size of a database and the connections that "
+        "the server has open from all clients, as reported by serverStatus."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Specifies the database to use. Defaults to the "default" database.',
+        )
+        parser.add_argument(
+            "--format",
+            choices=["json", "prometheus"],
+            default="json",
+            help="Specifies the output format. Defaults to json.",
+        )
+
+    def handle(self, *args, **options):
+        db = options["database"]
+        connection = connections[db]
+        connection.ensure_connection()
+        try:
+            status = connection.connection.admin.command("serverStatus")
+        except OperationFailure as exc:
+            raise CommandError(
+                f"serverStatus failed (it requires the clusterMonitor role): {exc}"
+            ) from exc
+        stats = {
+            db: {
+                "max_pool_size": connection.connection.options.pool_options.max_pool_size,
+                "server": status["host"],
+                "connections": status["connections"],
+            }
+        }
+        if options["format"] == "prometheus":
+            self.stdout.write(format_server_connections_prometheus(stats), ending="")
+        else:
+            self.stdout.write(json.dumps(stats, indent=4))
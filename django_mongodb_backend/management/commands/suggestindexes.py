@@ -0,0 +1,194 @@
+import json
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.db.models import Index
+
+from django_mongodb_backend.indexes import EmbeddedFieldIndex
+from django_mongodb_backend.query_shapes import QueryShapes, recommend_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        "Suggests the compound indexes that would support the queries whose shapes "
+        "INDEX_ADVISOR sampled, as Meta.indexes definitions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "app_label",
+            nargs="*",
+            help="Restricts the suggestions to the models of these apps.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Specifies the database to use. Defaults to the "default" database.',
+        )
+        parser.add_argument(
+            "--min-count",
+            type=int,
+            default=1,
+            help="Only suggests the indexes that support at least this many sampled queries.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Deletes the sampled query shapes instead of suggesting indexes.",
+        )
+
+    def handle(self, *app_labels, **options):
+        db = options["database"]
+        connection = connections[db]
+        connection.ensure_connection()
+        try:
+            app_configs = (
+                [apps.get_app_config(app_label) for app_label in app_labels]
+                if app_labels
+                else apps.get_app_configs()
+            )
+        except LookupError as exc:
+            raise CommandError(exc) from None
+        models = {}
+        for app_config in app_configs:
+            for model in router.get_migratable_models(app_config, db, include_auto_created=True):
+                models.setdefault(model._meta.db_table, model)
+        query_shapes = QueryShapes(connection)
+        if options["clear"]:
+            query_shapes.clear(list(models) if app_labels else None)
+            if options["verbosity"] >= 1:
+                self.stdout.write("Deleted the sampled query shapes.")
+            return
+        shapes = defaultdict(list)
+        for record in query_shapes.shapes(list(models)):
+            shapes[record["_id"]["collection"]].append(record)
+        existing_collections = set(connection.introspection.table_names())
+        suggested = False
+        with connection.schema_editor(collect_sql=True) as editor:
+            for collection_name, records in sorted(shapes.items()):
+                model = models[collection_name]
+                records = self.get_model_shapes(model, records)
+                existing_keys = self.get_declared_keys(editor, model)
+                if collection_name in existing_collections:
+                    existing_keys += self.get_index_keys(
+                        connection.get_collection(collection_name).list_indexes()
+                    )
+                recommendations = [
+                    recommendation
+                    for recommendation in recommend_indexes(records, existing_keys)
+                    if recommendation["count"] >= options["min_count"]
+                ]
+                if not recommendations:
+                    continue
+                suggested = True
+                self.stdout.write(f"{model._meta.label} ({collection_name}):")
+                for recommendation in recommendations:
+                    count = recommendation["count"]
+                    self.stdout.write(
+                        f"    # Supports {count} sampled {'query' if count == 1 else 'queries'}."
+                    )
+                    if options["verbosity"] >= 2:
+                        for shape in recommendation["shapes"]:
+                            self.stdout.write(f"    #   {self.describe_shape(shape)}")
+                    self.stdout.write(f"    {self.get_index_definition(model, recommendation)},")
+        if not suggested and options["verbosity"] >= 1:
+            self.stdout.write("No indexes to suggest.")
+
+    def get_field_name(self, model, path):
+        """
+        Return the name of the model's field stored at the path (a dotted
+        path of names for the fields of embedded models), or None if the
+        path isn't a field of the model (e.g. a field of a joined model).
+        """
+        names = []
+        models = [model]
+        for column in path.split("."):
+            for model_ in models:
+                field = next(
+                    (field for field in model_._meta.concrete_fields if field.column == column),
+                    None,
+                )
+                if field is not None:
+                    break
+            else:
+                return None
+            names.append(field.name)
+            if embedded_model := getattr(field, "embedded_model", None):
+                models = [embedded_model]
+            else:
+                models = getattr(field, "embedded_models", None) or []
+        return ".".join(names)
+
+    def get_model_shapes(self, model, records):
+        """
+        Return the records with the fields of the shapes that aren't fields of
+        the model removed, and with the name of each field in `field_names`.
+        """
+        model_records = []
+        for record in records:
+            shape = record["_id"]
+            field_names = {}
+            for path in {*shape["equality"], *shape["range"], *(f for f, _ in shape["sort"])}:
+                if (name := self.get_field_name(model, path)) is not None:
+                    field_names[path] = name
+            sort = []
+            for field, direction in shape["sort"]:
+                # An index can't support the sort by the fields after one
+                # that it can't contain.
+                if field not in field_names:
+                    break
+                sort.append([field, direction])
+            shape = {
+                "equality": [field for field in shape["equality"] if field in field_names],
+                "sort": sort,
+                "range": [field for field in shape["range"] if field in field_names],
+                "field_names": field_names,
+            }
+            if shape["equality"] or shape["sort"] or shape["range"]:
+                model_records.append({"_id": shape, "count": record["count"]})
+        return model_records
+
+    def get_index_keys(self, indexes):
+        """
+        Return the keys of the index specifications (as list of (field,
+        direction) pairs) that can support queries of all documents, i.e.
+        those of ascending and descending indexes that aren't partial.
+        """
+        return [
+            list(index["key"].items())
+            for index in indexes
+            if "partialFilterExpression" not in index
+            and all(direction in (1, -1) for direction in index["key"].values())
+        ]
+
+    def get_declared_keys(self, editor, model):
+        """Return the keys of the indexes that migrations create for model."""
+        return self.get_index_keys(index.document for index in editor.get_model_index_models(model))
+
+    def get_index_definition(self, model, recommendation):
+        field_names = {}
+        for shape in recommendation["shapes"]:
+            field_names.update(shape["field_names"])
+        fields = [
+            f"-{field_names[field]}" if direction == -1 else field_names[field]
+            for field, direction in recommendation["key"]
+        ]
+        if any("." in field for field in fields):
+            index, class_name = EmbeddedFieldIndex(fields=fields), "EmbeddedFieldIndex"
+        else:
+            index, class_name = Index(fields=fields), "models.Index"
+        index.set_name_with_model(model)
+        return f"{class_name}(fields={json.dumps(fields)}, name={json.dumps(index.name)})"
+
+    def describe_shape(self, shape):
+        parts = []
+        if shape["equality"]:
+            parts.append(f"equality: {', '.join(shape['equality'])}")
+        if shape["sort"]:
+            sort = [f"-{field}" if direction == -1 else field for field, direction in shape["sort"]]
+            parts.append(f"sort: {', '.join(sort)}")
+        if shape["range"]:
+            parts.append(f"range: {', '.join(shape['range'])}")
+        return "; ".join(parts)
@@ -0,0 +1,91 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_mongodb_backend.indexes import get_field
+from django_mongodb_backend.tuning import (
+    benchmark_num_candidates,
+    recommend_num_candidates,
+    sample_query_vectors,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the recall of approximate vector searches for a range of numCandidates "
+        "and recommends a VECTOR_SEARCH_NUM_CANDIDATES setting."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="The model to search, as app_label.ModelName.")
+        parser.add_argument("field", help="The name of the vector field.")
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='Specifies the database to use. Defaults to the "default" database.',
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="The number of results of each search (the k of recall@k). Defaults to 10.",
+        )
+        parser.add_argument(
+            "--sample-size",
+            type=int,
+            default=50,
+            help="The number of documents whose vectors are used as query vectors. Defaults to 50.",
+        )
+        parser.add_argument(
+            "--num-candidates",
+            type=int,
+            nargs="+",
+            help="The numCandidates values to measure. Defaults to multiples of --limit "
+            "from 1x to 20x.",
+        )
+        parser.add_argument(
+            "--target-recall",
+            type=float,
+            default=0.95,
+            help="The mean recall that the recommended numCandidates must reach. Defaults to 0.95.",
+        )
+
+    def handle(self, *args, **options):
+        db = options["database"]
+        connection = connections[db]
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as exc:
+            raise CommandError(exc) from exc
+        field_name = options["field"]
+        column = get_field(model, field_name).column
+        limit = options["limit"]
+        num_candidates_values = options["num_candidates"] or [
+            limit * factor for factor in (1, 2, 5, 10, 15, 20)
+        ]
+        query_vectors = sample_query_vectors(model, field_name, options["sample_size"], db)
+        if not query_vectors:
+            raise CommandError(f"{model._meta.label} has no documents with a '{field_name}'.")
+        results = benchmark_num_candidates(
+            model._base_manager.using(db), field_name, query_vectors, limit, num_candidates_values
+        )
+        self.stdout.write(f"{'numCandidates':>13}  {'recall@' + str(limit):>10}  {'latency':>10}")
+        for result in results:
+            self.stdout.write(
+                f"{result.num_candidates:>13}  {result.recall:>10.3f}  "
+                f"{result.median_latency * 1000:>8.1f}ms"
+            )
+        target_recall = options["target_recall"]
+        num_candidates = recommend_num_candidates(results, target_recall)
+        if not any(result.recall >= target_recall for result in results):
+            self.stderr.write(
+                f"No numCandidates reached a recall of {target_recall}. Try larger values "
+                "with --num-candidates."
+            )
+        index_name = connection.search_index_cache.get_index_name(
+            connection.get_collection(model._meta.db_table), {column}, "vectorSearch"
+        )
+        self.stdout.write(
+            f"\nRecommended setting:\n\n"
+            f'"VECTOR_SEARCH_NUM_CANDIDATES": {{"{index_name}": {num_candidates}}}'
+        )
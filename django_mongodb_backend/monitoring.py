@@ -0,0 +1,268 @@
+import threading
+from collections import defaultdict
+
+from pymongo.monitoring import (
+    CommandListener,
+    ConnectionCheckOutFailedReason,
+    ConnectionPoolListener,
+)
+
+
+class ServerPoolStats:
+    """The statistics of the connection pool to one server."""
+
+    def __init__(self):
+        # The number of open connections.
+        self.connections = 0
+        # The number of connections checked out by the application.
+        self.checked_out = 0
+        # The number of threads waiting to check out a connection.
+        self.waiting = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_timeouts = 0
+        # The time spent waiting to check out a connection, in seconds.
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.pool_clears = 0
+
+    def as_dict(self):
+        attempts = self.checkouts + self.checkout_failures
+        return {
+            "connections": self.connections,
+            "checked_out": self.checked_out,
+            "waiting": self.waiting,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "checkout_timeouts": self.checkout_timeouts,
+            "wait_time_total": self.wait_time_total,
+            "wait_time_avg": self.wait_time_total / attempts if attempts else 0.0,
+            "wait_time_max": self.wait_time_max,
+            "pool_clears": self.pool_clears,
+        }
+
+
+class PoolMetricsListener(ConnectionPoolListener):
+    """
+    Collect the connection pool statistics of a MongoClient from PyMongo's
+    connection monitoring (CMAP) events.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.servers = defaultdict(ServerPoolStats)
+
+    def _get_stats(self, address):
+        return self.servers[f"{address[0]}:{address[1]}"]
+
+    def as_dict(self):
+        with self.lock:
+            return {address: stats.as_dict() for address, stats in self.servers.items()}
+
+    # ConnectionPoolListener
+    def pool_created(self, event):
+        with self.lock:
+            self._get_stats(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self.lock:
+            self._get_stats(event.address).pool_clears += 1
+
+    def pool_closed(self, event):
+        with self.lock:
+            self.servers.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event):
+        with self.lock:
+            self._get_stats(event.address).connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self.lock:
+            self._get_stats(event.address).connections -= 1
+
+    def connection_check_out_started(self, event):
+        with self.lock:
+            self._get_stats(event.address).waiting += 1
+
+    def connection_check_out_failed(self, event):
+        with self.lock:
+            stats = self._get_stats(event.address)
+            stats.waiting -= 1
+            stats.checkout_failures += 1
+            if event.reason == ConnectionCheckOutFailedReason.TIMEOUT:
+                stats.checkout_timeouts += 1
+            self._add_wait_time(stats, event.duration)
+
+    def connection_checked_out(self, event):
+        with self.lock:
+            stats = self._get_stats(event.address)
+            stats.waiting -= 1
+            stats.checked_out += 1
+            stats.checkouts += 1
+            self._add_wait_time(stats, event.duration)
+
+    def connection_checked_in(self, event):
+        with self.lock:
+            self._get_stats(event.address).checked_out -= 1
+
+    @staticmethod
+    def _add_wait_time(stats, duration):
+        stats.wait_time_total += duration
+        stats.wait_time_max = max(stats.wait_time_max, duration)
+
+
+class WrittenCollectionsListener(CommandListener):
+    """
+    Record the collections that a MongoClient's commands write documents to,
+    from PyMongo's command monitoring events, so that flushing the test
+    database can skip the collections that are already empty.
+    """
+
+    # The commands that write to the collection named by their first field.
+    write_commands = {"insert", "update", "findAndModify"}
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # The (database name, collection name) pairs written to.
+        self.collections = set()
+        # Whether other collections may have been written to, e.g. because
+        # writes happened before the listener was registered, in which case
+        # `clean` holds the pairs that were popped since.
+        self.unknown = True
+        self.clean = set()
+
+    def pop(self, database_name, collection_names):
+        """
+        Return the names of the given collections of the database that may
+        have been written to since they were previously popped.
+        """
+        pairs = {(database_name, name) for name in collection_names}
+        with self.lock:
+            written = pairs & self.collections
+            self.collections -= pairs
+            if self.unknown:
+                written |= pairs - self.clean
+                self.clean |= pairs
+        return {name for _, name in written}
+
+    def started(self, event):
+        command_name = event.command_name
+        if command_name in self.write_commands:
+            written = (event.database_name, event.command[command_name])
+        elif command_name == "renameCollection":
+            written = tuple(event.command["to"].split(".", 1))
+        elif command_name == "bulkWrite" or (
+            command_name == "aggregate"
+            and any("$out" in stage or "$merge" in stage for stage in event.command["pipeline"])
+        ):
+            # Don't bother finding the collections of these rare writes.
+            with self.lock:
+                self.unknown = True
+                self.clean.clear()
+            return
+        else:
+            return
+        with self.lock:
+            self.collections.add(written)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def format_prometheus(stats_by_alias):
+    """
+    Format the pool statistics of some database aliases, as returned by
+    DatabaseWrapper.pool_stats(), in the Prometheus text exposition format.
+    """
+    metrics = {
+        "max_pool_size": ("gauge", "The maximum number of connections per server."),
+        "min_pool_size": ("gauge", "The minimum number of connections per server."),
+        "connections": ("gauge", "The number of open connections."),
+        "checked_out": ("gauge", "The number of connections in use."),
+        "waiting": ("gauge", "The number of threads waiting for a connection."),
+        "checkouts": ("counter", "The number of connection checkouts."),
+        "checkout_failures": ("counter", "The number of failed connection checkouts."),
+        "checkout_timeouts": ("counter", "The number of timed out connection checkouts."),
+        "wait_time_total": ("counter", "The time spent waiting for a connection, in seconds."),
+        "wait_time_max": ("gauge", "The longest wait for a connection, in seconds."),
+        "pool_clears": ("counter", "The number of times the pool was cleared."),
+        "heartbeat_rtt": ("gauge", "The average heartbeat round trip time, in seconds."),
+    }
+    durations = {"wait_time_total", "wait_time_max", "heartbeat_rtt"}
+    samples = defaultdict(list)
+    for alias, stats in stats_by_alias.items():
+        for name in ("max_pool_size", "min_pool_size"):
+            samples[name].append((f'alias="{alias}"', stats[name]))
+        for address, server_stats in stats["servers"].items():
+            for name, value in server_stats.items():
+                if name in metrics and value is not None:
+                    samples[name].append((f'alias="{alias}",server="{address}"', value))
+    lines = []
+    for name, (metric_type, help_text) in metrics.items():
+        if not samples[name]:
+            continue
+        # Prometheus metric names end with their unit, then with _total for
+        # counters.
+        metric = f"django_mongodb_pool_{name.removesuffix('_total')}"
+        if name in durations:
+            metric += "_seconds"
+        if metric_type == "counter":
+            metric += "_total"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        lines.extend(f"{metric}{{{labels}}} {value}" for labels, value in samples[name])
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def format_server_connections_prometheus(stats_by_alias):
+    """
+    Format the connections that the server reports for some database aliases,
+    as printed by the showpoolstats command, in the Prometheus text exposition
+    format.
+    """
+    metrics = {
+        "current": ("connections", "gauge", "The number of open incoming connections."),
+        "available": (
+            "connections_available",
+            "gauge",
+            "The number of unused incoming connections available.",
+        ),
+        "active": ("connections_active", "gauge", "The number of active client connections."),
+        "totalCreated": (
+            "connections_created_total",
+            "counter",
+            "The number of incoming connections created.",
+        ),
+    }
+    lines = []
+    if stats_by_alias:
+        lines.append(
+            "# HELP django_mongodb_pool_max_pool_size The maximum number of connections per server."
+        )
+        lines.append("# TYPE django_mongodb_pool_max_pool_size gauge")
+        lines.extend(
+            f'django_mongodb_pool_max_pool_size{{alias="{alias}"}} {stats["max_pool_size"]}'
+            for alias, stats in stats_by_alias.items()
+        )
+    for name, (metric_name, metric_type, help_text) in metrics.items():
+        samples = [
+            (f'alias="{alias}",server="{stats["server"]}"', stats["connections"][name])
+            for alias, stats in stats_by_alias.items()
+            if name in stats["connections"]
+        ]
+        if not samples:
+            continue
+        metric = f"django_mongodb_server_{metric_name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        lines.extend(f"{metric}{{{labels}}} {value}" for labels, value in samples)
+    return "\n".join(lines) + "\n" if lines else ""
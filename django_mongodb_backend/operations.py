@@ -2,6 +2,7 @@ import datetime
 import json
 import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
 from bson import Decimal128, Int64
@@ -36,9 +37,15 @@ class DatabaseOperations(GISOperations, BaseDatabaseOperations):
         Combinable.BITOR: "bitOr",
         Combinable.BITXOR: "bitXor",
     }
+
     explain_options = {"comment", "verbosity"}
     explain_prefix = "db.command('explain',"  # Expected value for tests.
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # {collection name: whether the collection is capped}
+        self.capped_collections = {}
+
     def adapt_datefield_value(self, value):
         """Store DateField as datetime."""
         if value is None:
@@ -285,15 +292,22 @@ class DatabaseOperations(GISOperations, BaseDatabaseOperations):
         return tables
 
     def execute_sql_flush(self, tables):
-        for table in tables:
-            if table.startswith("system."):
-                # Do not drop system collections.
-                continue
-
-            collection = self.connection.database[table]
-            options = collection.options()
-            if not options.get("capped", False):
-                collection.delete_many({})
+        # Do not drop system collections.
+        tables = [table for table in tables if not table.startswith("system.")]
+        # Skip the collections that weren't written to, if writes are tracked.
+        if (written := self.connection.pop_written_collections(tables)) is not None:
+            tables = [table for table in tables if table in written]
+        database = self.connection.database
+        if unknown := [table for table in tables if table not in self.capped_collections]:
+            for info in database.list_collections(filter={"name": {"$in": unknown}}):
+                self.capped_collections[info["name"]] = info.get("options", {}).get("capped", False)
+        tables = [table for table in tables if not self.capped_collections.get(table)]
+        if len(tables) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(tables), 8)) as executor:
+                # list() raises the exceptions of the deletes, if any.
+                list(executor.map(lambda table: database[table].delete_many({}), tables))
+        elif tables:
+            database[tables[0]].delete_many({})
 
     def explain_query_prefix(self, format=None, **options):
         # Validate options.
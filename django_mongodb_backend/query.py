@@ -22,7 +22,7 @@ def wrap_database_errors(func):
         except BulkWriteError as e:
             if "E11000 duplicate key error" in str(e):
                 raise IntegrityError(str(e)) from e
-            raise
+            raise DatabaseError(str(e)) from e
         except DuplicateKeyError as e:
             raise IntegrityError(str(e)) from e
         except PyMongoError as e:
@@ -69,6 +69,8 @@ class MongoQuery:
         """Execute a delete query."""
         if self.compiler.subqueries:
             raise NotSupportedError("Cannot use QuerySet.delete() when a subquery is required.")
+        if (buffer := self.compiler.connection.write_buffer) is not None:
+            return buffer.delete_many(self.compiler.collection_name, self.match_mql)
         return self.compiler.collection.delete_many(
             self.match_mql, session=self.compiler.connection.session
         ).deleted_count
@@ -79,9 +81,24 @@ class MongoQuery:
         Return a pymongo CommandCursor that can be iterated on to give the
         results of the query.
         """
-        return self.compiler.collection.aggregate(
-            self.get_pipeline(), session=self.compiler.connection.session
+        pipeline = self.get_pipeline()
+        query_shapes = self.compiler.connection.query_shapes
+        if query_shapes is not None and not self.search_pipeline:
+            # Sample the shape of the query for the suggestindexes command.
+            query_shapes.sample(self.compiler.collection_name, self.match_mql, self.ordering)
+        if (buffer := self.compiler.connection.write_buffer) is not None:
+            # Make the pending writes of atomic(batch_writes=True) visible.
+            buffer.flush_for_read(self.compiler.collection_name, pipeline)
+        cursor = self.compiler.collection.aggregate(
+            pipeline, session=self.compiler.connection.session
         )
+        if getattr(self.query, "with_search_meta", False):
+            # The $facet stage returns a single document with the results and
+            # the metadata (which is missing if the search matched nothing).
+            result = cursor.next()
+            self.query.search_meta = next(iter(result["meta"]), None)
+            return iter(result["hits"])
+        return cursor
 
     def get_pipeline(self):
         pipeline = []
@@ -149,6 +166,20 @@ class MongoQuery:
             pipeline.append({"$skip": self.query.low_mark})
         if self.query.high_mark is not None:
             pipeline.append({"$limit": self.query.high_mark - self.query.low_mark})
+        # Set by MongoQuerySet.search_facets().
+        if getattr(self.query, "with_search_meta", False):
+            # Read $$SEARCH_META once, alongside the results, rather than in
+            # each of them.
+            search_stages = len(self.search_pipeline)
+            pipeline = [
+                *pipeline[:search_stages],
+                {
+                    "$facet": {
+                        "hits": pipeline[search_stages:],
+                        "meta": [{"$replaceWith": "$$SEARCH_META"}, {"$limit": 1}],
+                    }
+                },
+            ]
         if self.subquery_lookup:
             table_output = self.subquery_lookup["as"]
             pipeline = [
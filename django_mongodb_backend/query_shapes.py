@@ -0,0 +1,272 @@
+import contextlib
+import random
+from time import monotonic
+
+from django.utils import timezone
+from pymongo.errors import PyMongoError
+from pymongo.operations import UpdateOne
+
+# The query operators that select documents equal to one of a few values and
+# those that select a range of values (or the documents that don't match a
+# value, which an index scans like a range).
+EQUALITY_OPERATORS = {"$eq", "$in"}
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$regex", "$exists"}
+
+
+def _is_field_path(value):
+    return isinstance(value, str) and value.startswith("$") and not value.startswith("$$")
+
+
+def _is_constant(value):
+    if isinstance(value, str):
+        return not value.startswith("$")
+    if isinstance(value, dict):
+        return "$literal" in value or all(_is_constant(item) for item in value.values())
+    if isinstance(value, list | tuple):
+        return all(_is_constant(item) for item in value)
+    return True
+
+
+def _add_expr_conditions(expr, equality, range_):
+    """
+    Add the fields that the $expr expression compares to a constant to the
+    equality and range sets.
+    """
+    if not isinstance(expr, dict) or len(expr) != 1:
+        return
+    ((operator, args),) = expr.items()
+    if operator == "$and":
+        for condition in args:
+            _add_expr_conditions(condition, equality, range_)
+    elif (
+        isinstance(args, list)
+        and len(args) == 2
+        and _is_field_path(args[0])
+        and _is_constant(args[1])
+    ):
+        if operator in EQUALITY_OPERATORS:
+            equality.add(args[0][1:])
+        elif operator in RANGE_OPERATORS:
+            range_.add(args[0][1:])
+
+
+def _add_conditions(match, equality, range_):
+    """
+    Add the fields that the $match filter uses to the equality and range sets.
+    """
+    for key, value in match.items():
+        if key == "$and":
+            for condition in value:
+                _add_conditions(condition, equality, range_)
+        elif key == "$expr":
+            _add_expr_conditions(value, equality, range_)
+        elif key.startswith("$"):
+            # The branches of $or and $nor can't use the same index prefix.
+            continue
+        elif isinstance(value, dict) and any(operator.startswith("$") for operator in value):
+            for operator in value:
+                if operator in EQUALITY_OPERATORS:
+                    equality.add(key)
+                elif operator in RANGE_OPERATORS:
+                    range_.add(key)
+        else:
+            equality.add(key)
+
+
+def get_query_shape(match, sort):
+    """
+    Return the shape of a query with the `match` filter and the `sort`
+    ordering: a dictionary with the fields that the query selects by
+    `equality`, the [field, direction] pairs of its `sort`, and the fields
+    that it selects by `range`, or None if no index can support the query.
+    """
+    equality = set()
+    range_ = set()
+    _add_conditions(match, equality, range_)
+    sort_fields = []
+    for field, direction in dict(sort).items():
+        # An index can't sort by a computed value (e.g. nulls_first), or by
+        # the fields after it.
+        if field.startswith("__"):
+            break
+        # The documents selected by equality have the same value.
+        if field not in equality:
+            sort_fields.append([field, direction])
+    range_ -= equality | {field for field, _ in sort_fields}
+    if not equality and not sort_fields and not range_:
+        return None
+    return {"equality": sorted(equality), "sort": sort_fields, "range": sorted(range_)}
+
+
+def get_index_key(shape):
+    """
+    Return the key of the compound index that best supports queries of the
+    shape, following the equality, sort, range rule: a list of (field,
+    direction) pairs.
+    """
+    return [
+        *((field, 1) for field in shape["equality"]),
+        *((field, direction) for field, direction in shape["sort"]),
+        *((field, 1) for field in shape["range"]),
+    ]
+
+
+def index_supports(key, shape):
+    """
+    Return whether the index with the key (a list of (field, direction)
+    pairs) supports queries of the shape, that is, whether its leading fields
+    are the equality fields (in any order), then the sort fields (in the same
+    or the reverse directions), then the range fields (in any order).
+    """
+    fields = [field for field, _ in key]
+    equality, sort, range_ = shape["equality"], shape["sort"], shape["range"]
+    if set(fields[: len(equality)]) != set(equality):
+        return False
+    index_sort = key[len(equality) : len(equality) + len(sort)]
+    if [field for field, _ in index_sort] != [field for field, _ in sort]:
+        return False
+    directions = [(direction, sort[i][1]) for i, (_, direction) in enumerate(index_sort)]
+    if not (
+        all(direction == sort_direction for direction, sort_direction in directions)
+        or all(direction == -sort_direction for direction, sort_direction in directions)
+    ):
+        return False
+    start = len(equality) + len(sort)
+    return set(fields[start : start + len(range_)]) == set(range_)
+
+
+def recommend_indexes(shapes, existing_keys=()):
+    """
+    Return the keys of the compound indexes that support the recorded shapes
+    (as returned by QueryShapes.shapes()) of a collection's queries that none
+    of the existing indexes (given by their keys) support, most used first:
+    a list of dictionaries with the `key`, the number of sampled queries that
+    the index supports (`count`), and the `shapes` that it supports.
+
+    A single index is recommended for the shapes that the index of another
+    shape supports (e.g. the index on (a, b) supports the queries that
+    select by equality on a).
+    """
+    recommendations = []
+    # Recommend the longest keys first so that shorter ones may be folded
+    # into them.
+    for record in sorted(shapes, key=lambda record: -len(get_index_key(record["_id"]))):
+        shape = record["_id"]
+        if any(index_supports(key, shape) for key in existing_keys):
+            continue
+        for recommendation in recommendations:
+            if index_supports(recommendation["key"], shape):
+                recommendation["count"] += record["count"]
+                recommendation["shapes"].append(shape)
+                break
+        else:
+            recommendations.append(
+                {"key": get_index_key(shape), "count": record["count"], "shapes": [shape]}
+            )
+    return sorted(recommendations, key=lambda recommendation: -recommendation["count"])
+
+
+class QueryShapes:
+    """
+    The shapes of the queries that INDEX_ADVISOR samples, which are recorded
+    in the `collection_name` collection for the suggestindexes command.
+
+    Each record's `_id` is the shape (see get_query_shape()) with the name of
+    the `collection`, and the record has the number of sampled queries of
+    that shape (`count`) and when the last one was sampled (`last_seen`).
+
+    Samples are counted in memory and written with one bulk write when the
+    first sample after FLUSH_INTERVAL seconds is taken, and when the
+    connection's client is closed, so that sampling doesn't add a write to
+    the sampled queries.
+    """
+
+    collection_name = "django_query_shapes"
+
+    def __init__(self, connection):
+        self.connection = connection
+        # {(collection name, equality, sort, range): [count, last seen]}
+        self.pending = {}
+        self.last_flush = monotonic()
+
+    @property
+    def records(self):
+        return self.connection.get_collection(self.collection_name)
+
+    @property
+    def sample_rate(self):
+        return self.connection.settings_dict["INDEX_ADVISOR"].get("SAMPLE_RATE", 0.01)
+
+    @property
+    def flush_interval(self):
+        return self.connection.settings_dict["INDEX_ADVISOR"].get("FLUSH_INTERVAL", 60)
+
+    def sample(self, collection_name, match, sort):
+        """
+        Count the shape of a query of the collection with the `match` filter
+        and the `sort` ordering, for a SAMPLE_RATE fraction of the queries.
+        """
+        if random.random() >= self.sample_rate:  # noqa: S311
+            return
+        if (shape := get_query_shape(match, sort)) is None:
+            return
+        key = (
+            collection_name,
+            tuple(shape["equality"]),
+            tuple((field, direction) for field, direction in shape["sort"]),
+            tuple(shape["range"]),
+        )
+        pending = self.pending.setdefault(key, [0, None])
+        pending[0] += 1
+        pending[1] = timezone.now()
+        if monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Record the pending samples."""
+        pending, self.pending = self.pending, {}
+        self.last_flush = monotonic()
+        if not pending:
+            return
+        operations = [
+            self._get_record_operation(
+                collection_name,
+                {
+                    "equality": list(equality),
+                    "sort": [list(item) for item in sort],
+                    "range": list(range_),
+                },
+                count,
+                last_seen,
+            )
+            for (collection_name, equality, sort, range_), (count, last_seen) in pending.items()
+        ]
+        # Failing to record the samples mustn't fail the query that triggered
+        # the flush.
+        with contextlib.suppress(PyMongoError):
+            self.records.bulk_write(operations, ordered=False)
+
+    def _get_record_operation(self, collection_name, shape, count, last_seen):
+        return UpdateOne(
+            {"_id": {"collection": collection_name, **shape}},
+            {"$inc": {"count": count}, "$max": {"last_seen": last_seen}},
+            upsert=True,
+        )
+
+    def record(self, collection_name, shape, count=1):
+        """Record `count` sampled queries of the shape at once."""
+        operation = self._get_record_operation(collection_name, shape, count, timezone.now())
+        self.records.bulk_write([operation])
+
+    def shapes(self, collection_names=None):
+        """
+        Return the records of the shapes of the queries of all collections or
+        of the given ones, most sampled first.
+        """
+        query = {} if collection_names is None else {"_id.collection": {"$in": collection_names}}
+        return list(self.records.find(query).sort([("count", -1), ("_id.collection", 1)]))
+
+    def clear(self, collection_names=None):
+        """Delete the records of all collections or of the given ones."""
+        query = {} if collection_names is None else {"_id.collection": {"$in": collection_names}}
+        self.records.delete_many(query)
@@ -1,8 +1,8 @@
-from itertools import chain
+from itertools import chain, islice
 
 from django.core.exceptions import FieldDoesNotExist
 from django.db import connections
-from django.db.models import QuerySet
+from django.db.models import QuerySet, Value
 from django.db.models.query import RawModelIterable as BaseRawModelIterable
 from django.db.models.query import RawQuerySet as BaseRawQuerySet
 from django.db.models.sql.query import RawQuery as BaseRawQuery
@@ -12,6 +12,111 @@ class MongoQuerySet(QuerySet):
     def raw_aggregate(self, pipeline, using=None):
         return RawQuerySet(pipeline, model=self.model, using=using)
 
+    def search_after(self, token):
+        """
+        Return the search results after the one whose SearchSequenceToken is
+        token, using $search's searchAfter option rather than skipping the
+        earlier results.
+        """
+        return self._search_sequence("searchAfter", token)
+
+    def search_before(self, token):
+        """
+        Return, in reverse order, the search results before the one whose
+        SearchSequenceToken is token, using $search's searchBefore option.
+        """
+        return self._search_sequence("searchBefore", token)
+
+    def _search_sequence(self, option, token):
+        clone = self._chain()
+        clone.query.search_sequence = (option, token)
+        return clone
+
+    def search_facets(self, operator, facets, *, count=None):
+        """
+        Run a search and return a tuple of the list of matching objects and
+        the search's metadata: the total count and the buckets of each of
+        facets, as returned by $searchMeta.
+
+        The queryset must be sliced since its results and the metadata, read
+        from $$SEARCH_META, come back in a single document of a $facet stage.
+        """
+        from .expressions.search import SearchFacet  # noqa: PLC0415
+
+        expression = SearchFacet(operator, facets, count=count)
+        if self.query.high_mark is None:
+            raise ValueError("search_facets() requires a sliced queryset, e.g. queryset[:10].")
+        clone = self.annotate(_search_facet=expression)
+        clone.query.with_search_meta = True
+        objects = list(clone)
+        for obj in objects:
+            del obj.__dict__["_search_facet"]
+        if (meta := getattr(clone.query, "search_meta", None)) is None:
+            # Without a document to carry $$SEARCH_META, run $searchMeta to
+            # get the counts.
+            query = clone.query.chain()
+            query.get_initial_alias()
+            compiler = query.get_compiler(self.db)
+            connection = compiler.connection
+            stage = expression.resolve_expression(query).as_search_meta(compiler, connection)
+            collection = compiler.collection
+            if (buffer := connection.write_buffer) is not None:
+                buffer.flush_for_read(collection.name, [stage])
+            meta = next(collection.aggregate([stage], session=connection.session))
+        return objects, meta
+
+    def vector_search_batch(
+        self,
+        path,
+        query_vectors,
+        limit,
+        *,
+        num_candidates=None,
+        exact=None,
+        filter=None,
+        batch_size=20,
+    ):
+        """
+        Run a vector search for each of query_vectors and yield, in the same
+        order, a list of the `limit` objects nearest to each one, annotated
+        with their `score`.
+
+        Up to batch_size searches are combined with $unionWith so that each
+        batch takes one round trip. Results are yielded as each batch
+        completes.
+        """
+        from .expressions import SearchVector  # noqa: PLC0415
+
+        connection = connections[self.db]
+        # $vectorSearch isn't allowed in $unionWith before MongoDB 8.0.
+        if not connection.features.is_mongodb_8_0:
+            batch_size = 1
+        query_vectors = iter(query_vectors)
+        while batch := list(islice(query_vectors, batch_size)):
+            querysets = [
+                self.annotate(
+                    score=SearchVector(
+                        path,
+                        query_vector,
+                        limit,
+                        num_candidates=num_candidates,
+                        exact=exact,
+                        filter=filter,
+                    ),
+                    _vector_search_batch_index=Value(index),
+                )
+                for index, query_vector in enumerate(batch)
+            ]
+            queryset = querysets[0]
+            if len(querysets) > 1:
+                queryset = queryset.union(*querysets[1:], all=True)
+            results = [[] for _ in batch]
+            for obj in queryset.iterator():
+                results[obj.__dict__.pop("_vector_search_batch_index")].append(obj)
+            for objs in results:
+                objs.sort(key=lambda obj: obj.score, reverse=True)
+                yield objs
+
 
 class RawQuerySet(BaseRawQuerySet):
     def __init__(self, pipeline, model=None, using=None):
@@ -35,6 +140,8 @@ class RawQuery(BaseRawQuery):
     def _execute_query(self):
         connection = connections[self.using]
         collection = connection.get_collection(self.model._meta.db_table)
+        if (buffer := connection.write_buffer) is not None:
+            buffer.flush_for_read(collection.name, self.pipeline)
         self.cursor = collection.aggregate(self.pipeline, session=connection.session)
 
     def __str__(self):
@@ -1,16 +1,22 @@
+import warnings
+from collections import defaultdict
+from contextlib import contextmanager
 from time import monotonic, sleep
 
 from django.core.exceptions import ImproperlyConfigured
-from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db import DatabaseError
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor, logger
 from django.db.models import Index, UniqueConstraint
 from pymongo.operations import SearchIndexModel
 
 from django_mongodb_backend.indexes import SearchIndex
 
+from .backfill import BatchUpdate
 from .fields import EmbeddedModelField
 from .gis.schema import GISSchemaEditor
+from .index_builds import IndexBuilds
 from .query import wrap_database_errors
-from .utils import OperationCollector, model_has_encrypted_fields
+from .utils import LazyFieldDefaults, OperationCollector, model_has_encrypted_fields
 
 
 def ignore_embedded_models(func):
@@ -32,6 +38,23 @@ def ignore_embedded_models(func):
 
 
 class BaseSchemaEditor(BaseDatabaseSchemaEditor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The names of the search indexes created by add_index() that aren't
+        # known to be ready, by collection name.
+        self.pending_search_indexes = defaultdict(set)
+        # The IndexModels to create at the end of batch_index_creation(), by
+        # collection name, or None outside of it.
+        self.batched_indexes = None
+        # The collections created by create_model(), whose indexes are always
+        # built at once.
+        self.created_collections = set()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.wait_until_search_indexes_ready()
+
     def get_collection(self, name):
         if self.collect_sql:
             return OperationCollector(self.collected_sql, collection=self.connection.database[name])
@@ -42,15 +65,113 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
             return OperationCollector(self.collected_sql, db=self.connection.database)
         return self.connection.get_database()
 
+    def update_documents(self, model, filter, update, operation):
+        """
+        Update the model's documents that match filter. If
+        BATCHED_SCHEMA_UPDATES is configured, the update is applied in
+        resumable, throttled batches identified by operation.
+        """
+        collection_name = model._meta.db_table
+        options = self.connection.settings_dict.get("BATCHED_SCHEMA_UPDATES")
+        if options is None or self.collect_sql:
+            self.get_collection(collection_name).update_many(filter, update)
+            return
+        BatchUpdate(
+            self.connection,
+            collection_name,
+            filter,
+            update,
+            name=f"{collection_name}:{operation}",
+            batch_size=options.get("BATCH_SIZE", 1000),
+            max_rate=options.get("MAX_RATE"),
+        ).run()
+
+    @contextmanager
+    def batch_index_creation(self):
+        """
+        Create the indexes added inside the block with a single createIndexes
+        command per collection when the block exits, so that the server builds
+        them in one scan of the collection.
+        """
+        if self.batched_indexes is not None:
+            # Already in a batch.
+            yield
+            return
+        self.batched_indexes = defaultdict(list)
+        try:
+            yield
+            for collection_name, indexes in self.batched_indexes.items():
+                self.get_collection(collection_name).create_indexes(indexes)
+        finally:
+            self.batched_indexes = None
+
+    def create_indexes(self, model, indexes):
+        """
+        Create the IndexModels on the model's collection, or add them to the
+        current batch_index_creation().
+        """
+        collection_name = model._meta.db_table
+        if (index_builds := self.get_index_builds(collection_name)) is not None:
+            # Defer the builds of non-unique indexes. Unique indexes are
+            # built at once so that they're enforced.
+            options = self.connection.settings_dict["ROLLING_INDEX_BUILDS"]
+            commit_quorum = options.get("COMMIT_QUORUM", "votingMembers")
+            for index in indexes:
+                if not index.document.get("unique"):
+                    index_builds.add(collection_name, index, commit_quorum)
+            indexes = [index for index in indexes if index.document.get("unique")]
+            if not indexes:
+                return
+        if self.batched_indexes is None:
+            self.get_collection(collection_name).create_indexes(indexes)
+        else:
+            self.batched_indexes[collection_name].extend(indexes)
+
+    def get_index_builds(self, collection_name):
+        """
+        Return the IndexBuilds that defers the index builds of the collection
+        if ROLLING_INDEX_BUILDS is enabled, or None.
+        """
+        if (
+            self.connection.settings_dict.get("ROLLING_INDEX_BUILDS") is None
+            or self.collect_sql
+            or collection_name in self.created_collections
+        ):
+            return None
+        return IndexBuilds(self.connection)
+
+    def _discard_index_build(self, model, index_name):
+        """
+        Delete the record of the deferred build of the model's index, if any,
+        returning whether the build hadn't started (so the index doesn't
+        exist and mustn't be dropped).
+        """
+        index_builds = self.get_index_builds(model._meta.db_table)
+        return index_builds is not None and index_builds.discard(model._meta.db_table, index_name)
+
+    def get_lazy_defaults_collection(self):
+        """
+        Return the collection that records the lazy field defaults, or None if
+        LAZY_FIELD_DEFAULTS isn't enabled.
+        """
+        if not self.connection.settings_dict.get("LAZY_FIELD_DEFAULTS"):
+            return None
+        # Queries must reload the defaults after they're changed.
+        self.connection.lazy_field_defaults.invalidate()
+        return self.get_collection(LazyFieldDefaults.collection_name)
+
     @wrap_database_errors
     @ignore_embedded_models
     def create_model(self, model):
         self._create_collection(model)
-        self._create_model_indexes(model)
-        # Make implicit M2M tables.
-        for field in model._meta.local_many_to_many:
-            if field.remote_field.through._meta.auto_created:
-                self.create_model(field.remote_field.through)
+        self.created_collections.add(model._meta.db_table)
+        self.connection.ops.capped_collections[model._meta.db_table] = False
+        with self.batch_index_creation():
+            self._create_model_indexes(model)
+            # Make implicit M2M tables.
+            for field in model._meta.local_many_to_many:
+                if field.remote_field.through._meta.auto_created:
+                    self.create_model(field.remote_field.through)
 
     def _create_model_indexes(self, model, column_prefix="", parent_model=None):
         """
@@ -79,6 +200,20 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
         for index in model._meta.indexes:
             self.add_index(model, index)
 
+    def get_model_index_models(self, model):
+        """
+        Return the IndexModels of the indexes that create_model() creates for
+        the model (excluding search indexes) without creating them. The editor
+        must collect SQL so that nothing else is executed.
+        """
+        batched_indexes = self.batched_indexes
+        self.batched_indexes = defaultdict(list)
+        try:
+            self._create_model_indexes(model)
+            return self.batched_indexes[model._meta.db_table]
+        finally:
+            self.batched_indexes = batched_indexes
+
     @ignore_embedded_models
     def delete_model(self, model):
         # Delete implicit M2m tables.
@@ -86,6 +221,13 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
             if field.remote_field.through._meta.auto_created:
                 self.delete_model(field.remote_field.through)
         self.get_collection(model._meta.db_table).drop()
+        if (lazy_defaults := self.get_lazy_defaults_collection()) is not None:
+            lazy_defaults.delete_many({"collection": model._meta.db_table})
+        if (index_builds := self.get_index_builds(model._meta.db_table)) is not None:
+            index_builds.discard_collection(model._meta.db_table)
+        self.pending_search_indexes.pop(model._meta.db_table, None)
+        self.connection.search_index_cache.invalidate(model._meta.db_table)
+        self.connection.ops.capped_collections.pop(model._meta.db_table, None)
 
     @ignore_embedded_models
     def add_field(self, model, field):
@@ -95,14 +237,26 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
             return
         # Set default value on existing documents.
         if column := field.column:
-            self.get_collection(model._meta.db_table).update_many(
-                {}, [{"$set": {column: self.effective_default(field)}}]
-            )
+            default = self.effective_default(field)
+            lazy_defaults = self.get_lazy_defaults_collection()
+            if lazy_defaults is None or getattr(field, "encrypted", False):
+                self.update_documents(
+                    model, {}, [{"$set": {column: default}}], f"add_field:{column}"
+                )
+            elif default is not None:
+                # Rather than rewriting every document, record the default so
+                # that queries apply it to the documents missing the field.
+                lazy_defaults.update_one(
+                    {"collection": model._meta.db_table, "column": column},
+                    {"$set": {"value": default}},
+                    upsert=True,
+                )
         # Add an index or unique, if required.
-        if self._field_should_be_indexed(model, field):
-            self._add_field_index(model, field)
-        elif self._field_should_have_unique(field):
-            self._add_field_unique(model, field)
+        with self.batch_index_creation():
+            if self._field_should_be_indexed(model, field):
+                self._add_field_index(model, field)
+            elif self._field_should_have_unique(field):
+                self._add_field_unique(model, field)
 
     @ignore_embedded_models
     def _alter_field(
@@ -116,7 +270,6 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
         new_db_params,
         strict=False,
     ):
-        collection = self.get_collection(model._meta.db_table)
         # Has unique been removed?
         old_field_unique = self._field_should_have_unique(old_field)
         new_field_unique = self._field_should_have_unique(new_field)
@@ -129,7 +282,19 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
             self._remove_field_index(model, old_field)
         # Have they renamed the column?
         if old_field.column != new_field.column:
-            collection.update_many({}, {"$rename": {old_field.column: new_field.column}})
+            self.update_documents(
+                model,
+                {},
+                {"$rename": {old_field.column: new_field.column}},
+                f"rename_field:{old_field.column}:{new_field.column}",
+            )
+            if (lazy_defaults := self.get_lazy_defaults_collection()) is not None:
+                lazy_defaults.update_one(
+                    {"collection": model._meta.db_table, "column": old_field.column},
+                    {"$set": {"column": new_field.column}},
+                )
+            if (index_builds := self.get_index_builds(model._meta.db_table)) is not None:
+                index_builds.rename_column(model._meta.db_table, old_field.column, new_field.column)
             # Move index to the new field, if needed.
             if old_field_indexed and new_field_indexed:
                 self._remove_field_index(model, old_field)
@@ -143,7 +308,12 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
         if new_field.has_default() and old_field.null and not new_field.null:
             column = new_field.column
             default = self.effective_default(new_field)
-            collection.update_many({column: {"$eq": None}}, [{"$set": {column: default}}])
+            self.update_documents(
+                model,
+                {column: {"$eq": None}},
+                [{"$set": {column: default}}],
+                f"set_default:{column}",
+            )
         # Added an index?
         if not old_field_indexed and new_field_indexed:
             self._add_field_index(model, new_field)
@@ -159,7 +329,9 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
             return
         # Unset field on existing documents.
         if column := field.column:
-            self.get_collection(model._meta.db_table).update_many({}, {"$unset": {column: ""}})
+            self.update_documents(model, {}, {"$unset": {column: ""}}, f"remove_field:{column}")
+            if (lazy_defaults := self.get_lazy_defaults_collection()) is not None:
+                lazy_defaults.delete_one({"collection": model._meta.db_table, "column": column})
             if self._field_should_be_indexed(model, field):
                 self._remove_field_index(model, field)
             elif self._field_should_have_unique(field):
@@ -177,8 +349,9 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
                 {"index": True, "unique": False},
             )
         # Created indexes
-        for field_names in news.difference(olds):
-            self._add_composed_index(model, field_names)
+        with self.batch_index_creation():
+            for field_names in news.difference(olds):
+                self._add_composed_index(model, field_names)
 
     @ignore_embedded_models
     def alter_unique_together(self, model, old_unique_together, new_unique_together):
@@ -188,11 +361,12 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
         for field_names in olds.difference(news):
             self._remove_composed_index(model, field_names, {"unique": True, "primary_key": False})
         # Created uniques
-        for field_names in news.difference(olds):
-            columns = [model._meta.get_field(field).column for field in field_names]
-            name = str(self._unique_constraint_name(model._meta.db_table, columns))
-            constraint = UniqueConstraint(fields=field_names, name=name)
-            self.add_constraint(model, constraint)
+        with self.batch_index_creation():
+            for field_names in news.difference(olds):
+                columns = [model._meta.get_field(field).column for field in field_names]
+                name = str(self._unique_constraint_name(model._meta.db_table, columns))
+                constraint = UniqueConstraint(fields=field_names, name=name)
+                self.add_constraint(model, constraint)
 
     @ignore_embedded_models
     def add_index(self, model, index, field=None):
@@ -201,9 +375,14 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
             collection = self.get_collection(model._meta.db_table)
             if isinstance(idx, SearchIndexModel):
                 collection.create_search_index(idx)
-                self.wait_until_index_created(collection, index.name)
+                # Rather than wait for each index to be built, build all the
+                # indexes of this schema editor concurrently and wait for them
+                # in __exit__().
+                if not self.collect_sql:
+                    self.pending_search_indexes[model._meta.db_table].add(index.name)
+                self.connection.search_index_cache.invalidate(model._meta.db_table)
             else:
-                collection.create_indexes([idx])
+                self.create_indexes(model, [idx])
 
     def _add_composed_index(self, model, field_names):
         """Add an index on the given list of field_names."""
@@ -226,8 +405,10 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
             # Drop the index if it's supported.
             if self.connection.features.supports_search:
                 collection.drop_search_index(index.name)
+                self.pending_search_indexes[model._meta.db_table].discard(index.name)
                 self.wait_until_index_dropped(collection, index.name)
-        else:
+                self.connection.search_index_cache.invalidate(model._meta.db_table)
+        elif not self._discard_index_build(model, index.name):
             collection.drop_index(index.name)
 
     def _remove_composed_index(self, model, field_names, constraint_kwargs):
@@ -238,6 +419,15 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
         meta_constraint_names = {constraint.name for constraint in model._meta.constraints}
         meta_index_names = {constraint.name for constraint in model._meta.indexes}
         columns = [model._meta.get_field(field).column for field in field_names]
+        if constraint_kwargs.get("unique"):
+            name = str(self._unique_constraint_name(model._meta.db_table, columns))
+        else:
+            index = Index(fields=field_names)
+            index.set_name_with_model(model)
+            name = index.name
+        # A deferred index that isn't built isn't found by introspection.
+        if self._discard_index_build(model, name):
+            return
         constraint_names = self._constraint_names(
             model,
             columns,
@@ -256,6 +446,11 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
 
     def _remove_field_index(self, model, field):
         """Remove a field's db_index=True index."""
+        # A deferred index that isn't built isn't found by introspection.
+        if self._discard_index_build(
+            model, self._create_index_name(model._meta.db_table, [field.column])
+        ):
+            return
         collection = self.get_collection(model._meta.db_table)
         meta_index_names = {index.name for index in model._meta.indexes}
         index_names = self._constraint_names(
@@ -286,8 +481,7 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
         ):
             idx = constraint.get_pymongo_index_model(model, schema_editor=self, field=field)
             if idx:
-                collection = self.get_collection(model._meta.db_table)
-                collection.create_indexes([idx])
+                self.create_indexes(model, [idx])
 
     def _add_field_unique(self, model, field):
         name = str(self._unique_constraint_name(model._meta.db_table, [field.column]))
@@ -311,6 +505,9 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
             self.remove_index(model, idx)
 
     def _remove_field_unique(self, model, field):
+        name = str(self._unique_constraint_name(model._meta.db_table, [field.column]))
+        if self._discard_index_build(model, name):
+            return
         # Find the unique constraint for this field
         meta_constraint_names = {constraint.name for constraint in model._meta.constraints}
         constraint_names = self._constraint_names(
@@ -333,36 +530,106 @@ class BaseSchemaEditor(BaseDatabaseSchemaEditor):
         if old_db_table == new_db_table:
             return
         self.get_collection(old_db_table).rename(new_db_table)
+        if (lazy_defaults := self.get_lazy_defaults_collection()) is not None:
+            lazy_defaults.update_many(
+                {"collection": old_db_table}, {"$set": {"collection": new_db_table}}
+            )
+        if (index_builds := self.get_index_builds(old_db_table)) is not None:
+            index_builds.rename_collection(old_db_table, new_db_table)
+        if pending := self.pending_search_indexes.pop(old_db_table, None):
+            self.pending_search_indexes[new_db_table] |= pending
+        self.connection.search_index_cache.invalidate(old_db_table)
+        self.connection.search_index_cache.invalidate(new_db_table)
+        if (capped := self.connection.ops.capped_collections.pop(old_db_table, None)) is not None:
+            self.connection.ops.capped_collections[new_db_table] = capped
 
     def _field_should_have_unique(self, field):
         db_type = field.db_type(self.connection)
         # The _id column is automatically unique.
         return db_type and field.unique and field.column != "_id"
 
-    @staticmethod
-    def wait_until_index_created(collection, index_name, timeout=60 * 60, interval=0.5):
+    def wait_until_search_indexes_ready(self, timeout=60 * 60, max_interval=10):
         """
-        Wait up to an hour until an index is created. Index creation time
-        depends on the size of the collection being indexed.
+        Wait up to an hour until the search indexes created by add_index() are
+        ready. Index creation time depends on the size of the collection being
+        indexed.
+
+        The status of all the indexes is checked at once, with exponential
+        backoff between checks, and logged so that long builds show progress.
         """
         start = monotonic()
-        while monotonic() - start < timeout:
-            indexes = list(collection.list_search_indexes())
-            for idx in indexes:
-                if idx["name"] == index_name and idx["status"] == "READY":
-                    return True
+        interval = 0.1
+        while True:
+            for collection_name, index_names in list(self.pending_search_indexes.items()):
+                if not index_names:
+                    del self.pending_search_indexes[collection_name]
+                    continue
+                collection = self.get_collection(collection_name)
+                num_documents = None
+                for idx in collection.list_search_indexes():
+                    if idx["name"] not in index_names:
+                        continue
+                    if idx["status"] == "READY":
+                        index_names.discard(idx["name"])
+                    elif idx["status"] == "FAILED":
+                        index_names.discard(idx["name"])
+                        raise DatabaseError(f"Index {idx['name']} failed to build.")
+                    else:
+                        if num_documents is None:
+                            num_documents = collection.estimated_document_count()
+                        logger.info(
+                            "Waiting for search index %s on %s: status=%s, queryable=%s, "
+                            "documents=%s",
+                            idx["name"],
+                            collection_name,
+                            idx["status"],
+                            idx.get("queryable", False),
+                            num_documents,
+                        )
+                if not index_names:
+                    del self.pending_search_indexes[collection_name]
+                    self.connection.search_index_cache.invalidate(collection_name)
+            if not self.pending_search_indexes:
+                return
+            if monotonic() - start >= timeout:
+                names = ", ".join(
+                    sorted(name for names in self.pending_search_indexes.values() for name in names)
+                )
+                raise TimeoutError(f"Index {names} not ready after {timeout} seconds.")
             sleep(interval)
-        raise TimeoutError(f"Index {index_name} not ready after {timeout} seconds.")
+            interval = min(interval * 2, max_interval)
+
+    def wait_until_index_created(self, collection, index_name, timeout=60 * 60, interval=0.5):
+        """
+        Wait up to an hour until an index is created.
+
+        Deprecated in favor of wait_until_search_indexes_ready(), which waits
+        for all the search indexes that add_index() created.
+        """
+        warnings.warn(
+            "wait_until_index_created() is deprecated in favor of "
+            "wait_until_search_indexes_ready().",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self.pending_search_indexes[collection.name].add(index_name)
+        self.wait_until_search_indexes_ready(timeout=timeout, max_interval=interval)
+        return True
 
     @staticmethod
-    def wait_until_index_dropped(collection, index_name, timeout=60, interval=0.5):
-        """Wait up to 60 seconds until an index is dropped."""
+    def wait_until_index_dropped(collection, index_name, timeout=60, max_interval=2):
+        """
+        Wait up to 60 seconds until an index is dropped, with exponential
+        backoff between checks.
+        """
         start = monotonic()
+        interval = 0.1
         while monotonic() - start < timeout:
             indexes = list(collection.list_search_indexes())
             if all(idx["name"] != index_name for idx in indexes):
                 return True
             sleep(interval)
+            interval = min(interval * 2, max_interval)
         raise TimeoutError(f"Index {index_name} not dropped after {timeout} seconds.")
 
     def _create_collection(self, model):
@@ -1,9 +1,67 @@
-"""Not a public API."""
-
 from bson import SON, Decimal128, ObjectId
+from django.db import DatabaseError, connections
+from django.db import transaction as django_transaction
+from django.test import TestCase as DjangoTestCase
+
+from . import transaction
+
+
+class TestCase(DjangoTestCase):
+    """
+    A django.test.TestCase that isolates each test in a MongoDB transaction
+    which is aborted when the test ends, if the MongoDB databases of the test
+    support transactions (i.e. they're replica sets or sharded clusters),
+    instead of flushing the database after each test.
+
+    Since MongoDB doesn't have savepoints, setUpTestData() and fixtures are
+    loaded in each test's transaction rather than once per class.
+    """
+
+    @classmethod
+    def _databases_support_transactions(cls):
+        return all(
+            connections[alias].features._supports_transactions
+            if connections[alias].vendor == "mongodb"
+            else connections[alias].features.supports_transactions
+            for alias in cls.databases
+        )
+
+    @classmethod
+    def _databases_support_savepoints(cls):
+        if any(connections[alias].vendor == "mongodb" for alias in cls.databases):
+            return False
+        return super()._databases_support_savepoints()
+
+    @classmethod
+    def _enter_atomics(cls):
+        atomics = {}
+        for db_name in cls._databases_names():
+            if connections[db_name].vendor == "mongodb":
+                # Collections and indexes that the test creates are created
+                # outside of the transaction since the schema editor doesn't
+                # use the session.
+                atomic = transaction.atomic(using=db_name)
+            else:
+                atomic = django_transaction.atomic(using=db_name)
+                atomic._from_testcase = True
+            atomic.__enter__()
+            atomics[db_name] = atomic
+        return atomics
+
+    @classmethod
+    def _rollback_atomics(cls, atomics):
+        for db_name in reversed(cls._databases_names()):
+            if connections[db_name].vendor == "mongodb":
+                # Exiting the block with an exception aborts the transaction.
+                atomics[db_name].__exit__(DatabaseError, None, None)
+            else:
+                django_transaction.set_rollback(True, using=db_name)
+                atomics[db_name].__exit__(None, None, None)
 
 
 class MongoTestCaseMixin:
+    """Not a public API."""
+
     maxDiff = None
     query_types = {"SON": SON, "ObjectId": ObjectId, "Decimal128": Decimal128}
 
@@ -1,7 +1,12 @@
+from collections import defaultdict
 from contextlib import ContextDecorator
 
+from bson import ObjectId
 from django.db import DEFAULT_DB_ALIAS, DatabaseError
 from django.db.transaction import get_connection, on_commit
+from pymongo.operations import DeleteMany, InsertOne, UpdateMany, UpdateOne
+
+from .query import wrap_database_errors
 
 __all__ = [
     "atomic",
@@ -9,6 +14,220 @@ __all__ = [
 ]
 
 
+def get_pipeline_collections(pipeline):
+    """
+    Return the names of the collections that an aggregation pipeline reads
+    with $lookup, $graphLookup, or $unionWith.
+    """
+    names = set()
+    stack = [pipeline]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in {"$lookup", "$graphLookup"} and "from" in item:
+                    names.add(item["from"])
+                elif key == "$unionWith":
+                    if isinstance(item, str):
+                        names.add(item)
+                    elif "coll" in item:
+                        names.add(item["coll"])
+                stack.append(item)
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return names
+
+
+class WriteBuffer:
+    """
+    Hold the writes of an atomic() block until the block exits.
+
+    If the block exits successfully, the writes are merged into the enclosing
+    buffer (if any) or executed in the transaction's session using one
+    bulk_write() per collection. If the block raises an exception, the writes
+    are discarded.
+
+    If flush_on_read=True (only allowed for the outermost block), the pending
+    writes to a collection are also executed before the collection is read.
+    """
+
+    def __init__(self, connection, parent=None, flush_on_read=False):
+        self.connection = connection
+        # The buffer of the enclosing atomic() block, if any.
+        self.parent = parent
+        self.flush_on_read = flush_on_read
+        # A list of (collection name, pymongo write operation) tuples in the
+        # order that they must be executed.
+        self.operations = []
+        # The _ids of the documents inserted by self.operations, by collection
+        # name.
+        self.inserted_ids = defaultdict(set)
+        # The _ids of the documents that updates in self.operations are
+        # expected to match without having been counted, by collection name.
+        self.unverified_ids = defaultdict(list)
+        # on_commit() callbacks registered after this index are discarded
+        # along with the writes.
+        self.run_on_commit_index = len(connection.run_on_commit)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {len(self.operations)} operation(s)>"
+
+    def has_pending_insert(self, collection_name, _id):
+        """
+        Return True if a document with the given _id is inserted by this
+        buffer or an enclosing one.
+        """
+        buffer = self
+        while buffer is not None:
+            if _id in buffer.inserted_ids.get(collection_name, ()):
+                return True
+            buffer = buffer.parent
+        return False
+
+    @property
+    def root(self):
+        """The buffer of the outermost atomic() block."""
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        return root
+
+    def flush_for_read(self, collection_name, pipeline=()):
+        """
+        Execute the pending writes to the collections read by a query on
+        collection_name if the outermost buffer flushes on read.
+        """
+        root = self.root
+        if root.flush_on_read and root.operations:
+            root.flush({collection_name, *get_pipeline_collections(pipeline)})
+
+    def count_documents(self, collection_name, criteria, limit=0):
+        """Count the documents that match criteria in the transaction."""
+        self.flush_for_read(collection_name)
+        collection = self.connection.get_collection(collection_name)
+        kwargs = {"limit": limit} if limit else {}
+        return collection.count_documents(criteria, session=self.connection.session, **kwargs)
+
+    def insert_many(self, collection_name, docs):
+        """Buffer the insertion of docs and return their _ids."""
+        inserted_ids = []
+        for doc in docs:
+            # Generate _id like Collection.insert_many() does so that it can
+            # be returned before the document is inserted.
+            if "_id" not in doc:
+                doc["_id"] = ObjectId()
+            inserted_ids.append(doc["_id"])
+            self.operations.append((collection_name, InsertOne(doc)))
+        self.inserted_ids[collection_name].update(
+            _id for _id in inserted_ids if isinstance(_id, ObjectId)
+        )
+        return inserted_ids
+
+    def update(self, collection_name, criteria, update, many=False):
+        """
+        Buffer an update and return the number of documents it's expected to
+        match. Pending writes of this block aren't visible to the count unless
+        the update targets a document inserted by the buffer.
+
+        If the outermost buffer batches writes, an update of a single document
+        selected by its _id (e.g. by Model.save()) isn't counted, so that it
+        doesn't cost a round trip. It's expected to match, which flush()
+        verifies.
+        """
+        _id = criteria.get("_id")
+        if not many and isinstance(_id, ObjectId) and self.has_pending_insert(collection_name, _id):
+            matched_count = 1
+        elif (
+            not many
+            and isinstance(_id, ObjectId)
+            and criteria.keys() == {"_id"}
+            and self.root.flush_on_read
+        ):
+            matched_count = 1
+            self.unverified_ids[collection_name].append(_id)
+        else:
+            matched_count = self.count_documents(collection_name, criteria, limit=0 if many else 1)
+        operation = UpdateMany(criteria, update) if many else UpdateOne(criteria, update)
+        self.operations.append((collection_name, operation))
+        return matched_count
+
+    def delete_many(self, collection_name, criteria):
+        """
+        Buffer a deletion and return the number of documents it's expected to
+        delete (not counting documents inserted by pending writes).
+        """
+        deleted_count = self.count_documents(collection_name, criteria)
+        self.operations.append((collection_name, DeleteMany(criteria)))
+        return deleted_count
+
+    @wrap_database_errors
+    def flush(self, collection_names=None):
+        """
+        Execute the buffered writes (or only those to collection_names) in the
+        connection's session.
+
+        Raise DatabaseError if an update that wasn't counted didn't match a
+        document.
+        """
+        operations_by_collection = defaultdict(list)
+        remaining = []
+        for collection_name, operation in self.operations:
+            if collection_names is None or collection_name in collection_names:
+                operations_by_collection[collection_name].append(operation)
+            else:
+                remaining.append((collection_name, operation))
+        self.operations = remaining
+        # The writes are ordered within each collection. Writes to different
+        # collections are independent and are committed together anyway.
+        for collection_name, operations in operations_by_collection.items():
+            self.inserted_ids.pop(collection_name, None)
+            unverified_ids = self.unverified_ids.pop(collection_name, [])
+            collection = self.connection.get_collection(collection_name)
+            result = collection.bulk_write(
+                operations, ordered=True, session=self.connection.session
+            )
+            if unverified_ids:
+                self._verify_updates(collection, operations, unverified_ids, result)
+
+    def _verify_updates(self, collection, operations, unverified_ids, result):
+        updates = [op for op in operations if isinstance(op, UpdateOne | UpdateMany)]
+        if len(updates) == len(unverified_ids):
+            # The uncounted updates are the only updates, so the result counts
+            # their matches.
+            missing = len(unverified_ids) - result.matched_count
+        else:
+            unverified_ids = set(unverified_ids)
+            missing = len(unverified_ids) - collection.count_documents(
+                {"_id": {"$in": list(unverified_ids)}}, session=self.connection.session
+            )
+        if missing > 0:
+            raise DatabaseError(
+                f"{missing} update(s) of {collection.name} documents selected by _id "
+                "didn't match any document."
+            )
+
+    def commit(self):
+        """Pass the writes to the enclosing buffer or execute them."""
+        if self.parent is None:
+            self.flush()
+        else:
+            self.parent.operations.extend(self.operations)
+            for collection_name, inserted_ids in self.inserted_ids.items():
+                self.parent.inserted_ids[collection_name].update(inserted_ids)
+            for collection_name, unverified_ids in self.unverified_ids.items():
+                self.parent.unverified_ids[collection_name].extend(unverified_ids)
+            self.operations = []
+            self.inserted_ids.clear()
+            self.unverified_ids.clear()
+
+    def discard(self):
+        """Forget the writes and the on_commit() callbacks of the block."""
+        self.operations = []
+        self.inserted_ids.clear()
+        self.unverified_ids.clear()
+        del self.connection.run_on_commit[self.run_on_commit_index :]
+
+
 class Atomic(ContextDecorator):
     """
     Guarantee the atomic execution of a given block.
@@ -16,47 +235,82 @@ class Atomic(ContextDecorator):
     Simplified from django.db.transaction.
     """
 
-    def __init__(self, using):
+    def __init__(self, using, savepoint=False, batch_writes=False):
         self.using = using
+        self.savepoint = savepoint
+        self.batch_writes = batch_writes
 
     def __enter__(self):
         connection = get_connection(self.using)
         if connection.in_atomic_block_mongo:
             # Track the number of nested atomic() calls.
             connection.nested_atomics += 1
+            # MongoDB doesn't have savepoints. Emulate them by buffering the
+            # block's writes until it exits.
+            buffer = (
+                WriteBuffer(connection, parent=connection.write_buffer) if self.savepoint else None
+            )
         else:
             # Start a transaction for the outermost atomic().
             connection.start_transaction_mongo()
             connection.in_atomic_block_mongo = True
+            # Unit of work: buffer the transaction's writes until commit or
+            # until the collection they write to is read.
+            buffer = WriteBuffer(connection, flush_on_read=True) if self.batch_writes else None
+        connection.atomic_write_buffers.append(buffer)
 
     def __exit__(self, exc_type, exc_value, traceback):
         connection = get_connection(self.using)
+        buffer = connection.atomic_write_buffers.pop()
         if connection.nested_atomics:
             # Exiting inner atomic.
             connection.nested_atomics -= 1
         else:
             # Reset flag when exiting outer atomic.
             connection.in_atomic_block_mongo = False
-        if exc_type is None:
-            # atomic() exited without an error.
-            if not connection.in_atomic_block_mongo:
-                # Commit transaction if outer atomic().
+        try:
+            if exc_type is None:
+                # atomic() exited without an error.
                 try:
-                    connection.commit_mongo()
-                except DatabaseError:
-                    connection.rollback_mongo()
+                    if buffer is not None:
+                        # Execute the block's pending writes or pass them to
+                        # the enclosing block.
+                        buffer.commit()
+                    if not connection.in_atomic_block_mongo:
+                        if connection.needs_rollback_mongo:
+                            # Rollback transaction if outer atomic() and the
+                            # server aborted it.
+                            connection.rollback_mongo()
+                        else:
+                            # Commit transaction if outer atomic().
+                            connection.commit_mongo()
+                except Exception:
+                    if connection.in_atomic_block_mongo:
+                        # A failed write aborts the transaction on the server,
+                        # even if the error is caught outside of the block.
+                        connection.needs_rollback_mongo = True
+                    else:
+                        connection.rollback_mongo()
                     raise
-        else:
-            # atomic() exited with an error.
+            else:
+                # atomic() exited with an error.
+                if buffer is not None:
+                    buffer.discard()
+                if not connection.in_atomic_block_mongo:
+                    # Rollback transaction if outer atomic().
+                    connection.rollback_mongo()
+                elif issubclass(exc_type, DatabaseError):
+                    # Same as above.
+                    connection.needs_rollback_mongo = True
+        finally:
             if not connection.in_atomic_block_mongo:
-                # Rollback transaction if outer atomic().
-                connection.rollback_mongo()
+                connection.needs_rollback_mongo = False
 
 
-def atomic(using=None):
+def atomic(using=None, savepoint=False, batch_writes=False):
     # Bare decorator: @atomic -- although the first argument is called `using`,
     # it's actually the function being decorated.
     if callable(using):
-        return Atomic(DEFAULT_DB_ALIAS)(using)
+        return Atomic(DEFAULT_DB_ALIAS, savepoint, batch_writes)(using)
     # Decorator: @atomic(...) or context manager: with atomic(...): ...
-    return Atomic(using)
+    return Atomic(using, savepoint, batch_writes)
@@ -0,0 +1,94 @@
+import statistics
+import time
+from collections import namedtuple
+
+from django.db import connections
+
+from .expressions import SearchVector
+from .indexes import get_field
+
+NumCandidatesResult = namedtuple(
+    "NumCandidatesResult", ["num_candidates", "recall", "median_latency"]
+)
+# The primary key of the document that a query vector is taken from (None if
+# it isn't taken from a document), and the vector.
+QueryVector = namedtuple("QueryVector", ["pk", "vector"])
+
+
+def recall(expected, actual):
+    """
+    Return the fraction of the expected results (e.g. the primary keys found
+    by an exact search) that are in actual.
+    """
+    if not expected:
+        return 1.0
+    return len(set(expected) & set(actual)) / len(expected)
+
+
+def sample_query_vectors(model, field_name, size, using):
+    """
+    Return a QueryVector for each document of a random sample of size
+    documents of the model.
+    """
+    column = get_field(model, field_name).column
+    collection = connections[using].get_collection(model._meta.db_table)
+    documents = collection.aggregate(
+        [
+            {"$match": {column: {"$ne": None}}},
+            {"$sample": {"size": size}},
+            {"$project": {"vector": f"${column}"}},
+        ]
+    )
+    return [QueryVector(document["_id"], document["vector"]) for document in documents]
+
+
+def benchmark_num_candidates(queryset, path, query_vectors, limit, num_candidates_values):
+    """
+    Measure the recall@limit of an approximate SearchVector search of the
+    queryset for each of num_candidates_values, compared to an exact search,
+    across query_vectors (a list of QueryVector). Return a list of
+    NumCandidatesResult in the order of num_candidates_values, with the mean
+    recall and the median latency (in seconds) of the approximate searches.
+
+    The document that a query vector is taken from is excluded from the
+    results of its searches since, being its own nearest neighbor, it would
+    inflate the recall. The searches fetch one more result and consider one
+    more candidate to make up for it.
+    """
+
+    def search(query_vector, **kwargs):
+        extra = int(query_vector.pk is not None)
+        if "num_candidates" in kwargs:
+            kwargs["num_candidates"] += extra
+        expression = SearchVector(path, query_vector.vector, limit + extra, **kwargs)
+        start = time.perf_counter()
+        pks = list(queryset.annotate(score=expression).values_list("pk", flat=True))
+        latency = time.perf_counter() - start
+        return [pk for pk in pks if pk != query_vector.pk][:limit], latency
+
+    expected = [search(query_vector, exact=True)[0] for query_vector in query_vectors]
+    results = []
+    for num_candidates in num_candidates_values:
+        recalls = []
+        latencies = []
+        for query_vector, expected_pks in zip(query_vectors, expected, strict=True):
+            pks, latency = search(query_vector, num_candidates=num_candidates)
+            recalls.append(recall(expected_pks, pks))
+            latencies.append(latency)
+        results.append(
+            NumCandidatesResult(
+                num_candidates, statistics.mean(recalls), statistics.median(latencies)
+            )
+        )
+    return results
+
+
+def recommend_num_candidates(results, target_recall):
+    """
+    Return the smallest num_candidates of the results that reaches
+    target_recall, or the one with the highest recall if none does.
+    """
+    for result in sorted(results):
+        if result.recall >= target_recall:
+            return result.num_candidates
+    return max(results, key=lambda result: (result.recall, -result.num_candidates)).num_candidates
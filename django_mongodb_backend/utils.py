@@ -1,5 +1,11 @@
+import contextlib
 import copy
+import hashlib
+import json
+import os
+import tempfile
 import time
+from pathlib import Path
 
 import django
 from django.conf import settings
@@ -67,7 +73,9 @@ class OperationDebugWrapper:
     # The PyMongo database and collection methods that this backend uses.
     wrapped_methods = {
         "aggregate",
+        "bulk_write",
         "command",
+        "count_documents",
         "create_collection",
         "create_indexes",
         "create_search_index",
@@ -166,3 +174,197 @@ def model_has_encrypted_fields(model):
         )
         for field in model._meta.fields
     )
+
+
+class ServerInfoCache:
+    """
+    Cache the server version and feature probes of a deployment in a JSON
+    file so that new processes can skip the round trips to the server.
+
+    Entries are keyed by a hash of the deployment's address (HOST, PORT, and
+    replicaSet) and expire after `timeout` seconds.
+    """
+
+    def __init__(self, settings_dict, path, timeout=3600):
+        self.path = Path(path)
+        self.timeout = timeout
+        address = [
+            settings_dict["HOST"],
+            settings_dict.get("PORT"),
+            settings_dict["OPTIONS"].get("replicaSet"),
+        ]
+        # A hash avoids writing any credentials in HOST to the file.
+        self.key = hashlib.sha256(json.dumps(address, default=str).encode()).hexdigest()
+
+    def _read(self):
+        try:
+            with self.path.open() as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data):
+        # Write to a temporary file and then rename it so that concurrent
+        # processes never read a partially written file.
+        with contextlib.suppress(OSError):
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.resolve().parent, suffix=".tmp")
+            tmp_path = Path(tmp_path)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                tmp_path.replace(self.path)
+            except OSError:
+                tmp_path.unlink()
+
+    def get_or_set(self, name, probe):
+        """
+        Return the cached value of the probe called name or, if it's missing
+        or expired, call probe() and cache its (JSON serializable) result.
+        """
+        entry = self._read().get(self.key, {}).get(name)
+        if entry is not None and entry[1] > time.time():
+            return entry[0]
+        value = probe()
+        data = self._read()
+        data.setdefault(self.key, {})[name] = [value, time.time() + self.timeout]
+        self._write(data)
+        return value
+
+
+def get_search_indexed_fields(mappings):
+    """Yield the paths of the fields in a search index's mappings."""
+    if isinstance(mappings, list):
+        for definition in mappings:
+            yield from get_search_indexed_fields(definition)
+    else:
+        for field, definition in mappings.get("fields", {}).items():
+            yield field
+            for path in get_search_indexed_fields(definition):
+                yield f"{field}.{path}"
+
+
+class SearchIndexCache:
+    """
+    Cache the search indexes of each collection for `timeout` seconds so that
+    choosing the index for a $search or $vectorSearch query doesn't require
+    calling list_search_indexes() each time.
+    """
+
+    def __init__(self, timeout=60):
+        self.timeout = timeout
+        # {collection name: (expiration time, indexes, stored sources)}
+        self.indexes = {}
+
+    def _get_collection_indexes(self, collection):
+        cached = self.indexes.get(collection.name)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1:]
+        indexes = []
+        # {index name: the index's storedSource option}
+        stored_sources = {}
+        for index in collection.list_search_indexes():
+            definition = index["latestDefinition"]
+            index_type = index.get("type", "search")
+            if index_type == "vectorSearch":
+                fields = frozenset(field["path"] for field in definition["fields"])
+            elif definition["mappings"].get("dynamic"):
+                fields = None
+            else:
+                fields = frozenset(get_search_indexed_fields(definition["mappings"]))
+            indexes.append((index["name"], index_type, fields))
+            stored_sources[index["name"]] = definition.get("storedSource", False)
+        if self.timeout:
+            self.indexes[collection.name] = (
+                time.monotonic() + self.timeout,
+                indexes,
+                stored_sources,
+            )
+        return indexes, stored_sources
+
+    def get_indexes(self, collection):
+        """
+        Return a list of (name, type, fields) tuples for the search indexes
+        of the collection, where type is "search" or "vectorSearch" and
+        fields is the frozenset of indexed paths (or None if the index uses
+        dynamic mappings).
+        """
+        return self._get_collection_indexes(collection)[0]
+
+    def stores_fields(self, collection, index_name, fields):
+        """
+        Return whether the collection's search index named index_name stores
+        all the fields (paths) in its storedSource, so that $search can
+        return them with returnStoredSource instead of fetching the documents.
+        """
+        stored_source = self._get_collection_indexes(collection)[1].get(index_name, False)
+        if stored_source is True:
+            return True
+        if not stored_source:
+            return False
+
+        def is_in(path, paths):
+            # A path is stored with its parent document.
+            return any(path == other or path.startswith(f"{other}.") for other in paths)
+
+        if "include" in stored_source:
+            include = {"_id", *stored_source["include"]}
+            return all(is_in(path, include) for path in fields)
+        # A path isn't (entirely) stored if it, its parent document, or one
+        # of its subfields is excluded.
+        return not any(
+            is_in(path, [other]) or is_in(other, [path])
+            for path in fields
+            for other in stored_source.get("exclude", ())
+        )
+
+    def get_index_name(self, collection, fields, index_type):
+        """
+        Return the name of the first index of the given type that indexes all
+        the fields, or "default" if there isn't one.
+        """
+        for name, type_, indexed_fields in self.get_indexes(collection):
+            if type_ == index_type and (indexed_fields is None or fields <= indexed_fields):
+                return name
+        return "default"
+
+    def invalidate(self, collection_name):
+        self.indexes.pop(collection_name, None)
+
+
+class LazyFieldDefaults:
+    """
+    The defaults of the fields added while LAZY_FIELD_DEFAULTS is enabled,
+    which queries apply to the documents that don't have the field yet.
+    They're recorded in the `collection_name` collection by the schema editor
+    and cached by each connection for `timeout` seconds, so that a process
+    sees the changes made by migrations and backfilldefaults in other
+    processes after at most that long.
+    """
+
+    collection_name = "django_lazy_field_defaults"
+
+    def __init__(self, connection, timeout=60):
+        self.connection = connection
+        self.timeout = timeout
+        # {(collection name, column): default}
+        self.defaults = None
+        self.expiration = None
+
+    def get(self, collection_name, column):
+        """
+        Return the default that queries must use if the column is missing
+        from a document of the collection, or None if they don't need one.
+        """
+        if not self.connection.settings_dict.get("LAZY_FIELD_DEFAULTS"):
+            return None
+        if self.defaults is None or self.expiration <= time.monotonic():
+            self.defaults = {
+                (default["collection"], default["column"]): default["value"]
+                for default in self.connection.get_collection(self.collection_name).find()
+            }
+            self.expiration = time.monotonic() + self.timeout
+        return self.defaults.get((collection_name, column))
+
+    def invalidate(self):
+        self.defaults = None
@@ -0,0 +1,86 @@
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+
+from django_mongodb_backend.creation import DatabaseCreation
+
+
+class CloneTestDatabaseTests(TransactionTestCase):
+    available_apps = []
+    suffix = "clone_tests"
+
+    def setUp(self):
+        database = connection.database
+        database.create_collection("clone_data", validator={"name": {"$type": "string"}})
+        self.addCleanup(database.drop_collection, "clone_data")
+        collection = database["clone_data"]
+        collection.insert_many([{"name": "a", "n": 1}, {"name": "b", "n": 2}])
+        collection.create_index("name", unique=True, name="clone_name_uniq")
+        database.create_collection("clone_capped", capped=True, size=4096)
+        self.addCleanup(database.drop_collection, "clone_capped")
+        database["clone_capped"].insert_one({"name": "c"})
+        database.create_collection(
+            "clone_view", viewOn="clone_data", pipeline=[{"$match": {"n": 1}}]
+        )
+        self.addCleanup(database.drop_collection, "clone_view")
+        # A view on a view, listed before it.
+        database.create_collection(
+            "clone_a_view", viewOn="clone_view", pipeline=[{"$project": {"name": 1}}]
+        )
+        self.addCleanup(database.drop_collection, "clone_a_view")
+        connection.creation._clone_test_db(self.suffix, verbosity=0)
+        self.addCleanup(connection.creation.destroy_test_db, verbosity=0, suffix=self.suffix)
+        self.clone = connection.creation._get_clone_connection(self.suffix).database
+
+    def test_clone(self):
+        self.assertEqual(
+            self.clone.name, connection.creation.get_test_db_clone_settings(self.suffix)["NAME"]
+        )
+        self.assertEqual(
+            list(self.clone["clone_data"].find({}, {"_id": 0}).sort("n")),
+            [{"name": "a", "n": 1}, {"name": "b", "n": 2}],
+        )
+        options = self.clone["clone_data"].options()
+        self.assertEqual(options["validator"], {"name": {"$type": "string"}})
+        index = self.clone["clone_data"].index_information()["clone_name_uniq"]
+        self.assertEqual(index["key"], [("name", 1)])
+        self.assertIs(index["unique"], True)
+        self.assertIs(self.clone["clone_capped"].options()["capped"], True)
+        self.assertEqual(list(self.clone["clone_capped"].find({}, {"_id": 0})), [{"name": "c"}])
+        self.assertEqual(
+            list(self.clone["clone_view"].find({}, {"_id": 0, "name": 1})), [{"name": "a"}]
+        )
+        self.assertEqual(self.clone["clone_a_view"].options()["viewOn"], "clone_view")
+        self.assertEqual(list(self.clone["clone_a_view"].find({}, {"_id": 0})), [{"name": "a"}])
+        # The source database is unchanged.
+        self.assertEqual(connection.settings_dict["NAME"], connection.database.name)
+        self.assertEqual(connection.database["clone_data"].count_documents({}), 2)
+
+    def test_keepdb(self):
+        self.clone["clone_data"].insert_one({"name": "d", "n": 3})
+        connection.creation._clone_test_db(self.suffix, verbosity=0, keepdb=True)
+        self.assertEqual(self.clone["clone_data"].count_documents({}), 3)
+        connection.creation._clone_test_db(self.suffix, verbosity=0)
+        self.assertEqual(self.clone["clone_data"].count_documents({}), 2)
+
+    def test_destroy(self):
+        connection.creation.destroy_test_db(verbosity=0, suffix=self.suffix)
+        self.assertEqual(
+            [name for name in self.clone.list_collection_names() if not name.startswith("system.")],
+            [],
+        )
+        # The connection still uses the test database.
+        self.assertNotEqual(connection.database.name, self.clone.name)
+
+
+class SortViewsTests(SimpleTestCase):
+    def test_sort_views(self):
+        views = [
+            {"name": "c", "options": {"viewOn": "b"}},
+            {"name": "b", "options": {"viewOn": "a"}},
+            {"name": "d", "options": {"viewOn": "collection"}},
+            {"name": "a", "options": {"viewOn": "collection"}},
+        ]
+        names = [info["name"] for info in DatabaseCreation._sort_views(views)]
+        self.assertCountEqual(names, ["a", "b", "c", "d"])
+        self.assertLess(names.index("a"), names.index("b"))
+        self.assertLess(names.index("b"), names.index("c"))
@@ -0,0 +1,313 @@
+import json
+from io import StringIO
+from types import SimpleNamespace
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, modify_settings
+from pymongo.monitoring import ConnectionPoolListener
+
+from django_mongodb_backend.base import DatabaseWrapper
+from django_mongodb_backend.monitoring import (
+    WrittenCollectionsListener,
+    format_prometheus,
+    format_server_connections_prometheus,
+)
+
+
+def get_pool_stats_connection(**options):
+    """Return a new DatabaseWrapper that collects pool statistics."""
+    settings = connection.settings_dict.copy()
+    settings["OPTIONS"] = {**settings["OPTIONS"], "pool_stats": True, **options}
+    return DatabaseWrapper(settings, alias="pool_stats")
+
+
+class PoolStatsTests(TestCase):
+    def setUp(self):
+        self.connection = get_pool_stats_connection()
+        self.addCleanup(self.connection.close_pool)
+
+    def test_pool_stats(self):
+        stats = self.connection.pool_stats()
+        pool_options = self.connection.connection.options.pool_options
+        self.assertEqual(stats["max_pool_size"], pool_options.max_pool_size)
+        self.assertEqual(stats["min_pool_size"], pool_options.min_pool_size)
+        self.assertGreaterEqual(len(stats["servers"]), 1)
+
+    def test_checkouts_counted(self):
+        self.connection.get_database().command("ping")
+        before = sum(s["checkouts"] for s in self.connection.pool_stats()["servers"].values())
+        self.connection.get_database().command("ping")
+        servers = self.connection.pool_stats()["servers"].values()
+        self.assertEqual(sum(s["checkouts"] for s in servers), before + 1)
+        self.assertEqual(sum(s["checked_out"] for s in servers), 0)
+        self.assertGreaterEqual(sum(s["connections"] for s in servers), 1)
+
+    def test_heartbeat_rtt(self):
+        """
+        The round trip time is known even though, under the streaming
+        protocol, the client awaits most heartbeats.
+        """
+        self.connection.get_database().command("ping")
+        servers = self.connection.pool_stats()["servers"].values()
+        self.assertTrue(
+            any(isinstance(stats["heartbeat_rtt"], float) for stats in servers), list(servers)
+        )
+
+    def test_disabled(self):
+        settings = connection.settings_dict.copy()
+        settings["OPTIONS"] = {
+            key: value for key, value in settings["OPTIONS"].items() if key != "pool_stats"
+        }
+        new_connection = DatabaseWrapper(settings, alias="no_pool_stats")
+        msg = (
+            "DATABASES['no_pool_stats']['OPTIONS']['pool_stats'] must be True to collect "
+            "connection pool statistics."
+        )
+        try:
+            new_connection.get_database().command("ping")
+            self.assertNotIn("no_pool_stats", DatabaseWrapper._pool_metrics)
+            with self.assertRaisesMessage(ImproperlyConfigured, msg):
+                new_connection.pool_stats()
+        finally:
+            new_connection.close_pool()
+
+    def test_event_listeners_option_preserved(self):
+        class Listener(ConnectionPoolListener):
+            created = False
+
+            def pool_created(self, event):
+                self.created = True
+
+            def pool_ready(self, event):
+                pass
+
+            def pool_cleared(self, event):
+                pass
+
+            def pool_closed(self, event):
+                pass
+
+            def connection_created(self, event):
+                pass
+
+            def connection_ready(self, event):
+                pass
+
+            def connection_closed(self, event):
+                pass
+
+            def connection_check_out_started(self, event):
+                pass
+
+            def connection_check_out_failed(self, event):
+                pass
+
+            def connection_checked_out(self, event):
+                pass
+
+            def connection_checked_in(self, event):
+                pass
+
+        listener = Listener()
+        new_connection = get_pool_stats_connection(event_listeners=[listener])
+        try:
+            new_connection.get_database().command("ping")
+            self.assertIs(listener.created, True)
+            self.assertGreaterEqual(len(new_connection.pool_stats()["servers"]), 1)
+        finally:
+            new_connection.close_pool()
+        self.assertNotIn("pool_stats", DatabaseWrapper._pool_metrics)
+
+
+def command_started(command, database_name="db"):
+    return SimpleNamespace(
+        command_name=next(iter(command)), command=command, database_name=database_name
+    )
+
+
+class WrittenCollectionsListenerTests(SimpleTestCase):
+    def setUp(self):
+        self.listener = WrittenCollectionsListener()
+
+    def test_unknown_before_pop(self):
+        """The writes before collections are first popped aren't known."""
+        self.assertEqual(self.listener.pop("db", ["a", "b"]), {"a", "b"})
+        self.assertEqual(self.listener.pop("db", ["a", "b", "c"]), {"c"})
+        self.assertEqual(self.listener.pop("db", ["a", "b", "c"]), set())
+
+    def test_writes(self):
+        self.listener.pop("db", ["a", "b", "c", "d", "e"])
+        self.listener.started(command_started({"insert": "a"}))
+        self.listener.started(command_started({"update": "b"}))
+        self.listener.started(command_started({"findAndModify": "c"}))
+        self.listener.started(command_started({"insert": "d"}, database_name="other"))
+        self.assertEqual(self.listener.pop("db", ["a", "b", "c", "d", "e"]), {"a", "b", "c"})
+        self.assertEqual(self.listener.pop("db", ["a", "b", "c", "d", "e"]), set())
+
+    def test_writes_to_other_collections_kept(self):
+        self.listener.pop("db", ["a", "b"])
+        self.listener.started(command_started({"insert": "a"}))
+        self.listener.started(command_started({"insert": "b"}))
+        self.assertEqual(self.listener.pop("db", ["a"]), {"a"})
+        self.assertEqual(self.listener.pop("db", ["a", "b"]), {"b"})
+
+    def test_reads_and_deletes_ignored(self):
+        self.listener.pop("db", ["a", "b", "c"])
+        self.listener.started(command_started({"find": "a"}))
+        self.listener.started(command_started({"delete": "b"}))
+        self.listener.started(command_started({"aggregate": "c", "pipeline": [{"$match": {}}]}))
+        self.assertEqual(self.listener.pop("db", ["a", "b", "c"]), set())
+
+    def test_rename_collection(self):
+        self.listener.pop("db", ["a", "b"])
+        self.listener.started(
+            command_started({"renameCollection": "db.a", "to": "db.b"}, database_name="admin")
+        )
+        self.assertEqual(self.listener.pop("db", ["a", "b"]), {"b"})
+
+    def test_unknown_writes(self):
+        for command in [
+            {"aggregate": "a", "pipeline": [{"$out": "b"}]},
+            {"aggregate": "a", "pipeline": [{"$merge": {"into": "b"}}]},
+            {"bulkWrite": 1},
+        ]:
+            with self.subTest(command=command):
+                self.listener.pop("db", ["a", "b"])
+                self.listener.started(command_started(command))
+                self.assertEqual(self.listener.pop("db", ["a", "b"]), {"a", "b"})
+
+
+class FlushWrittenCollectionsTests(TransactionTestCase):
+    available_apps = []
+
+    def setUp(self):
+        connection.get_collection("flush_unwritten").insert_one({})
+        self.addCleanup(connection.database.drop_collection, "flush_unwritten")
+        if connection.pop_written_collections(["flush_unwritten"]) is None:
+            self.skipTest("The writes of this connection aren't tracked.")
+
+    def test_flush_written_collections(self):
+        connection.get_collection("flush_written").insert_one({})
+        self.addCleanup(connection.database.drop_collection, "flush_written")
+        connection.ops.execute_sql_flush(["flush_written", "flush_unwritten"])
+        self.assertEqual(connection.get_collection("flush_written").count_documents({}), 0)
+        # The collection wasn't written to since it was previously popped.
+        self.assertEqual(connection.get_collection("flush_unwritten").count_documents({}), 1)
+
+    def test_test_mirror(self):
+        """
+        Flushing the primary empties the collections that a test mirror wrote
+        to.
+        """
+        mirror = DatabaseWrapper(connection.settings_dict.copy(), alias="flush_mirror")
+        self.addCleanup(DatabaseWrapper._written_collections.pop, "flush_mirror", None)
+        mirror.creation.set_as_test_mirror(connection.settings_dict)
+        self.addCleanup(mirror.close_pool)
+        mirror.get_collection("flush_written").insert_one({})
+        self.addCleanup(connection.database.drop_collection, "flush_written")
+        connection.ops.execute_sql_flush(["flush_written", "flush_unwritten"])
+        self.assertEqual(connection.get_collection("flush_written").count_documents({}), 0)
+        self.assertEqual(connection.get_collection("flush_unwritten").count_documents({}), 1)
+
+    def test_capped_collection_not_flushed(self):
+        connection.database.create_collection("flush_capped", capped=True, size=4096)
+        self.addCleanup(connection.database.drop_collection, "flush_capped")
+        self.addCleanup(connection.ops.capped_collections.pop, "flush_capped", None)
+        connection.get_collection("flush_capped").insert_one({})
+        connection.ops.execute_sql_flush(["flush_capped"])
+        self.assertEqual(connection.get_collection("flush_capped").count_documents({}), 1)
+        self.assertIs(connection.ops.capped_collections["flush_capped"], True)
+
+
+class FormatPrometheusTests(SimpleTestCase):
+    def test_format(self):
+        stats = {
+            "default": {
+                "max_pool_size": 100,
+                "min_pool_size": 0,
+                "servers": {
+                    "localhost:27017": {
+                        "connections": 2,
+                        "checked_out": 1,
+                        "checkouts": 10,
+                        "wait_time_total": 0.5,
+                        "heartbeat_rtt": None,
+                    }
+                },
+            }
+        }
+        output = format_prometheus(stats)
+        self.assertIn(
+            "# TYPE django_mongodb_pool_max_pool_size gauge\n"
+            'django_mongodb_pool_max_pool_size{alias="default"} 100\n',
+            output,
+        )
+        self.assertIn(
+            'django_mongodb_pool_connections{alias="default",server="localhost:27017"} 2\n',
+            output,
+        )
+        self.assertIn(
+            "# TYPE django_mongodb_pool_checkouts_total counter\n"
+            'django_mongodb_pool_checkouts_total{alias="default",server="localhost:27017"} 10\n',
+            output,
+        )
+        self.assertIn(
+            "# TYPE django_mongodb_pool_wait_time_seconds_total counter\n"
+            "django_mongodb_pool_wait_time_seconds_total"
+            '{alias="default",server="localhost:27017"} 0.5\n',
+            output,
+        )
+        self.assertNotIn("heartbeat_rtt", output)
+
+    def test_empty(self):
+        self.assertEqual(format_prometheus({}), "")
+
+
+class FormatServerConnectionsPrometheusTests(SimpleTestCase):
+    def test_format(self):
+        stats = {
+            "default": {
+                "max_pool_size": 100,
+                "server": "db1:27017",
+                "connections": {"current": 12, "available": 88, "totalCreated": 40},
+            }
+        }
+        output = format_server_connections_prometheus(stats)
+        self.assertIn('django_mongodb_pool_max_pool_size{alias="default"} 100\n', output)
+        self.assertIn(
+            "# TYPE django_mongodb_server_connections gauge\n"
+            'django_mongodb_server_connections{alias="default",server="db1:27017"} 12\n',
+            output,
+        )
+        self.assertIn(
+            "# TYPE django_mongodb_server_connections_created_total counter\n"
+            "django_mongodb_server_connections_created_total"
+            '{alias="default",server="db1:27017"} 40\n',
+            output,
+        )
+        self.assertNotIn("connections_active", output)
+
+    def test_empty(self):
+        self.assertEqual(format_server_connections_prometheus({}), "")
+
+
+@modify_settings(INSTALLED_APPS={"prepend": "django_mongodb_backend"})
+class ShowPoolStatsTests(TestCase):
+    def test_json(self):
+        out = StringIO()
+        call_command("showpoolstats", stdout=out)
+        stats = json.loads(out.getvalue())
+        self.assertEqual(set(stats), {"default"})
+        self.assertEqual(
+            stats["default"]["max_pool_size"],
+            connection.connection.options.pool_options.max_pool_size,
+        )
+        self.assertGreaterEqual(stats["default"]["connections"]["current"], 1)
+
+    def test_prometheus(self):
+        out = StringIO()
+        call_command("showpoolstats", "--format", "prometheus", stdout=out)
+        self.assertIn('django_mongodb_pool_max_pool_size{alias="default"}', out.getvalue())
+        self.assertIn('django_mongodb_server_connections{alias="default",', out.getvalue())
@@ -2,6 +2,7 @@ from django.db import models
 
 from django_mongodb_backend.fields import (
     ArrayField,
+    BinaryVectorField,
     EmbeddedModelArrayField,
     EmbeddedModelField,
     ObjectIdField,
@@ -35,6 +36,7 @@ class SearchIndexTestModel(models.Model):
     object_id = ObjectIdField()
     vector_float = ArrayField(models.FloatField(), size=10)
     vector_integer = ArrayField(models.IntegerField(), size=10)
+    vector_binary = BinaryVectorField(size=16, null=True)
 
 
 class DataHolder(models.Model):
@@ -108,3 +110,11 @@ class Tag(EmbeddedModel):
 class Store(models.Model):
     name = models.CharField(max_length=50)
     thing = PolymorphicEmbeddedModelField((Address, Tag))
+
+
+class Reader(models.Model):
+    name = models.CharField(max_length=100, db_index=True)
+    email = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["name", "email"], name="reader_name_email_idx")]
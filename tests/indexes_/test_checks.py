@@ -5,7 +5,7 @@ from django.db import connection, models
 from django.test import TestCase
 from django.test.utils import isolate_apps
 
-from django_mongodb_backend.fields import ArrayField, ObjectIdField
+from django_mongodb_backend.fields import ArrayField, BinaryVectorField, ObjectIdField
 from django_mongodb_backend.indexes import (
     EmbeddedFieldIndex,
     SearchIndex,
@@ -65,6 +65,28 @@ class UnsupportedSearchIndexesTests(TestCase):
         )
 
 
+@isolate_apps("indexes_")
+@mock.patch.object(connection.features, "supports_search", True)
+class InvalidSearchIndexesTests(TestCase):
+    def test_stored_source_nonexistent_field(self):
+        class Article(models.Model):
+            title = models.CharField(max_length=10)
+
+            class Meta:
+                indexes = [SearchIndex(fields=["title"], stored_source=["title", "body"])]
+
+        self.assertEqual(
+            Article.check(databases={"default"}),
+            [
+                checks.Error(
+                    "SearchIndex stored_source refers to the nonexistent field 'body'.",
+                    id="mongodb.indexes.search.E009",
+                    obj=Article,
+                )
+            ],
+        )
+
+
 @isolate_apps("indexes_")
 @mock.patch.object(connection.features, "supports_search", True)
 class InvalidVectorSearchIndexesTests(TestCase):
@@ -218,6 +240,40 @@ class InvalidVectorSearchIndexesTests(TestCase):
 
         self.assertEqual(SearchIndexTestModel.check(databases={"default"}), [])
 
+    def test_binary_vector_field(self):
+        class Article(models.Model):
+            title_embedded = BinaryVectorField(size=16)
+            title_bits = BinaryVectorField(size=16, dtype="packed_bit")
+
+            class Meta:
+                indexes = [
+                    VectorSearchIndex(
+                        fields=["title_embedded", "title_bits"],
+                        similarities=["cosine", "euclidean"],
+                    )
+                ]
+
+        self.assertEqual(Article.check(databases={"default"}), [])
+
+    def test_packed_bit_requires_euclidean(self):
+        class Article(models.Model):
+            title_bits = BinaryVectorField(size=16, dtype="packed_bit")
+
+            class Meta:
+                indexes = [VectorSearchIndex(fields=["title_bits"], similarities="cosine")]
+
+        self.assertEqual(
+            Article.check(databases={"default"}),
+            [
+                checks.Error(
+                    "VectorSearchIndex requires the 'euclidean' similarity for "
+                    "BinaryVectorField 'title_bits' with dtype='packed_bit'.",
+                    id="mongodb.indexes.search.E008",
+                    obj=Article,
+                )
+            ],
+        )
+
     def test_requires_vector_field(self):
         class NoSearchVectorModel(models.Model):
             text = models.CharField(max_length=100)
@@ -0,0 +1,68 @@
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from .models import Reader
+
+
+class ShowIndexStatsTests(TestCase):
+    collection_name = Reader._meta.db_table
+
+    def setUp(self):
+        collection = connection.get_collection(self.collection_name)
+        collection.drop_index("reader_name_email_idx")
+        self.addCleanup(
+            collection.create_index([("name", 1), ("email", 1)], name="reader_name_email_idx")
+        )
+        collection.create_index("email", name="reader_extra_idx")
+        self.addCleanup(collection.drop_index, "reader_extra_idx")
+
+    def get_report(self):
+        out = StringIO()
+        call_command("showindexstats", "indexes_", "--format=json", stdout=out)
+        return json.loads(out.getvalue())[self.collection_name]
+
+    def test_json(self):
+        Reader.objects.create(name="Bilbo", email="bilbo@example.com")
+        collection = connection.get_collection(self.collection_name)
+        list(collection.find({"email": "bilbo@example.com"}).hint("reader_extra_idx"))
+        report = self.get_report()
+        self.assertEqual(report["documents"], 1)
+        indexes = report["indexes"]
+        # An index that isn't declared by the model.
+        self.assertEqual(indexes["reader_extra_idx"]["status"], "undeclared")
+        self.assertGreaterEqual(indexes["reader_extra_idx"]["accesses"], 1)
+        self.assertGreater(indexes["reader_extra_idx"]["size"], 0)
+        self.assertIsNotNone(indexes["reader_extra_idx"]["since"])
+        # An index declared in Meta.indexes that doesn't exist.
+        self.assertEqual(
+            indexes["reader_name_email_idx"],
+            {"type": "index", "accesses": None, "since": None, "size": None, "status": "missing"},
+        )
+        # The index of a db_index=True field isn't used.
+        name_index = connection.schema_editor()._create_index_name(self.collection_name, ["name"])
+        self.assertEqual(indexes[name_index]["status"], "unused")
+        self.assertEqual(indexes[name_index]["accesses"], 0)
+        # Unique indexes enforce a constraint even if queries don't use them.
+        email_index = str(
+            connection.schema_editor()._unique_constraint_name(self.collection_name, ["email"])
+        )
+        self.assertEqual(indexes[email_index]["status"], "constraint")
+        self.assertIn(indexes["_id_"]["status"], {"ok", "constraint"})
+
+    def test_text(self):
+        out = StringIO()
+        call_command("showindexstats", "indexes_", stdout=out)
+        output = out.getvalue()
+        self.assertIn(f"{self.collection_name} (0 documents)\n", output)
+        self.assertIn("  reader_name_email_idx: MISSING\n", output)
+        self.assertRegex(
+            output, r"  reader_extra_idx: 0 accesses since [-\d :]+, \d+ bytes, UNDECLARED"
+        )
+
+    def test_invalid_app_label(self):
+        with self.assertRaisesMessage(CommandError, "No installed app with label 'nonexistent'."):
+            call_command("showindexstats", "nonexistent")
@@ -0,0 +1,232 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Index
+from django.test import SimpleTestCase, TestCase
+
+from django_mongodb_backend.indexes import EmbeddedFieldIndex
+from django_mongodb_backend.query_shapes import (
+    QueryShapes,
+    get_query_shape,
+    index_supports,
+    recommend_indexes,
+)
+
+from .models import Article, DataHolder, Reader
+
+
+class QueryShapeTests(SimpleTestCase):
+    def test_path(self):
+        match = {
+            "$and": [
+                {"headline": "Hello"},
+                {"$and": [{"number": {"$lt": 5}}, {"number": {"$ne": None}}]},
+                {"$or": [{"body": {"$exists": False}}, {"body": None}]},
+            ]
+        }
+        self.assertEqual(
+            get_query_shape(match, {"body": -1}),
+            {"equality": ["headline"], "sort": [["body", -1]], "range": ["number"]},
+        )
+
+    def test_expr(self):
+        match = {
+            "$expr": {
+                "$and": [
+                    {"$eq": ["$headline", "Hello"]},
+                    {"$in": ["$number", [1, 2]]},
+                    # Comparisons of two fields can't use an index.
+                    {"$gt": ["$body", "$headline"]},
+                ]
+            }
+        }
+        self.assertEqual(
+            get_query_shape(match, {}),
+            {"equality": ["headline", "number"], "sort": [], "range": []},
+        )
+
+    def test_sort(self):
+        # The fields selected by equality and those after a computed value
+        # don't need to be in the index's sort.
+        self.assertEqual(
+            get_query_shape({"headline": "Hello"}, {"headline": 1, "number": 1, "__order1": 1}),
+            {"equality": ["headline"], "sort": [["number", 1]], "range": []},
+        )
+        self.assertIsNone(get_query_shape({}, {"__order1": 1, "number": 1}))
+
+    def test_index_supports(self):
+        shape = {"equality": ["a", "b"], "sort": [["c", 1], ["d", -1]], "range": ["e"]}
+        self.assertIs(
+            index_supports([("b", 1), ("a", -1), ("c", 1), ("d", -1), ("e", 1)], shape), True
+        )
+        self.assertIs(
+            index_supports([("a", 1), ("b", 1), ("c", -1), ("d", 1), ("e", 1)], shape), True
+        )
+        self.assertIs(
+            index_supports([("a", 1), ("b", 1), ("c", 1), ("d", 1), ("e", 1)], shape), False
+        )
+        self.assertIs(
+            index_supports([("a", 1), ("b", 1), ("e", 1), ("c", 1), ("d", -1)], shape), False
+        )
+        self.assertIs(index_supports([("a", 1), ("b", 1)], shape), False)
+
+    def test_recommend_indexes(self):
+        shapes = [
+            {"_id": {"equality": ["a"], "sort": [], "range": []}, "count": 5},
+            {"_id": {"equality": ["a"], "sort": [["b", -1]], "range": ["c"]}, "count": 3},
+            {"_id": {"equality": [], "sort": [["d", 1]], "range": []}, "count": 1},
+        ]
+        self.assertEqual(
+            [(rec["key"], rec["count"]) for rec in recommend_indexes(shapes)],
+            [([("a", 1), ("b", -1), ("c", 1)], 8), ([("d", 1)], 1)],
+        )
+        # Existing indexes support the queries in the reverse direction.
+        self.assertEqual(
+            [(rec["key"], rec["count"]) for rec in recommend_indexes(shapes, [[("d", -1)]])],
+            [([("a", 1), ("b", -1), ("c", 1)], 8)],
+        )
+
+
+class QueryShapesTests(TestCase):
+    def setUp(self):
+        connection.__dict__.pop("query_shapes", None)
+        self.addCleanup(connection.__dict__.pop, "query_shapes", None)
+        self.query_shapes = QueryShapes(connection)
+        self.addCleanup(self.query_shapes.clear)
+
+    def get_shapes(self):
+        return [
+            (record["_id"], record["count"])
+            for record in self.query_shapes.shapes([Article._meta.db_table])
+        ]
+
+    def test_sample(self):
+        with mock.patch.dict(connection.settings_dict, {"INDEX_ADVISOR": {"SAMPLE_RATE": 1}}):
+            for _ in range(2):
+                list(Article.objects.filter(headline="Hello", number__gt=1).order_by("-body"))
+            # The samples are counted in memory until they're flushed.
+            self.assertEqual(self.get_shapes(), [])
+            connection.query_shapes.flush()
+        self.assertEqual(
+            self.get_shapes(),
+            [
+                (
+                    {
+                        "collection": Article._meta.db_table,
+                        "equality": ["headline"],
+                        "sort": [["body", -1]],
+                        "range": ["number"],
+                    },
+                    2,
+                )
+            ],
+        )
+
+    def test_flush_interval(self):
+        options = {"INDEX_ADVISOR": {"SAMPLE_RATE": 1, "FLUSH_INTERVAL": 60}}
+        with (
+            mock.patch.dict(connection.settings_dict, options),
+            mock.patch(
+                "django_mongodb_backend.query_shapes.monotonic", side_effect=[0, 59, 61, 61]
+            ),
+        ):
+            list(Article.objects.filter(headline="Hello"))
+            self.assertEqual(self.get_shapes(), [])
+            list(Article.objects.filter(headline="Hello"))
+        shape = {
+            "collection": Article._meta.db_table,
+            "equality": ["headline"],
+            "sort": [],
+            "range": [],
+        }
+        self.assertEqual(self.get_shapes(), [(shape, 2)])
+        self.assertEqual(connection.query_shapes.pending, {})
+
+    def test_not_configured(self):
+        list(Article.objects.filter(headline="Hello"))
+        self.assertIsNone(connection.query_shapes)
+        self.assertEqual(self.get_shapes(), [])
+
+    def test_invalid_sample_rate(self):
+        msg = (
+            "DATABASES['default']['INDEX_ADVISOR']['SAMPLE_RATE'] must be greater than 0 and "
+            "less than or equal to 1."
+        )
+        with (
+            mock.patch.dict(connection.settings_dict, {"INDEX_ADVISOR": {"SAMPLE_RATE": 0}}),
+            self.assertRaisesMessage(ImproperlyConfigured, msg),
+        ):
+            connection.query_shapes  # noqa: B018
+
+
+class SuggestIndexesTests(TestCase):
+    def setUp(self):
+        self.query_shapes = QueryShapes(connection)
+        self.addCleanup(self.query_shapes.clear)
+        self.query_shapes.record(
+            Article._meta.db_table,
+            {"equality": ["headline"], "sort": [["body", -1]], "range": ["number"]},
+            count=3,
+        )
+        self.query_shapes.record(
+            Article._meta.db_table, {"equality": ["headline"], "sort": [], "range": []}, count=2
+        )
+        self.query_shapes.record(
+            DataHolder._meta.db_table,
+            {"equality": ["data.string_"], "sort": [["integer", 1]], "range": []},
+        )
+        # Reader's Meta.indexes supports these queries.
+        self.query_shapes.record(
+            Reader._meta.db_table, {"equality": ["name"], "sort": [], "range": ["email"]}
+        )
+        # A field of a joined collection.
+        self.query_shapes.record(
+            Reader._meta.db_table,
+            {"equality": ["indexes__article.headline"], "sort": [], "range": []},
+        )
+
+    def suggest_indexes(self, *args):
+        out = StringIO()
+        call_command("suggestindexes", "indexes_", *args, stdout=out)
+        return out.getvalue()
+
+    def test_suggest(self):
+        output = self.suggest_indexes()
+        article_index = Index(fields=["headline", "-body", "number"])
+        article_index.set_name_with_model(Article)
+        self.assertIn(
+            f"indexes_.Article ({Article._meta.db_table}):\n"
+            "    # Supports 5 sampled queries.\n"
+            '    models.Index(fields=["headline", "-body", "number"], '
+            f'name="{article_index.name}"),\n',
+            output,
+        )
+        holder_index = EmbeddedFieldIndex(fields=["data.string", "integer"])
+        holder_index.set_name_with_model(DataHolder)
+        self.assertIn(
+            f"indexes_.DataHolder ({DataHolder._meta.db_table}):\n"
+            "    # Supports 1 sampled query.\n"
+            '    EmbeddedFieldIndex(fields=["data.string", "integer"], '
+            f'name="{holder_index.name}"),\n',
+            output,
+        )
+        self.assertNotIn("indexes_.Reader", output)
+
+    def test_verbosity(self):
+        output = self.suggest_indexes("--verbosity=2")
+        self.assertIn(
+            "    # Supports 5 sampled queries.\n"
+            "    #   equality: headline; sort: -body; range: number\n"
+            "    #   equality: headline\n",
+            output,
+        )
+
+    def test_min_count(self):
+        self.assertEqual(self.suggest_indexes("--min-count=6"), "No indexes to suggest.\n")
+
+    def test_clear(self):
+        self.assertEqual(self.suggest_indexes("--clear"), "Deleted the sampled query shapes.\n")
+        self.assertEqual(self.query_shapes.shapes(), [])
@@ -1,6 +1,6 @@
 from unittest import mock
 
-from django.db import connection
+from django.db import DatabaseError, connection
 from django.test import SimpleTestCase, TestCase, skipUnlessDBFeature
 
 from django_mongodb_backend.indexes import SearchIndex, VectorSearchIndex
@@ -76,6 +76,11 @@ class SearchIndexTests(SimpleTestCase):
         with self.assertRaisesMessage(ValueError, msg):
             SearchIndex(search_analyzer=["foo"])
 
+    def test_stored_source_type(self):
+        msg = "stored_source must be True or a list of field names; got: <class 'str'>."
+        with self.assertRaisesMessage(ValueError, msg):
+            SearchIndex(fields=["foo"], stored_source="foo")
+
     def test_deconstruct(self):
         index = SearchIndex(name="recent_test_idx", fields=["number"])
         name, args, kwargs = index.deconstruct()
@@ -106,6 +111,12 @@ class SearchIndexTests(SimpleTestCase):
             },
         )
 
+    def test_deconstruct_stored_source(self):
+        index = SearchIndex(fields=["a"], stored_source=["a", "b"])
+        _, args, kwargs = index.deconstruct()
+        self.assertEqual(args, ())
+        self.assertEqual(kwargs, {"name": "", "fields": ["a"], "stored_source": ["a", "b"]})
+
 
 class VectorSearchIndexTests(SimpleTestCase):
     def test_no_init_args(self):
@@ -187,6 +198,89 @@ class VectorSearchIndexTests(SimpleTestCase):
             )
 
 
+class WaitUntilSearchIndexesReadyTests(SimpleTestCase):
+    def get_editor(self, statuses):
+        """
+        Return a schema editor with two pending indexes whose collection
+        reports the given list of statuses of both indexes at each check.
+        """
+        collection = mock.Mock()
+        collection.list_search_indexes.side_effect = [
+            [
+                {"name": "idx1", "status": status1, "queryable": False},
+                {"name": "idx2", "status": status2, "queryable": False},
+                {"name": "other", "status": "PENDING", "queryable": False},
+            ]
+            for status1, status2 in statuses
+        ]
+        collection.estimated_document_count.return_value = 10
+        editor = connection.schema_editor()
+        editor.get_collection = mock.Mock(return_value=collection)
+        editor.pending_search_indexes["coll"] = {"idx1", "idx2"}
+        return editor, collection
+
+    @mock.patch("django_mongodb_backend.schema.sleep")
+    def test_waits_for_all_indexes(self, sleep):
+        editor, collection = self.get_editor(
+            [("PENDING", "BUILDING"), ("READY", "BUILDING"), ("READY", "BUILDING"), ("READY",) * 2]
+        )
+        with self.assertLogs("django.db.backends.schema", "INFO") as logs:
+            editor.wait_until_search_indexes_ready()
+        # Both indexes are checked with one call and the interval doubles.
+        self.assertEqual(collection.list_search_indexes.call_count, 4)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.1, 0.2, 0.4])
+        self.assertEqual(dict(editor.pending_search_indexes), {})
+        self.assertEqual(
+            logs.output[:2],
+            [
+                "INFO:django.db.backends.schema:Waiting for search index idx1 on coll: "
+                "status=PENDING, queryable=False, documents=10",
+                "INFO:django.db.backends.schema:Waiting for search index idx2 on coll: "
+                "status=BUILDING, queryable=False, documents=10",
+            ],
+        )
+        self.assertEqual(len(logs.output), 4)
+
+    @mock.patch("django_mongodb_backend.schema.sleep")
+    def test_max_interval(self, sleep):
+        editor, _ = self.get_editor([("PENDING", "PENDING")] * 4 + [("READY", "READY")])
+        editor.wait_until_search_indexes_ready(max_interval=0.3)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.1, 0.2, 0.3, 0.3])
+
+    @mock.patch("django_mongodb_backend.schema.sleep")
+    def test_failed(self, sleep):
+        editor, _ = self.get_editor([("READY", "FAILED")])
+        with self.assertRaisesMessage(DatabaseError, "Index idx2 failed to build."):
+            editor.wait_until_search_indexes_ready()
+
+    @mock.patch("django_mongodb_backend.schema.sleep")
+    @mock.patch("django_mongodb_backend.schema.monotonic", side_effect=[0, 5])
+    def test_timeout(self, monotonic, sleep):
+        editor, _ = self.get_editor([("READY", "PENDING")])
+        with self.assertRaisesMessage(TimeoutError, "Index idx2 not ready after 5 seconds."):
+            editor.wait_until_search_indexes_ready(timeout=5)
+
+    def test_no_pending_indexes(self):
+        editor, collection = self.get_editor([])
+        editor.pending_search_indexes["coll"].clear()
+        editor.wait_until_search_indexes_ready()
+        collection.list_search_indexes.assert_not_called()
+
+    @mock.patch("django_mongodb_backend.schema.sleep")
+    def test_wait_until_index_created_deprecated(self, sleep):
+        editor, collection = self.get_editor([("READY", "PENDING"), ("READY", "READY")])
+        editor.pending_search_indexes["coll"].clear()
+        collection.name = "coll"
+        msg = (
+            "wait_until_index_created() is deprecated in favor of "
+            "wait_until_search_indexes_ready()."
+        )
+        with self.assertWarnsMessage(DeprecationWarning, msg):
+            self.assertIs(editor.wait_until_index_created(collection, "idx2"), True)
+        self.assertEqual(collection.list_search_indexes.call_count, 2)
+        self.assertEqual(dict(editor.pending_search_indexes), {})
+
+
 @skipUnlessDBFeature("supports_search")
 class SearchIndexSchemaTests(SchemaAssertionMixin, TestCase):
     def test_simple(self):
@@ -194,6 +288,31 @@ class SearchIndexSchemaTests(SchemaAssertionMixin, TestCase):
         with connection.schema_editor() as editor:
             self.assertAddRemoveIndex(editor, index=index, model=SearchIndexTestModel)
 
+    def test_indexes_built_concurrently(self):
+        indexes = [
+            SearchIndex(name="recent_test_idx1", fields=["char"]),
+            SearchIndex(name="recent_test_idx2", fields=["integer"]),
+        ]
+        table = SearchIndexTestModel._meta.db_table
+        try:
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.add_index(index=index, model=SearchIndexTestModel)
+                # Neither index was waited for yet.
+                self.assertEqual(
+                    editor.pending_search_indexes[table], {"recent_test_idx1", "recent_test_idx2"}
+                )
+            statuses = {
+                index["name"]: index["status"]
+                for index in connection.get_collection(table).list_search_indexes()
+            }
+            self.assertEqual(statuses["recent_test_idx1"], "READY")
+            self.assertEqual(statuses["recent_test_idx2"], "READY")
+        finally:
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.remove_index(index=index, model=SearchIndexTestModel)
+
     def test_valid_fields(self):
         index = SearchIndex(
             name="recent_test_idx",
@@ -342,6 +461,26 @@ class SearchIndexSchemaTests(SchemaAssertionMixin, TestCase):
             with connection.schema_editor() as editor:
                 editor.remove_index(index=index, model=SearchIndexTestModel)
 
+    def test_stored_source(self):
+        tests = [
+            (True, True),
+            (["char", "embedded_model"], {"include": ["char", "embedded_model"]}),
+        ]
+        for stored_source, expected in tests:
+            with self.subTest(stored_source=stored_source):
+                index = SearchIndex(
+                    name="stored_source_test_idx", fields=["char"], stored_source=stored_source
+                )
+                with connection.schema_editor() as editor:
+                    editor.add_index(index=index, model=SearchIndexTestModel)
+                try:
+                    collection = connection.get_collection(SearchIndexTestModel._meta.db_table)
+                    (index_info,) = collection.list_search_indexes(index.name)
+                    self.assertEqual(index_info["latestDefinition"]["storedSource"], expected)
+                finally:
+                    with connection.schema_editor() as editor:
+                        editor.remove_index(index=index, model=SearchIndexTestModel)
+
 
 @skipUnlessDBFeature("supports_search")
 class VectorSearchIndexSchemaTests(SchemaAssertionMixin, TestCase):
@@ -451,6 +590,35 @@ class VectorSearchIndexSchemaTests(SchemaAssertionMixin, TestCase):
             with connection.schema_editor() as editor:
                 editor.remove_index(index=index, model=SearchIndexTestModel)
 
+    def test_binary_vector_field(self):
+        index = VectorSearchIndex(
+            name="recent_test_idx",
+            fields=["vector_binary", "integer"],
+            similarities="dotProduct",
+        )
+        with connection.schema_editor() as editor:
+            editor.add_index(index=index, model=SearchIndexTestModel)
+        try:
+            index_info = connection.introspection.get_constraints(
+                cursor=None,
+                table_name=SearchIndexTestModel._meta.db_table,
+            )
+            self.assertEqual(
+                index_info[index.name]["options"]["latestDefinition"]["fields"],
+                [
+                    {
+                        "numDimensions": 16,
+                        "path": "vector_binary",
+                        "similarity": "dotProduct",
+                        "type": "vector",
+                    },
+                    {"path": "integer", "type": "filter"},
+                ],
+            )
+        finally:
+            with connection.schema_editor() as editor:
+                editor.remove_index(index=index, model=SearchIndexTestModel)
+
     def test_indexing_methods_flat(self):
         index = VectorSearchIndex(
             name="recent_test_idx",
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+import django_mongodb_backend
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="Author",
+                    fields=[
+                        (
+                            "id",
+                            django_mongodb_backend.fields.ObjectIdAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        ("name", models.CharField(max_length=100)),
+                    ],
+                ),
+            ],
+        ),
+    ]
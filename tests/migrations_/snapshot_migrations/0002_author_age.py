@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("migrations_", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="author",
+            name="age",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(fields=["age"], name="author_age_idx"),
+        ),
+        migrations.RenameField(
+            model_name="author",
+            old_name="name",
+            new_name="full_name",
+        ),
+    ]
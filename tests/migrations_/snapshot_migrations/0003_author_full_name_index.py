@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+def add_author(apps, schema_editor):
+    Author = apps.get_model("migrations_", "Author")
+    Author.objects.using(schema_editor.connection.alias).create(full_name="Hergé")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("migrations_", "0002_author_age"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="author",
+            name="full_name",
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.RemoveIndex(
+            model_name="author",
+            name="author_age_idx",
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(fields=["age", "full_name"], name="author_age_full_name_idx"),
+        ),
+        migrations.RunPython(add_author, migrations.RunPython.noop),
+    ]
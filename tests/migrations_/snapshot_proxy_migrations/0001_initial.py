@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+import django_mongodb_backend
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Author",
+            fields=[
+                (
+                    "id",
+                    django_mongodb_backend.fields.ObjectIdAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="AuthorProxy",
+            fields=[],
+            options={"proxy": True},
+            bases=("migrations_.author",),
+        ),
+        migrations.CreateModel(
+            name="LegacyAuthor",
+            fields=[
+                (
+                    "id",
+                    django_mongodb_backend.fields.ObjectIdAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+            ],
+            options={"managed": False, "db_table": "migrations__legacy_author"},
+        ),
+    ]
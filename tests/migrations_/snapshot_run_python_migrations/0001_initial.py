@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+import django_mongodb_backend
+
+
+def add_author(apps, schema_editor):
+    Author = apps.get_model("migrations_", "Author")
+    Author.objects.using(schema_editor.connection.alias).create(name="Hergé")
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Author",
+            fields=[
+                (
+                    "id",
+                    django_mongodb_backend.fields.ObjectIdAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.RunPython(add_author, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("migrations_", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="author",
+            old_name="name",
+            new_name="full_name",
+        ),
+    ]
@@ -0,0 +1,105 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.recorder import MigrationRecorder
+from django.test import TransactionTestCase, override_settings
+
+from django_mongodb_backend.schema import DatabaseSchemaEditor
+
+
+class SnapshotMigrationsTests(TransactionTestCase):
+    available_apps = ["migrations_"]
+    collection_name = "migrations__author"
+
+    def migrate(self, *args):
+        out = StringIO()
+        with mock.patch.dict(connection.settings_dict, {"SNAPSHOT_MIGRATIONS": True}):
+            call_command("migrate", *args, stdout=out)
+        self.addCleanup(call_command, "migrate", "migrations_", "zero", verbosity=0)
+        return out.getvalue()
+
+    def get_applied_migrations(self):
+        return sorted(
+            name
+            for app_label, name in MigrationRecorder(connection).applied_migrations()
+            if app_label == "migrations_"
+        )
+
+    @override_settings(MIGRATION_MODULES={"migrations_": "migrations_.snapshot_migrations"})
+    def test_snapshot(self):
+        with mock.patch.object(DatabaseSchemaEditor, "update_documents") as update_documents:
+            out = self.migrate()
+        self.assertIn(f"Creating collection {self.collection_name}", out)
+        self.assertIn("Applying migrations_.0003_author_full_name_index... FAKED", out)
+        # Existing documents aren't updated since the collection is new.
+        update_documents.assert_not_called()
+        self.assertEqual(
+            self.get_applied_migrations(),
+            ["0001_initial", "0002_author_age", "0003_author_full_name_index"],
+        )
+        # The collection has the indexes of the final state.
+        constraints = connection.introspection.get_constraints(None, self.collection_name)
+        self.assertNotIn("author_age_idx", constraints)
+        self.assertEqual(constraints["author_age_full_name_idx"]["columns"], ["age", "full_name"])
+        self.assertIn(
+            ["full_name"],
+            [constraint["columns"] for constraint in constraints.values() if constraint["index"]],
+        )
+        # RunPython operations are run.
+        self.assertEqual(
+            list(connection.get_collection(self.collection_name).find({}, {"_id": 0})),
+            [{"full_name": "Hergé", "age": 0}],
+        )
+
+    @override_settings(MIGRATION_MODULES={"migrations_": "migrations_.snapshot_migrations"})
+    def test_applied_migrations(self):
+        """Migrations are applied normally if their app has applied ones."""
+        call_command("migrate", "migrations_", "0001", verbosity=0)
+        out = self.migrate()
+        self.assertNotIn("Creating collection", out)
+        self.assertIn("Applying migrations_.0002_author_age... OK", out)
+        self.assertEqual(
+            list(connection.get_collection(self.collection_name).find({}, {"_id": 0})),
+            [{"full_name": "Hergé", "age": 0}],
+        )
+
+    @override_settings(
+        MIGRATION_MODULES={"migrations_": "migrations_.snapshot_fallback_migrations"}
+    )
+    def test_unsupported_operation(self):
+        """
+        Migrations are applied normally if they have an operation that may do
+        something else than what the state describes.
+        """
+        out = self.migrate()
+        self.assertNotIn("Creating collection", out)
+        self.assertIn("Applying migrations_.0001_initial... OK", out)
+        self.assertNotIn(self.collection_name, connection.introspection.table_names())
+
+    @override_settings(MIGRATION_MODULES={"migrations_": "migrations_.snapshot_proxy_migrations"})
+    def test_proxy_and_unmanaged_models(self):
+        """The collections of proxy and unmanaged models aren't created."""
+        out = self.migrate()
+        self.assertIn(f"Creating collection {self.collection_name}", out)
+        self.assertIn("Applying migrations_.0001_initial... FAKED", out)
+        self.assertNotIn("Creating collection migrations__legacy_author", out)
+        self.assertNotIn("migrations__legacy_author", connection.introspection.table_names())
+
+    @override_settings(
+        MIGRATION_MODULES={"migrations_": "migrations_.snapshot_run_python_migrations"}
+    )
+    def test_operation_after_run_python(self):
+        """
+        Migrations are applied normally if an operation that changes the
+        schema follows a RunPython operation, so that it changes the
+        documents that the RunPython operation writes.
+        """
+        out = self.migrate()
+        self.assertNotIn("Creating collection", out)
+        self.assertIn("Applying migrations_.0002_rename_name_full_name... OK", out)
+        self.assertEqual(
+            list(connection.get_collection(self.collection_name).find({}, {"_id": 0})),
+            [{"full_name": "Hergé"}],
+        )
@@ -4,6 +4,7 @@ from django.db import models
 
 from django_mongodb_backend.fields import (
     ArrayField,
+    BinaryVectorField,
     EmbeddedModelArrayField,
     EmbeddedModelField,
     ObjectIdField,
@@ -310,3 +311,9 @@ class ConcreteOwner(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class VectorModel(models.Model):
+    float32 = BinaryVectorField(size=3, null=True)
+    int8 = BinaryVectorField(size=3, dtype="int8", null=True)
+    packed_bit = BinaryVectorField(size=16, dtype="packed_bit", null=True)
@@ -0,0 +1,166 @@
+from bson import Binary
+from django.core import checks, serializers
+from django.core.exceptions import ValidationError
+from django.db import connection, models
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import isolate_apps
+
+from django_mongodb_backend.fields import BinaryVectorField
+
+from .models import VectorModel
+
+
+class MethodTests(SimpleTestCase):
+    def test_deconstruct(self):
+        field = BinaryVectorField(size=3)
+        field.name = "field_name"
+        _, path, args, kwargs = field.deconstruct()
+        self.assertEqual(path, "django_mongodb_backend.fields.BinaryVectorField")
+        self.assertEqual(args, [])
+        self.assertEqual(kwargs, {"size": 3})
+
+    def test_deconstruct_dtype(self):
+        field = BinaryVectorField(size=8, dtype="packed_bit")
+        *_, kwargs = field.deconstruct()
+        self.assertEqual(kwargs, {"size": 8, "dtype": "packed_bit"})
+
+    def test_get_internal_type(self):
+        self.assertEqual(BinaryVectorField(size=3).get_internal_type(), "BinaryVectorField")
+
+    def test_formfield(self):
+        self.assertIsNone(BinaryVectorField(size=3).formfield())
+
+    def test_get_db_prep_value(self):
+        tests = [
+            ("float32", [1.0, -2.5], b"\x27\x00\x00\x00\x80\x3f\x00\x00\x20\xc0"),
+            ("int8", [1, -2], b"\x03\x00\x01\xfe"),
+            ("packed_bit", [255, 1], b"\x10\x00\xff\x01"),
+        ]
+        for dtype, value, expected in tests:
+            with self.subTest(dtype=dtype):
+                field = BinaryVectorField(size=2, dtype=dtype)
+                prepared = field.get_db_prep_value(value, connection)
+                self.assertEqual(prepared, Binary(expected, subtype=9))
+                self.assertEqual(prepared.subtype, 9)
+
+    def test_get_db_prep_value_null(self):
+        self.assertIsNone(BinaryVectorField(size=2).get_db_prep_value(None, connection))
+
+    def test_to_python(self):
+        field = BinaryVectorField(size=2)
+        for value in ([0.5, 1.5], (0.5, 1.5), "[0.5, 1.5]", Binary(b"\x27\x00" + bytes(8), 9)):
+            with self.subTest(value=value):
+                self.assertEqual(len(field.to_python(value)), 2)
+        self.assertEqual(field.to_python([0.5, 1.5]).tolist(), [0.5, 1.5])
+
+    def test_to_python_invalid(self):
+        field = BinaryVectorField(size=2, dtype="int8")
+        for value in ["a", [1, "a"], 1]:
+            with self.subTest(value=value), self.assertRaises(ValidationError) as cm:
+                field.to_python(value)
+            self.assertEqual(cm.exception.code, "invalid")
+
+    def test_validate_size(self):
+        field = BinaryVectorField(size=3)
+        msg = "Vector has 2 dimensions but should have 3."
+        with self.assertRaisesMessage(ValidationError, msg):
+            field.clean([1.0, 2.0], None)
+
+    def test_validate_null(self):
+        field = BinaryVectorField(size=3)
+        with self.assertRaisesMessage(ValidationError, "This field cannot be null."):
+            field.clean(None, None)
+
+
+@isolate_apps("model_fields_")
+class CheckTests(SimpleTestCase):
+    def test_invalid_dtype(self):
+        class Model(models.Model):
+            field = BinaryVectorField(size=3, dtype="float64")
+
+        self.assertEqual(
+            Model._meta.get_field("field").check(),
+            [
+                checks.Error(
+                    "'dtype' must be one of 'float32', 'int8', 'packed_bit'.",
+                    obj=Model._meta.get_field("field"),
+                    id="mongodb.fields.vector.E001",
+                )
+            ],
+        )
+
+    def test_invalid_size(self):
+        class Model(models.Model):
+            field = BinaryVectorField(size=0)
+
+        self.assertEqual(
+            Model._meta.get_field("field").check(),
+            [
+                checks.Error(
+                    "'size' must be a positive integer.",
+                    obj=Model._meta.get_field("field"),
+                    id="mongodb.fields.vector.E002",
+                )
+            ],
+        )
+
+    def test_packed_bit_size(self):
+        class Model(models.Model):
+            field = BinaryVectorField(size=12, dtype="packed_bit")
+
+        self.assertEqual(
+            Model._meta.get_field("field").check(),
+            [
+                checks.Error(
+                    "'size' must be a multiple of 8 when dtype='packed_bit'.",
+                    obj=Model._meta.get_field("field"),
+                    id="mongodb.fields.vector.E003",
+                )
+            ],
+        )
+
+
+class ModelTests(TestCase):
+    def test_save_load(self):
+        obj = VectorModel.objects.create(
+            float32=[0.5, -1.25, 2.0], int8=[1, -2, 127], packed_bit=[0b10100000, 1]
+        )
+        obj.refresh_from_db()
+        self.assertEqual(obj.float32.tolist(), [0.5, -1.25, 2.0])
+        self.assertEqual(obj.int8.tolist(), [1, -2, 127])
+        self.assertEqual(obj.packed_bit.tolist(), [0b10100000, 1])
+
+    def test_stored_as_binary_vector(self):
+        obj = VectorModel.objects.create(float32=[0.5, -1.25, 2.0])
+        document = connection.get_collection(VectorModel._meta.db_table).find_one({"_id": obj.pk})
+        self.assertEqual(document["float32"].subtype, 9)
+        self.assertEqual(len(document["float32"]), 2 + 3 * 4)
+
+    def test_save_loaded_value(self):
+        obj = VectorModel.objects.create(float32=[0.5, -1.25, 2.0])
+        obj.refresh_from_db()
+        obj.save()
+        obj.refresh_from_db()
+        self.assertEqual(obj.float32.tolist(), [0.5, -1.25, 2.0])
+
+    def test_null(self):
+        obj = VectorModel.objects.create()
+        obj.refresh_from_db()
+        self.assertIsNone(obj.float32)
+
+    def test_full_clean(self):
+        obj = VectorModel(float32=[0.5, -1.25, 2.0])
+        obj.full_clean()
+        obj.float32 = [0.5]
+        with self.assertRaisesMessage(ValidationError, "Vector has 1 dimensions"):
+            obj.full_clean()
+
+
+class SerializationTests(TestCase):
+    def test_dumping_and_loading(self):
+        instance = VectorModel(float32=[0.5, -1.25, 2.0], int8=[1, 2, 3])
+        data = serializers.serialize("json", [instance])
+        obj = next(serializers.deserialize("json", data)).object
+        self.assertEqual(obj.float32.tolist(), [0.5, -1.25, 2.0])
+        self.assertEqual(obj.int8.tolist(), [1, 2, 3])
+        self.assertIsNone(obj.packed_bit)
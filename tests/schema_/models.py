@@ -36,3 +36,24 @@ class Book(models.Model):
 
     class Meta:
         apps = new_apps
+
+
+class Item(models.Model):
+    name = models.CharField(max_length=10)
+    quantity = models.IntegerField(default=3)
+    note = models.CharField(max_length=10, null=True, default="$note")
+
+    class Meta:
+        apps = new_apps
+
+
+class Product(models.Model):
+    name = models.CharField(max_length=10, db_index=True)
+    code = models.IntegerField(unique=True)
+    color = models.CharField(max_length=10)
+    size = models.IntegerField()
+
+    class Meta:
+        apps = new_apps
+        unique_together = [("color", "size")]
+        indexes = [models.Index(fields=["color", "name"], name="product_color_name_idx")]
@@ -0,0 +1,143 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from pymongo.collection import Collection
+
+from django_mongodb_backend.backfill import BatchUpdate
+from django_mongodb_backend.utils import LazyFieldDefaults
+
+from .models import Item
+
+
+class BatchUpdateArgumentTests(SimpleTestCase):
+    def test_invalid_batch_size(self):
+        with self.assertRaisesMessage(ValueError, "batch_size must be a positive integer."):
+            BatchUpdate(connection, "collection", {}, {}, name="name", batch_size=0)
+
+    def test_invalid_max_rate(self):
+        with self.assertRaisesMessage(ValueError, "max_rate must be a positive number."):
+            BatchUpdate(connection, "collection", {}, {}, name="name", max_rate=0)
+
+
+class BatchUpdateTests(TransactionTestCase):
+    available_apps = []
+
+    def setUp(self):
+        with connection.schema_editor() as editor:
+            editor.create_model(Item)
+
+        def delete_model():
+            with connection.schema_editor() as editor:
+                editor.delete_model(Item)
+
+        self.addCleanup(delete_model)
+        self.collection = connection.get_collection(Item._meta.db_table)
+        self.collection.insert_many([{"_id": i, "name": str(i)} for i in range(5)])
+        self.checkpoints = connection.get_collection(BatchUpdate.checkpoint_collection_name)
+
+    def get_update(self, **kwargs):
+        return BatchUpdate(
+            connection,
+            Item._meta.db_table,
+            {"name": {"$ne": "4"}},
+            {"$set": {"quantity": 1}},
+            name="test",
+            **kwargs,
+        )
+
+    def test_run(self):
+        result = self.get_update(batch_size=2).run()
+        self.assertEqual(result[:3], (4, 4, 2))
+        self.assertEqual(
+            list(self.collection.find({}, {"_id": 0, "quantity": 1})),
+            [{"quantity": 1}] * 4 + [{}],
+        )
+        # The checkpoint is deleted when the update completes.
+        self.assertIsNone(self.checkpoints.find_one({"_id": "test"}))
+
+    def test_resume(self):
+        self.checkpoints.insert_one(
+            {"_id": "test", "last_id": 1, "matched": 2, "modified": 2, "batches": 1, "elapsed": 1}
+        )
+        self.addCleanup(self.checkpoints.delete_one, {"_id": "test"})
+        result = self.get_update(batch_size=2).run()
+        self.assertEqual(result[:3], (4, 4, 2))
+        self.assertGreaterEqual(result.elapsed, 1)
+        # The documents before the checkpoint aren't updated.
+        self.assertEqual(self.collection.count_documents({"quantity": 1}), 2)
+
+    def test_interrupted(self):
+        update_many = Collection.update_many
+
+        def interrupt_second_batch(collection, *args, **kwargs):
+            if interrupt_second_batch.called:
+                raise KeyboardInterrupt
+            interrupt_second_batch.called = True
+            return update_many(collection, *args, **kwargs)
+
+        interrupt_second_batch.called = False
+        self.addCleanup(self.checkpoints.delete_one, {"_id": "test"})
+        with (
+            mock.patch.object(Collection, "update_many", interrupt_second_batch),
+            self.assertRaises(KeyboardInterrupt),
+        ):
+            self.get_update(batch_size=1).run()
+        checkpoint = self.checkpoints.find_one({"_id": "test"})
+        self.assertEqual(checkpoint["last_id"], 0)
+        self.assertEqual(checkpoint["batches"], 1)
+        # Running the update again resumes after the checkpoint.
+        self.assertEqual(self.get_update(batch_size=1).run()[:3], (4, 4, 4))
+
+    @mock.patch("django_mongodb_backend.backfill.sleep")
+    def test_max_rate(self, sleep):
+        self.get_update(batch_size=2, max_rate=1).run()
+        self.assertEqual(sleep.call_count, 2)
+        # The first batch of 2 documents takes 2 seconds at 1 document/s.
+        self.assertAlmostEqual(sleep.call_args_list[0].args[0], 2, delta=0.5)
+
+    def test_schema_editor(self):
+        options = {"BATCHED_SCHEMA_UPDATES": {"BATCH_SIZE": 2}}
+        with (
+            mock.patch.dict(connection.settings_dict, options),
+            mock.patch.object(BatchUpdate, "run", autospec=True) as run,
+            connection.schema_editor() as editor,
+        ):
+            editor.add_field(Item, Item._meta.get_field("quantity"))
+        update = run.call_args.args[0]
+        self.assertEqual(update.name, f"{Item._meta.db_table}:add_field:quantity")
+        self.assertEqual(update.batch_size, 2)
+        self.assertIsNone(update.max_rate)
+        self.assertEqual(update.update, [{"$set": {"quantity": 3}}])
+
+
+class BackfillDefaultsTests(TransactionTestCase):
+    available_apps = []
+
+    @mock.patch.dict(connection.settings_dict, {"LAZY_FIELD_DEFAULTS": True})
+    def test_backfill(self):
+        with connection.schema_editor() as editor:
+            editor.create_model(Item)
+        collection = connection.get_collection(Item._meta.db_table)
+        try:
+            collection.insert_many([{"name": "a"}, {"name": "b", "quantity": 5}])
+            with connection.schema_editor() as editor:
+                editor.add_field(Item, Item._meta.get_field("quantity"))
+            out = StringIO()
+            call_command("backfilldefaults", "--batch-size=1", stdout=out)
+            self.assertIn(f"{Item._meta.db_table}.quantity: 1 documents updated", out.getvalue())
+            self.assertEqual(
+                list(collection.find({}, {"_id": 0}).sort("name")),
+                [{"name": "a", "quantity": 3}, {"name": "b", "quantity": 5}],
+            )
+            self.assertIsNone(
+                connection.get_collection(LazyFieldDefaults.collection_name).find_one(
+                    {"collection": Item._meta.db_table}
+                )
+            )
+            self.assertIsNone(connection.lazy_field_defaults.get(Item._meta.db_table, "quantity"))
+        finally:
+            with connection.schema_editor() as editor:
+                editor.delete_model(Item)
@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TransactionTestCase
+from pymongo.collection import Collection
+
+from .models import Product
+
+
+class BatchIndexCreationTests(TransactionTestCase):
+    available_apps = []
+
+    def test_create_model(self):
+        """create_model() creates all the model's indexes at once."""
+        with (
+            mock.patch.object(
+                Collection, "create_indexes", autospec=True, side_effect=Collection.create_indexes
+            ) as create_indexes,
+            connection.schema_editor() as editor,
+        ):
+            editor.create_model(Product)
+        self.addCleanup(self.delete_model)
+        create_indexes.assert_called_once()
+        collection, indexes = create_indexes.call_args.args
+        self.assertEqual(collection.name, Product._meta.db_table)
+        constraints = connection.introspection.get_constraints(None, Product._meta.db_table)
+        index_names = {index.document["name"] for index in indexes}
+        self.assertEqual(len(index_names), 4)
+        self.assertIn("product_color_name_idx", index_names)
+        self.assertLessEqual(index_names, set(constraints))
+
+    def test_alter_unique_together(self):
+        with connection.schema_editor() as editor:
+            editor.create_model(Product)
+        self.addCleanup(self.delete_model)
+        with (
+            mock.patch.object(
+                Collection, "create_indexes", autospec=True, side_effect=Collection.create_indexes
+            ) as create_indexes,
+            connection.schema_editor() as editor,
+        ):
+            editor.alter_unique_together(
+                Product,
+                [("color", "size")],
+                [("color", "size"), ("name", "code"), ("name", "size")],
+            )
+        create_indexes.assert_called_once()
+        self.assertEqual(len(create_indexes.call_args.args[1]), 2)
+
+    def test_error_creates_no_indexes(self):
+        with connection.schema_editor() as editor:
+            editor.create_model(Product)
+        self.addCleanup(self.delete_model)
+        with (
+            mock.patch.object(Collection, "create_indexes") as create_indexes,
+            self.assertRaisesMessage(ValueError, "Error"),
+            connection.schema_editor() as editor,
+            editor.batch_index_creation(),
+        ):
+            editor.add_index(Product, Product._meta.indexes[0])
+            raise ValueError("Error")
+        create_indexes.assert_not_called()
+
+    def test_get_model_index_models(self):
+        with (
+            mock.patch.object(Collection, "create_indexes") as create_indexes,
+            connection.schema_editor(collect_sql=True) as editor,
+        ):
+            indexes = editor.get_model_index_models(Product)
+            self.assertIsNone(editor.batched_indexes)
+        create_indexes.assert_not_called()
+        index_names = {index.document["name"] for index in indexes}
+        self.assertEqual(len(index_names), 4)
+        self.assertIn("product_color_name_idx", index_names)
+
+    def delete_model(self):
+        with connection.schema_editor() as editor:
+            editor.delete_model(Product)
@@ -0,0 +1,167 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.migrations.state import ProjectState
+from django.db.models import Index, IntegerField, UniqueConstraint
+from django.test import SimpleTestCase, TransactionTestCase, skipUnlessDBFeature
+
+from django_mongodb_backend.db.migrations.operations import CheckIndexBuilds
+from django_mongodb_backend.index_builds import IndexBuilds
+
+from .models import Product, new_apps
+
+
+@mock.patch.dict(connection.settings_dict, {"ROLLING_INDEX_BUILDS": {"COMMIT_QUORUM": 1}})
+class RollingIndexBuildsTests(TransactionTestCase):
+    available_apps = []
+    index = Index(fields=["size"], name="product_size_idx")
+
+    def setUp(self):
+        with connection.schema_editor() as editor:
+            editor.create_model(Product)
+
+        def delete_model():
+            with connection.schema_editor() as editor:
+                editor.delete_model(Product)
+
+        self.addCleanup(delete_model)
+        self.index_builds = IndexBuilds(connection)
+        self.addCleanup(self.index_builds.discard_collection, Product._meta.db_table)
+
+    def get_constraints(self):
+        return connection.introspection.get_constraints(None, Product._meta.db_table)
+
+    def test_create_model(self):
+        """The indexes of a new collection aren't deferred."""
+        self.assertIn("product_color_name_idx", self.get_constraints())
+        self.assertEqual(self.index_builds.incomplete([Product._meta.db_table]), [])
+
+    def test_add_index(self):
+        with connection.schema_editor() as editor:
+            editor.add_index(Product, self.index)
+        self.assertNotIn(self.index.name, self.get_constraints())
+        (record,) = self.index_builds.incomplete([Product._meta.db_table])
+        self.assertEqual(record["index"], {"key": {"size": 1}, "name": self.index.name})
+        self.assertEqual(record["commit_quorum"], 1)
+        self.assertEqual(record["status"], "pending")
+
+    def test_add_unique_constraint(self):
+        """Unique indexes aren't deferred."""
+        constraint = UniqueConstraint(fields=["size"], name="product_size_uniq")
+        with connection.schema_editor() as editor:
+            editor.add_constraint(Product, constraint)
+        self.assertIn(constraint.name, self.get_constraints())
+        self.assertEqual(self.index_builds.incomplete([Product._meta.db_table]), [])
+
+    def test_remove_pending_index(self):
+        with connection.schema_editor() as editor:
+            editor.add_index(Product, self.index)
+        with connection.schema_editor() as editor:
+            editor.remove_index(Product, self.index)
+        self.assertEqual(self.index_builds.incomplete([Product._meta.db_table]), [])
+
+    def add_size_index(self):
+        """Add db_index=True to Product.size, returning the new field."""
+        old_field = Product._meta.get_field("size")
+        new_field = IntegerField(db_index=True)
+        new_field.set_attributes_from_name("size")
+        new_field.model = Product
+        with connection.schema_editor() as editor:
+            editor.alter_field(Product, old_field, new_field)
+        (record,) = self.index_builds.incomplete([Product._meta.db_table])
+        self.assertEqual(record["index"]["key"], {"size": 1})
+        return new_field
+
+    def test_alter_field_remove_pending_db_index(self):
+        new_field = self.add_size_index()
+        with connection.schema_editor() as editor:
+            editor.alter_field(Product, new_field, Product._meta.get_field("size"))
+        self.assertEqual(self.index_builds.incomplete([Product._meta.db_table]), [])
+
+    def test_remove_field_with_pending_db_index(self):
+        new_field = self.add_size_index()
+        with connection.schema_editor() as editor:
+            editor.remove_field(Product, new_field)
+        self.assertEqual(self.index_builds.incomplete([Product._meta.db_table]), [])
+        # Recreate the field for the cleanup.
+        with connection.schema_editor() as editor:
+            editor.add_field(Product, Product._meta.get_field("size"))
+
+    def test_rename_column_with_pending_indexes(self):
+        """The pending builds of the indexes of a renamed column use it."""
+        old_field = self.add_size_index()
+        with connection.schema_editor() as editor:
+            editor.add_index(Product, self.index)
+        new_field = IntegerField(db_index=True, db_column="weight")
+        new_field.set_attributes_from_name("size")
+        new_field.model = Product
+        with connection.schema_editor() as editor:
+            editor.alter_field(Product, old_field, new_field)
+        self.assertEqual(
+            {
+                record["index"]["name"]: record["index"]["key"]
+                for record in self.index_builds.incomplete([Product._meta.db_table])
+            },
+            {
+                self.index.name: {"weight": 1},
+                connection.schema_editor()._create_index_name(Product._meta.db_table, ["weight"]): {
+                    "weight": 1
+                },
+            },
+        )
+        # Restore the field for the cleanup.
+        with connection.schema_editor() as editor:
+            editor.remove_index(Product, self.index)
+            editor.alter_field(Product, new_field, Product._meta.get_field("size"))
+
+    def test_remove_pending_index_together(self):
+        with connection.schema_editor() as editor:
+            editor.alter_index_together(Product, [], [("color", "size")])
+        self.assertEqual(len(self.index_builds.incomplete([Product._meta.db_table])), 1)
+        with connection.schema_editor() as editor:
+            editor.alter_index_together(Product, [("color", "size")], [])
+        self.assertEqual(self.index_builds.incomplete([Product._meta.db_table]), [])
+
+    @skipUnlessDBFeature("_supports_transactions")
+    def test_build(self):
+        with connection.schema_editor() as editor:
+            editor.add_index(Product, self.index)
+        state = ProjectState.from_apps(new_apps)
+        operation = CheckIndexBuilds("product")
+        msg = (
+            f"The builds of these indexes aren't complete: {Product._meta.db_table}."
+            "product_size_idx (pending). Run the buildindexes management command."
+        )
+        with (
+            self.assertRaisesMessage(DatabaseError, msg),
+            connection.schema_editor() as editor,
+        ):
+            operation.database_forwards("schema_", editor, state, state)
+        out = StringIO()
+        call_command("buildindexes", "--status", stdout=out)
+        self.assertIn(f"{Product._meta.db_table}.product_size_idx: pending", out.getvalue())
+        out = StringIO()
+        call_command("buildindexes", "--interval=0.1", stdout=out)
+        self.assertIn(f"Built product_size_idx on {Product._meta.db_table}.", out.getvalue())
+        self.assertIn(self.index.name, self.get_constraints())
+        self.assertEqual(self.index_builds.incomplete([Product._meta.db_table]), [])
+        with connection.schema_editor() as editor:
+            operation.database_forwards("schema_", editor, state, state)
+
+
+class CheckIndexBuildsTests(SimpleTestCase):
+    def test_deconstruct(self):
+        self.assertEqual(CheckIndexBuilds().deconstruct(), ("CheckIndexBuilds", [], {}))
+        self.assertEqual(
+            CheckIndexBuilds("product").deconstruct(),
+            ("CheckIndexBuilds", [], {"model_name": "product"}),
+        )
+
+    def test_describe(self):
+        self.assertEqual(
+            CheckIndexBuilds("product").describe(),
+            "Check that the deferred index builds of product are complete",
+        )
+        self.assertEqual(CheckIndexBuilds().migration_name_fragment, "check_index_builds")
@@ -0,0 +1,141 @@
+from unittest import mock
+
+from django.db import connection, models
+from django.db.models import Sum
+from django.test import TransactionTestCase
+
+from django_mongodb_backend.utils import LazyFieldDefaults
+
+from .models import Item
+
+
+class LazyFieldDefaultsTests(TransactionTestCase):
+    available_apps = []
+
+    def setUp(self):
+        patcher = mock.patch.dict(connection.settings_dict, {"LAZY_FIELD_DEFAULTS": True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.collection = connection.get_collection(Item._meta.db_table)
+        self.lazy_defaults = connection.get_collection(LazyFieldDefaults.collection_name)
+        with connection.schema_editor() as editor:
+            editor.create_model(Item)
+        self.addCleanup(self.delete_model)
+        # A document that predates the quantity and note fields.
+        self.collection.insert_one({"name": "old"})
+        with connection.schema_editor() as editor:
+            editor.add_field(Item, Item._meta.get_field("quantity"))
+            editor.add_field(Item, Item._meta.get_field("note"))
+
+    def delete_model(self):
+        with connection.schema_editor() as editor:
+            editor.delete_model(Item)
+
+    def test_add_field(self):
+        # Existing documents aren't updated.
+        self.assertEqual(
+            self.collection.find_one({"name": "old"}, {"_id": 0}),
+            {"name": "old"},
+        )
+        self.assertCountEqual(
+            self.lazy_defaults.find({"collection": Item._meta.db_table}, {"_id": 0}),
+            [
+                {"collection": Item._meta.db_table, "column": "quantity", "value": 3},
+                {"collection": Item._meta.db_table, "column": "note", "value": "$note"},
+            ],
+        )
+
+    def test_read(self):
+        Item.objects.create(name="new", quantity=5, note=None)
+        old = Item.objects.get(name="old")
+        self.assertEqual(old.quantity, 3)
+        self.assertEqual(old.note, "$note")
+        self.assertSequenceEqual(
+            Item.objects.order_by("name").values_list("name", "quantity", "note"),
+            [("new", 5, None), ("old", 3, "$note")],
+        )
+        # A null value isn't replaced with the default.
+        self.assertIsNone(Item.objects.get(name="new").note)
+
+    def test_filter(self):
+        Item.objects.create(name="new", quantity=5)
+        self.assertQuerySetEqual(Item.objects.filter(quantity=3), ["old"], lambda obj: obj.name)
+        self.assertQuerySetEqual(Item.objects.filter(quantity__lt=5), ["old"], lambda obj: obj.name)
+        self.assertQuerySetEqual(Item.objects.filter(note__isnull=True), [], lambda obj: obj.name)
+
+    def test_order_by_and_aggregate(self):
+        Item.objects.create(name="first", quantity=1)
+        Item.objects.create(name="last", quantity=5)
+        self.assertQuerySetEqual(
+            Item.objects.order_by("quantity"), ["first", "old", "last"], lambda obj: obj.name
+        )
+        self.assertEqual(Item.objects.aggregate(total=Sum("quantity")), {"total": 9})
+
+    def test_update_expression(self):
+        Item.objects.update(quantity=models.F("quantity") + 1)
+        self.assertEqual(self.collection.find_one({"name": "old"})["quantity"], 4)
+
+    def test_rename_and_remove_field(self):
+        old_field = Item._meta.get_field("quantity")
+        new_field = models.IntegerField(default=3)
+        new_field.set_attributes_from_name("count")
+        new_field.model = Item
+        with connection.schema_editor() as editor:
+            editor.alter_field(Item, old_field, new_field)
+        self.assertEqual(
+            self.lazy_defaults.find_one({"collection": Item._meta.db_table, "value": 3})["column"],
+            "count",
+        )
+        with connection.schema_editor() as editor:
+            editor.remove_field(Item, new_field)
+        self.assertIsNone(
+            self.lazy_defaults.find_one({"collection": Item._meta.db_table, "value": 3})
+        )
+
+    def test_delete_model(self):
+        self.delete_model()
+        self.assertIsNone(self.lazy_defaults.find_one({"collection": Item._meta.db_table}))
+        # Recreate the table for the cleanup.
+        with connection.schema_editor() as editor:
+            editor.create_model(Item)
+
+    def test_cache_timeout(self):
+        lazy_field_defaults = LazyFieldDefaults(connection, timeout=60)
+        # Patch the time module of utils only, since queries use monotonic().
+        with mock.patch("django_mongodb_backend.utils.time") as time:
+            time.monotonic.side_effect = [0, 59, 61, 61]
+            self.assertEqual(lazy_field_defaults.get(Item._meta.db_table, "quantity"), 3)
+            # Another process adds a field.
+            self.lazy_defaults.insert_one(
+                {"collection": Item._meta.db_table, "column": "size", "value": 1}
+            )
+            self.assertIsNone(lazy_field_defaults.get(Item._meta.db_table, "size"))
+            self.assertEqual(lazy_field_defaults.get(Item._meta.db_table, "size"), 1)
+
+    def test_cache_timeout_zero(self):
+        lazy_field_defaults = LazyFieldDefaults(connection, timeout=0)
+        self.assertEqual(lazy_field_defaults.get(Item._meta.db_table, "quantity"), 3)
+        self.lazy_defaults.insert_one(
+            {"collection": Item._meta.db_table, "column": "size", "value": 1}
+        )
+        self.assertEqual(lazy_field_defaults.get(Item._meta.db_table, "size"), 1)
+
+
+class LazyFieldDefaultsDisabledTests(TransactionTestCase):
+    available_apps = []
+
+    def test_add_field(self):
+        """Without LAZY_FIELD_DEFAULTS, add_field() updates every document."""
+        collection = connection.get_collection(Item._meta.db_table)
+        with connection.schema_editor() as editor:
+            editor.create_model(Item)
+        try:
+            collection.insert_one({"name": "old"})
+            with connection.schema_editor() as editor:
+                editor.add_field(Item, Item._meta.get_field("quantity"))
+            self.assertEqual(
+                collection.find_one({"name": "old"}, {"_id": 0}), {"name": "old", "quantity": 3}
+            )
+        finally:
+            with connection.schema_editor() as editor:
+                editor.delete_model(Item)
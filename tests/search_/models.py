@@ -4,6 +4,7 @@ from django_mongodb_backend.fields import (
     ArrayField,
     EmbeddedModelField,
 )
+from django_mongodb_backend.managers import MongoManager
 from django_mongodb_backend.models import EmbeddedModel
 
 
@@ -23,3 +24,5 @@ class Article(models.Model):
     location = EmbeddedModelField(Location, null=True)
     plot_embedding = ArrayField(models.FloatField(), size=3, null=True)
     writer = EmbeddedModelField(Writer, null=True)
+
+    objects = MongoManager()
@@ -0,0 +1,154 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+
+from django_mongodb_backend.expressions import SearchEquals
+from django_mongodb_backend.utils import SearchIndexCache
+
+from .models import Article
+from .test_search import SearchUtilsMixin
+
+
+class SearchIndexCacheTests(SimpleTestCase):
+    search_indexes = [
+        {
+            "name": "vector_index",
+            "type": "vectorSearch",
+            "latestDefinition": {
+                "fields": [
+                    {"type": "vector", "path": "plot_embedding"},
+                    {"type": "filter", "path": "number"},
+                ]
+            },
+        },
+        {
+            "name": "headline_index",
+            "type": "search",
+            "latestDefinition": {
+                "mappings": {
+                    "dynamic": False,
+                    "fields": {
+                        "headline": {"type": "string"},
+                        "writer": {"type": "document", "fields": {"name": {"type": "string"}}},
+                    },
+                }
+            },
+        },
+        {
+            "name": "dynamic_index",
+            "type": "search",
+            "latestDefinition": {"mappings": {"dynamic": True}},
+        },
+    ]
+
+    def get_collection(self):
+        collection = mock.Mock()
+        collection.name = "search__article"
+        collection.list_search_indexes.return_value = self.search_indexes
+        return collection
+
+    def test_get_indexes(self):
+        self.assertEqual(
+            SearchIndexCache().get_indexes(self.get_collection()),
+            [
+                ("vector_index", "vectorSearch", frozenset({"plot_embedding", "number"})),
+                (
+                    "headline_index",
+                    "search",
+                    frozenset({"headline", "writer", "writer.name"}),
+                ),
+                ("dynamic_index", "search", None),
+            ],
+        )
+
+    def test_get_index_name(self):
+        cache = SearchIndexCache()
+        collection = self.get_collection()
+        tests = [
+            ({"headline"}, "search", "headline_index"),
+            ({"writer.name", "headline"}, "search", "headline_index"),
+            ({"body"}, "search", "dynamic_index"),
+            ({"plot_embedding"}, "vectorSearch", "vector_index"),
+            ({"other_embedding"}, "vectorSearch", "default"),
+        ]
+        for fields, index_type, expected in tests:
+            with self.subTest(fields=fields, index_type=index_type):
+                self.assertEqual(cache.get_index_name(collection, fields, index_type), expected)
+        collection.list_search_indexes.assert_called_once_with()
+
+    def test_stores_fields(self):
+        collection = self.get_collection()
+        definition = self.search_indexes[1]["latestDefinition"]
+        tests = [
+            (None, {"_id"}, False),
+            (True, {"_id", "headline", "body"}, True),
+            ({"include": ["headline", "writer"]}, {"_id", "headline", "writer.name"}, True),
+            ({"include": ["headline", "writer.name"]}, {"writer"}, False),
+            ({"include": ["headline"]}, {"headline", "body"}, False),
+            ({"exclude": ["body"]}, {"_id", "headline", "writer"}, True),
+            ({"exclude": ["writer.name"]}, {"writer"}, False),
+            ({"exclude": ["writer"]}, {"writer.name"}, False),
+        ]
+        for stored_source, fields, expected in tests:
+            with (
+                self.subTest(stored_source=stored_source, fields=fields),
+                mock.patch.dict(definition, {"storedSource": stored_source}),
+            ):
+                self.assertIs(
+                    SearchIndexCache().stores_fields(collection, "headline_index", fields),
+                    expected,
+                )
+
+    def test_stores_fields_unknown_index(self):
+        self.assertIs(
+            SearchIndexCache().stores_fields(self.get_collection(), "default", {"_id"}), False
+        )
+
+    def test_expiration(self):
+        cache = SearchIndexCache(timeout=60)
+        collection = self.get_collection()
+        with mock.patch("time.monotonic", side_effect=[0, 59, 61, 61]):
+            cache.get_indexes(collection)
+            cache.get_indexes(collection)
+            self.assertEqual(collection.list_search_indexes.call_count, 1)
+            cache.get_indexes(collection)
+            self.assertEqual(collection.list_search_indexes.call_count, 2)
+
+    def test_timeout_zero(self):
+        cache = SearchIndexCache(timeout=0)
+        collection = self.get_collection()
+        cache.get_indexes(collection)
+        cache.get_indexes(collection)
+        self.assertEqual(collection.list_search_indexes.call_count, 2)
+
+    def test_invalidate(self):
+        cache = SearchIndexCache()
+        collection = self.get_collection()
+        cache.get_indexes(collection)
+        cache.invalidate("search__article")
+        cache.get_indexes(collection)
+        self.assertEqual(collection.list_search_indexes.call_count, 2)
+
+
+class SearchIndexCacheQueryTests(SearchUtilsMixin):
+    @classmethod
+    def setUpClass(cls):
+        cls.create_search_index(Article, "cache_headline_index", {"headline": {"type": "token"}})
+
+    def test_cached(self):
+        connection.search_index_cache.invalidate(Article._meta.db_table)
+        qs = Article.objects.annotate(score=SearchEquals(path="headline", value="cross"))
+        with CaptureQueriesContext(connection) as ctx:
+            list(qs)
+            list(qs)
+        queries = [query["sql"] for query in ctx.captured_queries]
+        self.assertEqual(sum("list_search_indexes" in query for query in queries), 1)
+        self.assertIn("'index': 'cache_headline_index'", queries[-1])
+
+    def test_invalidated_by_schema_editor(self):
+        connection.search_index_cache.get_indexes(connection.get_collection(Article._meta.db_table))
+        self.assertIn(Article._meta.db_table, connection.search_index_cache.indexes)
+        self.create_search_index(Article, "cache_body_index", {"body": {"type": "string"}})
+        self.assertNotIn(Article._meta.db_table, connection.search_index_cache.indexes)
@@ -2,12 +2,14 @@ import unittest
 from collections.abc import Callable
 from functools import wraps
 from time import monotonic, sleep
+from unittest import mock
 
-from django.db import connection
+from django.db import NotSupportedError, connection
 from django.db.models import Q
 from django.db.models.query import QuerySet
 from django.db.utils import DatabaseError
-from django.test import TransactionTestCase, skipUnlessDBFeature
+from django.test import SimpleTestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
 
 from django_mongodb_backend.expressions import (
     CompoundExpression,
@@ -21,8 +23,10 @@ from django_mongodb_backend.expressions import (
     SearchPhrase,
     SearchQueryString,
     SearchRange,
+    SearchRankFusion,
     SearchRegex,
     SearchScoreOption,
+    SearchSequenceToken,
     SearchText,
     SearchVector,
     SearchWildcard,
@@ -75,8 +79,10 @@ class SearchUtilsMixin(TransactionTestCase):
     assertQuerySetEqual = _delayed_assertion(timeout=2)(TransactionTestCase.assertQuerySetEqual)
 
     @classmethod
-    def create_search_index(cls, model, index_name, field_mappings, index_cls=SearchIndex):
-        idx = index_cls(field_mappings=field_mappings, name=index_name)
+    def create_search_index(
+        cls, model, index_name, field_mappings, index_cls=SearchIndex, **kwargs
+    ):
+        idx = index_cls(field_mappings=field_mappings, name=index_name, **kwargs)
         with connection.schema_editor() as editor:
             editor.add_index(model, idx)
 
@@ -851,8 +857,7 @@ class CompoundSearchTests(SearchUtilsMixin):
     def test_multiple_type_search(self):
         msg = (
             "Cannot combine a `$vectorSearch` with a `$search` operator. "
-            "If you need to combine them, consider "
-            "restructuring your query logic or running them as separate queries."
+            "To combine them, use SearchRankFusion."
         )
         with self.assertRaisesMessage(ValueError, msg):
             Article.objects.annotate(
@@ -866,10 +871,7 @@ class CompoundSearchTests(SearchUtilsMixin):
             ).order_by("score1", "score2").first()
 
     def test_multiple_vector_search(self):
-        msg = (
-            "Cannot combine two `$vectorSearch` operator. If you need to combine them, "
-            "consider restructuring your query logic or running them as separate queries."
-        )
+        msg = "Cannot combine two `$vectorSearch` operator. To combine them, use SearchRankFusion."
         with self.assertRaisesMessage(ValueError, msg):
             Article.objects.annotate(
                 score1=SearchVector(
@@ -942,7 +944,7 @@ class SearchVectorTests(SearchUtilsMixin):
             body="This article is about pasta",
             plot_embedding=[0.9, 0.8, 0.7],
         )
-        Article.objects.create(
+        self.sports = Article.objects.create(
             headline="Local team wins championship",
             number=3,
             body="This article is about sports",
@@ -962,6 +964,98 @@ class SearchVectorTests(SearchUtilsMixin):
         qs = Article.objects.annotate(score=expr).order_by("-score")
         self.assertCountEqual(qs, [self.mars, self.cooking])
 
+    def test_q_filter(self):
+        tests = [
+            (Q(number__lt=3), [self.mars, self.cooking]),
+            (Q(number=1) | Q(number__gte=3), [self.mars, self.sports]),
+            (Q(number__in=[2, 3]), [self.cooking, self.sports]),
+        ]
+        for filter_, expected in tests:
+            with self.subTest(filter=filter_):
+                expr = SearchVector(
+                    path="plot_embedding",
+                    query_vector=[0.1, 0.2, 0.3],
+                    num_candidates=5,
+                    limit=2,
+                    filter=filter_,
+                )
+                qs = Article.objects.annotate(score=expr).order_by("-score")
+                # The filter is applied before the limit.
+                self.assertCountEqual(qs, expected)
+
+    def test_q_filter_field_not_indexed(self):
+        expr = SearchVector(
+            path="plot_embedding",
+            query_vector=[0.1, 0.2, 0.3],
+            num_candidates=5,
+            limit=2,
+            filter=Q(headline="Mars landing"),
+        )
+        msg = (
+            "SearchVector requires a VectorSearchIndex on 'plot_embedding' with the filter "
+            "field(s) 'headline'."
+        )
+        with self.assertRaisesMessage(ValueError, msg):
+            list(Article.objects.annotate(score=expr))
+
+    def test_q_filter_unsupported_lookup(self):
+        expr = SearchVector(
+            path="plot_embedding",
+            query_vector=[0.1, 0.2, 0.3],
+            num_candidates=5,
+            limit=2,
+            filter=Q(number__range=(1, 2)),
+        )
+        msg = "MongoDB does not support the 'range' lookup in indexes."
+        with self.assertRaisesMessage(NotSupportedError, msg):
+            list(Article.objects.annotate(score=expr))
+
+    def test_vector_search_batch(self):
+        query_vectors = [[0.1, 0.2, 0.3], [0.9, 0.8, 0.7], [-0.1, 0.7, 0.7]]
+        expected = [
+            [self.mars, self.sports],
+            [self.cooking, self.mars],
+            [self.sports, self.mars],
+        ]
+        for batch_size in (1, 2, 3):
+            with self.subTest(batch_size=batch_size):
+                self.assertListEqual(
+                    lambda batch_size=batch_size: list(
+                        Article.objects.vector_search_batch(
+                            "plot_embedding", query_vectors, 2, exact=True, batch_size=batch_size
+                        )
+                    ),
+                    expected,
+                )
+
+    def test_vector_search_batch_scores(self):
+        (results,) = Article.objects.vector_search_batch(
+            "plot_embedding", [[0.1, 0.2, 0.3]], 2, exact=True
+        )
+        self.assertEqual(results[0], self.mars)
+        self.assertAlmostEqual(results[0].score, 1.0)
+        self.assertGreater(results[0].score, results[1].score)
+        self.assertFalse(hasattr(results[0], "_vector_search_batch_index"))
+
+    def test_vector_search_batch_queryset(self):
+        qs = Article.objects.filter(number__gte=2)
+        self.assertListEqual(
+            lambda: list(
+                qs.vector_search_batch(
+                    "plot_embedding", [[0.1, 0.2, 0.3]], 2, exact=True, filter=Q(number__lt=3)
+                )
+            ),
+            [[self.cooking]],
+        )
+
+    def test_vector_search_batch_one_round_trip(self):
+        with self.assertNumQueries(1):
+            list(
+                Article.objects.vector_search_batch(
+                    "plot_embedding", [[0.1, 0.2, 0.3], [0.9, 0.8, 0.7]], 2, exact=True
+                )
+            )
+
     def test_str_returns_expected_format(self):
         vector_query = [0.1, 0.2, 0.3]
         se = SearchVector(
@@ -975,3 +1069,356 @@ class SearchVectorTests(SearchUtilsMixin):
             "<SearchVector(path='plot_embedding', query_vector=(0.1, 0.2, 0.3), limit=2, "
             "num_candidates=5, exact=None, filter=None)>",
         )
+
+
+class SearchFacetsTests(SearchUtilsMixin):
+    @classmethod
+    def setUpClass(cls):
+        cls.create_search_index(
+            Article,
+            "facets_index",
+            {"body": {"type": "string"}, "headline": {"type": "token"}},
+        )
+
+    def setUp(self):
+        self.mars = Article.objects.create(headline="Mars", number=1, body="Landing on mars")
+        self.mars_again = Article.objects.create(
+            headline="Mars", number=2, body="Another mars landing"
+        )
+        self.moon = Article.objects.create(headline="Moon", number=3, body="Landing on the moon")
+        Article.objects.create(headline="Cooking", number=4, body="Pasta recipes")
+
+    def search_facets(self, queryset, query, **kwargs):
+        return queryset.search_facets(
+            SearchText(path="body", query=query),
+            {"headlines": {"type": "string", "path": "headline"}},
+            **kwargs,
+        )
+
+    def get_buckets(self, meta):
+        return sorted(
+            (bucket["_id"], bucket["count"]) for bucket in meta["facet"]["headlines"]["buckets"]
+        )
+
+    def test_search_facets(self):
+        def search():
+            objects, meta = self.search_facets(Article.objects.all()[:10], "landing")
+            return [sorted(obj.number for obj in objects), self.get_buckets(meta)]
+
+        self.assertListEqual(search, [[1, 2, 3], [("Mars", 2), ("Moon", 1)]])
+
+    def test_no_annotations(self):
+        self.assertListEqual(
+            lambda: [len(self.search_facets(Article.objects.all()[:10], "mars")[0])], [2]
+        )
+        objects, _ = self.search_facets(Article.objects.all()[:10], "mars")
+        for obj in objects:
+            self.assertFalse(hasattr(obj, "score"))
+            self.assertFalse(hasattr(obj, "_search_facet"))
+
+    def test_count(self):
+        def search():
+            _, meta = self.search_facets(Article.objects.all()[:10], "landing", count="total")
+            return [meta["count"]]
+
+        self.assertListEqual(search, [{"total": 3}])
+
+    def test_sliced_and_filtered_queryset(self):
+        # The counts cover all the results of the search.
+        def search():
+            objects, meta = self.search_facets(Article.objects.filter(number__gte=2)[:1], "landing")
+            return [len(objects), self.get_buckets(meta)]
+
+        self.assertListEqual(search, [[1], [("Mars", 2), ("Moon", 1)]])
+
+    def test_one_query(self):
+        self.assertListEqual(
+            lambda: [len(self.search_facets(Article.objects.all()[:10], "landing")[0])], [3]
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            self.search_facets(Article.objects.all()[:2], "landing")
+        self.assertEqual(len(ctx.captured_queries), 1)
+        pipeline = ctx.captured_queries[0]["sql"]
+        # The results are limited and the metadata is read once.
+        self.assertIn("'hits': [", pipeline)
+        self.assertIn("{'$limit': 2}", pipeline)
+        self.assertEqual(pipeline.count("$$SEARCH_META"), 1)
+
+    def test_no_results(self):
+        with self.assertNumQueries(2):
+            objects, meta = self.search_facets(Article.objects.all()[:10], "jupiter")
+        self.assertEqual(objects, [])
+        self.assertEqual(meta["facet"], {"headlines": {"buckets": []}})
+
+    def test_no_results_after_filter(self):
+        def search():
+            objects, meta = self.search_facets(Article.objects.filter(number=4)[:10], "landing")
+            return [objects, self.get_buckets(meta)]
+
+        self.assertListEqual(search, [[], [("Mars", 2), ("Moon", 1)]])
+        # The metadata comes from the search's matches, which the filter
+        # doesn't remove.
+        with self.assertNumQueries(1):
+            search()
+
+    def test_compound_expression(self):
+        def search():
+            _, meta = Article.objects.all()[:10].search_facets(
+                SearchText(path="body", query="landing") & ~SearchText(path="body", query="moon"),
+                {"headlines": {"type": "string", "path": "headline"}},
+            )
+            return self.get_buckets(meta)
+
+        self.assertListEqual(search, [("Mars", 2)])
+
+
+class SearchFacetsArgumentTests(SimpleTestCase):
+    facets = {"headlines": {"type": "string", "path": "headline"}}
+
+    def test_operator_must_be_search_operator(self):
+        tests = [
+            "body",
+            SearchVector(path="plot_embedding", query_vector=[0.1, 0.2, 0.3], limit=2),
+        ]
+        for operator in tests:
+            with (
+                self.subTest(operator=operator),
+                self.assertRaisesMessage(
+                    ValueError, f"SearchFacet requires a search operator, not {operator!r}."
+                ),
+            ):
+                Article.objects.search_facets(operator, self.facets)
+
+    def test_requires_facets(self):
+        with self.assertRaisesMessage(ValueError, "SearchFacet requires at least one facet."):
+            Article.objects.search_facets(SearchText(path="body", query="mars"), {})
+
+    def test_requires_slice(self):
+        msg = "search_facets() requires a sliced queryset, e.g. queryset[:10]."
+        with self.assertRaisesMessage(ValueError, msg):
+            Article.objects.search_facets(SearchText(path="body", query="mars"), self.facets)
+
+
+class SearchSequenceTests(SearchUtilsMixin):
+    @classmethod
+    def setUpClass(cls):
+        cls.create_search_index(
+            Article,
+            "sequence_index",
+            {"body": {"type": "string"}, "number": {"type": "number"}},
+        )
+
+    def setUp(self):
+        for number in range(1, 6):
+            Article.objects.create(headline=f"Mars {number}", number=number, body="mars")
+
+    def get_queryset(self):
+        # Score each article by its number so that the order is deterministic.
+        score = SearchScoreOption({"function": {"path": {"value": "number", "undefined": 0}}})
+        return Article.objects.annotate(
+            score=SearchText(path="body", query="mars", score=score),
+            token=SearchSequenceToken(),
+        )
+
+    def test_search_after(self):
+        qs = self.get_queryset()
+        self.assertListEqual(lambda: [obj.number for obj in qs[:2]], [5, 4])
+        token = qs[1].token
+        self.assertIsInstance(token, str)
+        self.assertListEqual(lambda: [obj.number for obj in qs.search_after(token)[:2]], [3, 2])
+
+    def test_search_before(self):
+        qs = self.get_queryset()
+        self.assertListEqual(lambda: [obj.number for obj in qs[3:4]], [2])
+        token = qs[3].token
+        self.assertListEqual(lambda: [obj.number for obj in qs.search_before(token)[:2]], [3, 4])
+
+    def test_pipeline(self):
+        with CaptureQueriesContext(connection) as ctx:
+            list(self.get_queryset().search_after("token"))
+        self.assertIn("'searchAfter': 'token'", ctx.captured_queries[-1]["sql"])
+
+    def test_requires_search(self):
+        msg = "search_after() and search_before() require a search expression."
+        with self.assertRaisesMessage(NotSupportedError, msg):
+            list(Article.objects.search_after("token"))
+
+    def test_vector_search_not_supported(self):
+        qs = Article.objects.annotate(
+            score=SearchVector(path="plot_embedding", query_vector=[0.1, 0.2, 0.3], limit=2)
+        ).search_before("token")
+        msg = "search_after() and search_before() aren't supported with SearchVector."
+        with self.assertRaisesMessage(NotSupportedError, msg):
+            list(qs)
+
+
+class SearchStoredSourceTests(SearchUtilsMixin):
+    @classmethod
+    def setUpClass(cls):
+        cls.create_search_index(
+            Article,
+            "stored_source_index",
+            {"headline": {"type": "string"}},
+            stored_source=["headline", "number"],
+        )
+
+    def setUp(self):
+        self.article = Article.objects.create(headline="Mars landing", number=1, body="body")
+        Article.objects.create(headline="Cooking tips", number=2, body="body")
+
+    def get_queryset(self):
+        return Article.objects.annotate(score=SearchText(path="headline", query="mars"))
+
+    def assertReturnsStoredSource(self, qs, expected):
+        with CaptureQueriesContext(connection) as ctx:
+            list(qs)
+        self.assertIs("'returnStoredSource': True" in ctx.captured_queries[-1]["sql"], expected)
+
+    def test_only(self):
+        qs = self.get_queryset().only("headline")
+        self.assertListEqual(lambda: [obj.headline for obj in qs], ["Mars landing"])
+        self.assertReturnsStoredSource(qs, True)
+
+    def test_values(self):
+        qs = self.get_queryset().filter(number__lt=5).order_by("number")
+        self.assertListEqual(
+            lambda: list(qs.values_list("headline", "number")), [("Mars landing", 1)]
+        )
+        self.assertReturnsStoredSource(qs.values_list("headline", "number", "score"), True)
+
+    def test_unstored_fields(self):
+        tests = [
+            self.get_queryset(),
+            self.get_queryset().only("body"),
+            self.get_queryset().only("headline").filter(body="body"),
+            self.get_queryset().values("headline").order_by("body"),
+        ]
+        for qs in tests:
+            with self.subTest(qs=qs):
+                self.assertReturnsStoredSource(qs, False)
+
+
+class SearchRankFusionTests(SearchUtilsMixin):
+    @classmethod
+    def setUpClass(cls):
+        cls.create_search_index(Article, "rank_fusion_text_index", {"body": {"type": "string"}})
+        idx = VectorSearchIndex(
+            fields=["plot_embedding"], name="rank_fusion_vector_index", similarities="cosine"
+        )
+        with connection.schema_editor() as editor:
+            editor.add_index(Article, idx)
+
+        def drop_index():
+            with connection.schema_editor() as editor:
+                editor.remove_index(Article, idx)
+
+        cls.addClassCleanup(drop_index)
+
+    def setUp(self):
+        self.mars = Article.objects.create(
+            headline="Mars landing",
+            number=1,
+            body="The rover has landed on Mars",
+            plot_embedding=[0.1, 0.2, 0.3],
+        )
+        self.rover = Article.objects.create(
+            headline="Rover tips",
+            number=2,
+            body="Rover, rover, rover: how to drive a rover",
+            plot_embedding=[0.9, 0.8, 0.7],
+        )
+        self.cooking = Article.objects.create(
+            headline="Cooking tips",
+            number=3,
+            body="This article is about pasta",
+            plot_embedding=[0.1, 0.25, 0.3],
+        )
+
+    def get_queryset(self, weights=None):
+        expr = SearchRankFusion(
+            SearchText(path="body", query="rover"),
+            SearchVector(path="plot_embedding", query_vector=[0.1, 0.2, 0.3], limit=2, exact=True),
+            weights=weights,
+            limit=5,
+        )
+        return Article.objects.annotate(score=expr).order_by("-score")
+
+    def test_rank_fusion(self):
+        # The text search ranks rover above mars, the vector search ranks mars
+        # above cooking, and mars is ranked by both.
+        self.assertListEqual(
+            lambda: list(self.get_queryset()), [self.mars, self.rover, self.cooking]
+        )
+
+    def test_weights(self):
+        self.assertListEqual(
+            lambda: list(self.get_queryset(weights=[1, 10])), [self.mars, self.cooking, self.rover]
+        )
+
+    def test_score(self):
+        scores = self.get_queryset().values_list("score", flat=True)
+        # The first document is ranked first by the vector search and second
+        # by the text search.
+        self.assertListEqual(lambda: [round(scores[0], 6)], [round(1 / 61 + 1 / 62, 6)])
+
+    def test_union_with_fallback(self):
+        with mock.patch.object(connection.features, "supports_rank_fusion", False):
+            self.assertListEqual(
+                lambda: list(self.get_queryset()), [self.mars, self.rover, self.cooking]
+            )
+            self.assertListEqual(
+                lambda: list(self.get_queryset(weights=[1, 10])),
+                [self.mars, self.cooking, self.rover],
+            )
+
+    def test_union_with_fallback_vector_search_first(self):
+        with (
+            mock.patch.object(connection.features, "supports_rank_fusion", False),
+            CaptureQueriesContext(connection) as ctx,
+        ):
+            list(self.get_queryset())
+        query = ctx.captured_queries[-1]["sql"]
+        self.assertLess(query.index("$vectorSearch"), query.index("$unionWith"))
+        self.assertLess(query.index("$unionWith"), query.index("$search"))
+
+    def test_union_with_fallback_multiple_vector_searches(self):
+        expr = SearchRankFusion(
+            SearchVector(path="plot_embedding", query_vector=[0.1, 0.2, 0.3], limit=2),
+            SearchVector(path="plot_embedding", query_vector=[0.9, 0.8, 0.7], limit=2),
+        )
+        msg = "SearchRankFusion with more than one SearchVector requires MongoDB 8.0 or later."
+        with (
+            mock.patch.object(connection.features, "supports_rank_fusion", False),
+            mock.patch.object(connection.features, "is_mongodb_8_0", False),
+            self.assertRaisesMessage(NotSupportedError, msg),
+        ):
+            list(Article.objects.annotate(score=expr))
+
+
+class SearchRankFusionArgumentTests(SimpleTestCase):
+    def test_requires_two_inputs(self):
+        msg = "SearchRankFusion requires at least two search expressions."
+        with self.assertRaisesMessage(ValueError, msg):
+            SearchRankFusion(SearchText(path="body", query="rover"))
+
+    def test_inputs_must_be_search_expressions(self):
+        msg = "SearchRankFusion inputs must be search expressions, not 'body'."
+        with self.assertRaisesMessage(ValueError, msg):
+            SearchRankFusion(SearchText(path="body", query="rover"), "body")
+
+    def test_weights_length(self):
+        msg = "SearchRankFusion has 2 inputs but 1 weights."
+        with self.assertRaisesMessage(ValueError, msg):
+            SearchRankFusion(
+                SearchText(path="body", query="rover"),
+                SearchText(path="headline", query="rover"),
+                weights=[1],
+            )
+
+    def test_limit_required(self):
+        msg = "SearchRankFusion requires a limit for inputs that aren't SearchVector."
+        with self.assertRaisesMessage(ValueError, msg):
+            SearchRankFusion(
+                SearchText(path="body", query="rover"),
+                SearchVector(path="plot_embedding", query_vector=[0.1, 0.2, 0.3], limit=2),
+            )
@@ -0,0 +1,135 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+
+from django_mongodb_backend.expressions import SearchVector
+from django_mongodb_backend.indexes import VectorSearchIndex
+from django_mongodb_backend.tuning import (
+    NumCandidatesResult,
+    QueryVector,
+    benchmark_num_candidates,
+    recall,
+    recommend_num_candidates,
+    sample_query_vectors,
+)
+
+from .models import Article
+from .test_search import SearchUtilsMixin
+
+
+class RecallTests(SimpleTestCase):
+    def test_recall(self):
+        self.assertEqual(recall([1, 2, 3, 4], [4, 3, 2, 1]), 1.0)
+        self.assertEqual(recall([1, 2, 3, 4], [1, 2, 5, 6]), 0.5)
+        self.assertEqual(recall([1, 2], []), 0.0)
+
+    def test_no_expected_results(self):
+        self.assertEqual(recall([], []), 1.0)
+
+
+class RecommendNumCandidatesTests(SimpleTestCase):
+    results = [
+        NumCandidatesResult(10, 0.7, 0.001),
+        NumCandidatesResult(50, 0.96, 0.002),
+        NumCandidatesResult(20, 0.9, 0.0015),
+        NumCandidatesResult(100, 0.96, 0.004),
+    ]
+
+    def test_smallest_reaching_target(self):
+        self.assertEqual(recommend_num_candidates(self.results, 0.9), 20)
+        self.assertEqual(recommend_num_candidates(self.results, 0.95), 50)
+
+    def test_target_not_reached(self):
+        # The smallest value with the highest recall.
+        self.assertEqual(recommend_num_candidates(self.results, 0.99), 50)
+
+
+class NumCandidatesTests(SearchUtilsMixin):
+    @classmethod
+    def setUpClass(cls):
+        idx = VectorSearchIndex(
+            fields=["plot_embedding"], name="tuning_vector_index", similarities="cosine"
+        )
+        with connection.schema_editor() as editor:
+            editor.add_index(Article, idx)
+
+        def drop_index():
+            with connection.schema_editor() as editor:
+                editor.remove_index(Article, idx)
+
+        cls.addClassCleanup(drop_index)
+
+    def setUp(self):
+        for number, embedding in enumerate(
+            [[0.1, 0.2, 0.3], [0.9, 0.8, 0.7], [-0.1, 0.7, 0.7], [0.5, 0.5, 0.1]]
+        ):
+            Article.objects.create(headline="", number=number, body="", plot_embedding=embedding)
+
+    def get_pipeline(self, **kwargs):
+        expr = SearchVector(path="plot_embedding", query_vector=[0.1, 0.2, 0.3], limit=2, **kwargs)
+        with CaptureQueriesContext(connection) as ctx:
+            list(Article.objects.annotate(score=expr))
+        return ctx.captured_queries[0]["sql"]
+
+    @mock.patch.dict(
+        connection.settings_dict, {"VECTOR_SEARCH_NUM_CANDIDATES": {"tuning_vector_index": 30}}
+    )
+    def test_default_from_setting(self):
+        self.assertIn("'numCandidates': 30", self.get_pipeline())
+        # An explicit num_candidates takes precedence.
+        self.assertIn("'numCandidates': 5", self.get_pipeline(num_candidates=5))
+        # Exact searches don't use numCandidates.
+        self.assertNotIn("numCandidates", self.get_pipeline(exact=True))
+
+    @mock.patch.dict(
+        connection.settings_dict, {"VECTOR_SEARCH_NUM_CANDIDATES": {"tuning_vector_index": 1}}
+    )
+    def test_default_at_least_limit(self):
+        self.assertIn("'numCandidates': 2", self.get_pipeline())
+
+    def test_sample_query_vectors(self):
+        query_vectors = sample_query_vectors(Article, "plot_embedding", 2, "default")
+        self.assertEqual(len(query_vectors), 2)
+        for pk, vector in query_vectors:
+            self.assertEqual(Article.objects.get(pk=pk).plot_embedding, vector)
+
+    def test_benchmark_excludes_query_vector_document(self):
+        """
+        The document that a query vector is taken from isn't counted as a
+        result of its searches.
+        """
+        query_vectors = sample_query_vectors(Article, "plot_embedding", 4, "default")
+        query_vectors.append(QueryVector(None, [0.1, 0.2, 0.3]))
+        with mock.patch("django_mongodb_backend.tuning.recall", wraps=recall) as mocked:
+            results = benchmark_num_candidates(
+                Article.objects.all(), "plot_embedding", query_vectors, 2, [2]
+            )
+        self.assertEqual(len(results), 1)
+        self.assertEqual(mocked.call_count, 5)
+        for (pk, _), call in zip(query_vectors, mocked.call_args_list, strict=True):
+            expected, actual = call.args
+            self.assertEqual(len(expected), 2)
+            self.assertNotIn(pk, expected)
+            self.assertNotIn(pk, actual)
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            "tunevectorsearch",
+            "search_.Article",
+            "plot_embedding",
+            "--limit=2",
+            "--sample-size=4",
+            "--num-candidates",
+            "2",
+            "4",
+            "--target-recall=0.5",
+            stdout=out,
+        )
+        output = out.getvalue()
+        self.assertIn("recall@2", output)
+        self.assertIn('"VECTOR_SEARCH_NUM_CANDIDATES": {"tuning_vector_index": ', output)
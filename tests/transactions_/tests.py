@@ -1,13 +1,24 @@
 from unittest import mock
 
-from django.db import DatabaseError, connection
+from bson import ObjectId
+from django.db import DatabaseError, IntegrityError, connection
 from django.test import TransactionTestCase, skipIfDBFeature, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
 
-from django_mongodb_backend import transaction
+from django_mongodb_backend import test, transaction
 
 from .models import Reporter
 
 
+def reject_invalid_reporters(test_case):
+    """Make the server reject the reporters named "Invalid"."""
+    collection_name = Reporter._meta.db_table
+    connection.database.command(
+        "collMod", collection_name, validator={"first_name": {"$ne": "Invalid"}}
+    )
+    test_case.addCleanup(connection.database.command, "collMod", collection_name, validator={})
+
+
 @skipUnlessDBFeature("_supports_transactions")
 class AtomicTests(TransactionTestCase):
     """Largely copied from Django's test/transactions."""
@@ -160,6 +171,256 @@ class AtomicTests(TransactionTestCase):
         self.assertSequenceEqual(Reporter.objects.all(), [])
 
 
+@skipUnlessDBFeature("_supports_transactions")
+class SavepointTests(TransactionTestCase):
+    available_apps = ["transactions_"]
+
+    def test_commit(self):
+        with transaction.atomic():
+            reporter1 = Reporter.objects.create(first_name="Tintin")
+            with transaction.atomic(savepoint=True):
+                reporter2 = Reporter.objects.create(first_name="Archibald", last_name="Haddock")
+        self.assertSequenceEqual(Reporter.objects.all(), [reporter2, reporter1])
+
+    def test_rollback(self):
+        with transaction.atomic():
+            reporter = Reporter.objects.create(first_name="Tintin")
+            with self.assertRaisesMessage(Exception, "Oops"), transaction.atomic(savepoint=True):
+                Reporter.objects.create(first_name="Haddock")
+                raise Exception("Oops, that's his last name")
+        self.assertSequenceEqual(Reporter.objects.all(), [reporter])
+
+    def test_rollback_update_and_delete(self):
+        reporter = Reporter.objects.create(first_name="Tintin")
+        with (
+            transaction.atomic(),
+            self.assertRaisesMessage(Exception, "Oops"),
+            transaction.atomic(savepoint=True),
+        ):
+            self.assertEqual(Reporter.objects.update(last_name="Haddock"), 1)
+            self.assertEqual(Reporter.objects.all().delete()[0], 1)
+            raise Exception("Oops")
+        reporter.refresh_from_db()
+        self.assertEqual(reporter.last_name, "")
+
+    def test_nested_savepoints(self):
+        with transaction.atomic():
+            reporter1 = Reporter.objects.create(first_name="Tintin")
+            with transaction.atomic(savepoint=True):
+                reporter2 = Reporter.objects.create(first_name="Archibald")
+                with (
+                    self.assertRaisesMessage(Exception, "Oops"),
+                    transaction.atomic(savepoint=True),
+                ):
+                    Reporter.objects.create(first_name="Haddock")
+                    raise Exception("Oops")
+        self.assertSequenceEqual(Reporter.objects.all(), [reporter2, reporter1])
+
+    def test_outer_rollback_discards_savepoint(self):
+        with self.assertRaisesMessage(Exception, "Oops"), transaction.atomic():
+            with transaction.atomic(savepoint=True):
+                Reporter.objects.create(first_name="Tintin")
+            raise Exception("Oops")
+        self.assertSequenceEqual(Reporter.objects.all(), [])
+
+    def test_save_pending_insert(self):
+        """
+        Saving a model inserted in the same block updates the pending document
+        rather than inserting a duplicate.
+        """
+        with transaction.atomic(), transaction.atomic(savepoint=True):
+            reporter = Reporter.objects.create(first_name="Tintin")
+            reporter.last_name = "Reporter"
+            reporter.save()
+        self.assertSequenceEqual(Reporter.objects.values_list("last_name", flat=True), ["Reporter"])
+
+    def test_writes_batched(self):
+        with CaptureQueriesContext(connection) as ctx, transaction.atomic():
+            with transaction.atomic(savepoint=True):
+                Reporter.objects.create(first_name="Tintin")
+                Reporter.objects.create(first_name="Haddock")
+                self.assertEqual(len(ctx.captured_queries), 0)
+            self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn("transactions__reporter.bulk_write(", ctx.captured_queries[0]["sql"])
+
+    def test_on_commit_discarded_with_savepoint(self):
+        callbacks = []
+        with transaction.atomic():
+            transaction.on_commit(lambda: callbacks.append(1))
+            with self.assertRaisesMessage(Exception, "Oops"), transaction.atomic(savepoint=True):
+                transaction.on_commit(lambda: callbacks.append(2))
+                raise Exception("Oops")
+        self.assertEqual(callbacks, [1])
+
+    def test_duplicate_key_raised_on_exit(self):
+        with (
+            self.assertRaises(IntegrityError),
+            transaction.atomic(),
+            transaction.atomic(savepoint=True),
+        ):
+            reporter = Reporter.objects.create(first_name="Tintin")
+            Reporter.objects.create(pk=reporter.pk, first_name="Haddock")
+
+    def test_duplicate_key_caught(self):
+        """
+        A failed write aborts the transaction on the server, so the outermost
+        block rolls it back even if the error is caught.
+        """
+        with transaction.atomic():
+            Reporter.objects.create(first_name="Archibald")
+            with self.assertRaises(IntegrityError), transaction.atomic(savepoint=True):
+                reporter = Reporter.objects.create(first_name="Tintin")
+                Reporter.objects.create(pk=reporter.pk, first_name="Haddock")
+            self.assertIs(connection.needs_rollback_mongo, True)
+        self.assertIs(connection.needs_rollback_mongo, False)
+        self.assertSequenceEqual(Reporter.objects.all(), [])
+        # The next transaction commits.
+        with transaction.atomic():
+            reporter = Reporter.objects.create(first_name="Tintin")
+        self.assertSequenceEqual(Reporter.objects.all(), [reporter])
+
+    def test_write_error_caught(self):
+        """Other write errors than duplicate keys abort the transaction too."""
+        reject_invalid_reporters(self)
+        with transaction.atomic():
+            Reporter.objects.create(first_name="Archibald")
+            with (
+                self.assertRaisesMessage(DatabaseError, "Document failed validation"),
+                transaction.atomic(savepoint=True),
+            ):
+                Reporter.objects.create(first_name="Invalid")
+            self.assertIs(connection.needs_rollback_mongo, True)
+        self.assertIsNone(connection.session)
+        self.assertSequenceEqual(Reporter.objects.all(), [])
+        with transaction.atomic():
+            reporter = Reporter.objects.create(first_name="Tintin")
+        self.assertSequenceEqual(Reporter.objects.all(), [reporter])
+
+
+@skipUnlessDBFeature("_supports_transactions")
+class BatchWritesTests(TransactionTestCase):
+    available_apps = ["transactions_"]
+
+    def test_writes_batched_until_commit(self):
+        with CaptureQueriesContext(connection) as ctx:
+            with transaction.atomic(batch_writes=True):
+                reporter = Reporter.objects.create(first_name="Tintin")
+                reporter.last_name = "Reporter"
+                reporter.save()
+                Reporter.objects.create(first_name="Haddock")
+                self.assertEqual(len(ctx.captured_queries), 0)
+            self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn("transactions__reporter.bulk_write(", ctx.captured_queries[0]["sql"])
+        reporter.refresh_from_db()
+        self.assertEqual(reporter.last_name, "Reporter")
+
+    def test_save_existing_object(self):
+        """Saving an object created before the block doesn't count it."""
+        reporter = Reporter.objects.create(first_name="Tintin")
+        with CaptureQueriesContext(connection) as ctx:
+            with transaction.atomic(batch_writes=True):
+                reporter.last_name = "Reporter"
+                reporter.save()
+                self.assertEqual(len(ctx.captured_queries), 0)
+            self.assertEqual(len(ctx.captured_queries), 1)
+        reporter.refresh_from_db()
+        self.assertEqual(reporter.last_name, "Reporter")
+
+    def test_save_missing_object(self):
+        """
+        Saving an object with a primary key but no document fails when the
+        writes are executed unless force_insert=True.
+        """
+        reporter = Reporter(pk=ObjectId(), first_name="Tintin")
+        msg = (
+            f"1 update(s) of {Reporter._meta.db_table} documents selected by _id didn't match "
+            "any document."
+        )
+        with (
+            self.assertRaisesMessage(DatabaseError, msg),
+            transaction.atomic(batch_writes=True),
+        ):
+            Reporter.objects.create(first_name="Haddock")
+            reporter.save()
+        self.assertSequenceEqual(Reporter.objects.all(), [])
+        with transaction.atomic(batch_writes=True):
+            reporter.save(force_insert=True)
+        self.assertSequenceEqual(Reporter.objects.all(), [reporter])
+
+    def test_save_deleted_object_update_fields(self):
+        reporter = Reporter.objects.create(first_name="Tintin")
+        Reporter.objects.filter(pk=reporter.pk).delete()
+        reporter.first_name = "Haddock"
+        with (
+            self.assertRaises(DatabaseError),
+            transaction.atomic(batch_writes=True),
+        ):
+            reporter.save(update_fields=["first_name"])
+        self.assertSequenceEqual(Reporter.objects.all(), [])
+
+    def test_save_missing_object_with_other_updates(self):
+        """
+        The uncounted updates are verified separately from counted ones.
+        """
+        Reporter.objects.create(first_name="Tintin")
+        reporter = Reporter(pk=ObjectId(), first_name="Haddock")
+        with (
+            self.assertRaises(DatabaseError),
+            transaction.atomic(batch_writes=True),
+            transaction.atomic(savepoint=True),
+        ):
+            Reporter.objects.update(last_name="Reporter")
+            reporter.save()
+        self.assertQuerySetEqual(Reporter.objects.values_list("last_name", flat=True), [""])
+
+    def test_read_flushes_pending_writes(self):
+        with transaction.atomic(batch_writes=True):
+            reporter = Reporter.objects.create(first_name="Tintin")
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertSequenceEqual(Reporter.objects.all(), [reporter])
+            self.assertEqual(len(ctx.captured_queries), 2)
+            self.assertIn("transactions__reporter.bulk_write(", ctx.captured_queries[0]["sql"])
+            self.assertEqual(connection.write_buffer.operations, [])
+
+    def test_rollback(self):
+        with self.assertRaisesMessage(Exception, "Oops"), transaction.atomic(batch_writes=True):
+            Reporter.objects.create(first_name="Tintin")
+            raise Exception("Oops")
+        self.assertSequenceEqual(Reporter.objects.all(), [])
+
+    def test_failed_flush_rolls_back(self):
+        with self.assertRaises(IntegrityError), transaction.atomic(batch_writes=True):
+            reporter = Reporter.objects.create(first_name="Tintin")
+            self.assertEqual(Reporter.objects.count(), 1)
+            Reporter.objects.create(first_name="Archibald")
+            Reporter.objects.create(pk=reporter.pk, first_name="Haddock")
+        self.assertIs(connection.in_atomic_block_mongo, False)
+        self.assertSequenceEqual(Reporter.objects.all(), [])
+
+    def test_write_error_rolls_back(self):
+        reject_invalid_reporters(self)
+        with (
+            self.assertRaisesMessage(DatabaseError, "Document failed validation"),
+            transaction.atomic(batch_writes=True),
+        ):
+            Reporter.objects.create(first_name="Archibald")
+            Reporter.objects.create(first_name="Invalid")
+        self.assertIs(connection.in_atomic_block_mongo, False)
+        # The next transaction doesn't reuse the aborted one.
+        self.assertIsNone(connection.session)
+        with transaction.atomic():
+            reporter = Reporter.objects.create(first_name="Tintin")
+        self.assertSequenceEqual(Reporter.objects.all(), [reporter])
+
+    def test_savepoint(self):
+        with transaction.atomic(batch_writes=True):
+            reporter = Reporter.objects.create(first_name="Tintin")
+            with self.assertRaisesMessage(Exception, "Oops"), transaction.atomic(savepoint=True):
+                Reporter.objects.create(first_name="Haddock")
+                raise Exception("Oops")
+        self.assertSequenceEqual(Reporter.objects.all(), [reporter])
+
+
 @skipIfDBFeature("_supports_transactions")
 class AtomicNotSupportedTests(TransactionTestCase):
     available_apps = ["transactions_"]
@@ -168,3 +429,47 @@ class AtomicNotSupportedTests(TransactionTestCase):
         msg = "Transaction numbers are only allowed on a replica set member or mongos"
         with self.assertRaisesMessage(DatabaseError, msg), transaction.atomic():
             Reporter.objects.create(first_name="Haddock")
+
+
+@skipUnlessDBFeature("_supports_transactions")
+class TransactionalTestCaseTests(test.TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reporter = Reporter.objects.create(first_name="Tintin")
+
+    def test_in_transaction(self):
+        self.assertIs(connection.in_atomic_block_mongo, True)
+        self.assertIsNotNone(connection.session)
+        self.assertSequenceEqual(Reporter.objects.all(), [self.reporter])
+        # The test's writes aren't visible outside of the transaction.
+        collection = connection.get_collection(Reporter._meta.db_table)
+        self.assertEqual(collection.count_documents({}), 0)
+
+    def test_nested_atomic(self):
+        with transaction.atomic():
+            reporter = Reporter.objects.create(first_name="Haddock")
+        # The nested block doesn't commit the test's transaction.
+        self.assertIs(connection.in_atomic_block_mongo, True)
+        self.assertSequenceEqual(Reporter.objects.all(), [reporter, self.reporter])
+
+    def test_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            transaction.on_commit(lambda: None)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_write_rolled_back(self):
+        """The writes of the other tests are rolled back."""
+        Reporter.objects.create(first_name="Haddock")
+        self.assertEqual(Reporter.objects.count(), 2)
+
+
+@skipIfDBFeature("_supports_transactions")
+class TransactionalTestCaseNotSupportedTests(test.TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reporter = Reporter.objects.create(first_name="Tintin")
+
+    def test_flush(self):
+        """Tests are isolated by flushing the database."""
+        self.assertIsNone(connection.session)
+        self.assertSequenceEqual(Reporter.objects.all(), [self.reporter])